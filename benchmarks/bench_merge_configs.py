@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of configurations merge: many large override files merged onto
+a large base configuration, with the index of items by id (merge_configs)
+and with a linear search of each item (previous implementation).
+"""
+
+from typing import Any, Dict, List
+
+import argparse
+import copy
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# pylint: disable=wrong-import-position
+from tasksched.tasksched import merge_configs, search_item  # noqa: E402
+
+
+def merge_configs_linear(config: Dict, new_config: Dict):
+    """
+    Merge configurations with a linear search of each item (previous
+    implementation of merge_configs, without errors checks).
+
+    :param config: first config to update
+    :param new_config: dictionary used to update the config
+    """
+    for key, value in new_config.items():
+        if key not in config:
+            config[key] = value
+        elif isinstance(config[key], dict):
+            config[key].update(value)
+        elif isinstance(config[key], list):
+            for item in value:
+                config_item = search_item(config[key], item.get("id"))
+                if config_item is None:
+                    config[key].append(item)
+                else:
+                    config_item.update(item)
+        else:
+            config[key] = value
+
+
+def build_configs(tasks_count: int, files_count: int) -> List[Dict[str, Any]]:
+    """
+    Build a base configuration and override files: each override file
+    updates all tasks of the base and adds new tasks.
+
+    :param tasks_count: number of tasks in each file
+    :param files_count: number of override files
+    :return: list of configurations (base first)
+    """
+    configs = [
+        {
+            "project": {"name": "Benchmark", "start": "2021-01-04"},
+            "resources": [{"id": "dev1"}],
+            "tasks": [
+                {"id": f"task{i}", "title": f"Task {i}", "duration": 5}
+                for i in range(tasks_count)
+            ],
+        }
+    ]
+    for num_file in range(files_count):
+        configs.append(
+            {
+                "tasks": [
+                    {"id": f"task{i}", "duration": num_file + 1}
+                    for i in range(tasks_count // 2, tasks_count)
+                ]
+                + [
+                    {"id": f"new{num_file}_{i}", "duration": 1}
+                    for i in range(tasks_count // 2)
+                ],
+            }
+        )
+    return configs
+
+
+def run_merge(configs: List[Dict[str, Any]], indexed: bool) -> Dict:
+    """
+    Merge all configurations.
+
+    :param configs: configurations
+    :param indexed: True to use merge_configs, False for the linear search
+    :return: merged configuration
+    """
+    config: Dict[str, Any] = {}
+    indexes: Dict[str, Dict[str, Any]] = {}
+    for new_config in copy.deepcopy(configs):
+        if indexed:
+            merge_configs(config, new_config, indexes)
+        else:
+            merge_configs_linear(config, new_config)
+    return config
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-t", "--tasks", type=int, default=5000)
+    parser.add_argument("-f", "--files", type=int, default=5)
+    args = parser.parse_args()
+    configs = build_configs(args.tasks, args.files)
+    print(
+        f"Merge of {args.files} files with {args.tasks} tasks "
+        f"onto a base with {args.tasks} tasks"
+    )
+    results = []
+    for indexed, name in ((False, "linear search"), (True, "merge_configs")):
+        start = time.perf_counter()
+        results.append(run_merge(configs, indexed))
+        duration = time.perf_counter() - start
+        print(f"  {name:14s} {duration:8.3f} s")
+    assert results[0] == results[1]
+
+
+if __name__ == "__main__":
+    main()
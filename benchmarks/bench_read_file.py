@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of input files loading: YAML with the pure Python parser (as
+yaml.safe_load does), YAML with libyaml and JSON, on large projects built
+from the big example project.
+"""
+
+from typing import Any, Callable, Dict
+
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import time
+
+import yaml
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# pylint: disable=wrong-import-position
+from tasksched.tasksched import read_file  # noqa: E402
+
+
+def build_project(tasks_count: int, resources_count: int) -> Dict[str, Any]:
+    """
+    Build a large project from the big example project: tasks and resources
+    are duplicated.
+
+    :param tasks_count: number of tasks
+    :param resources_count: number of resources
+    :return: project configuration
+    """
+    path = os.path.join(ROOT_DIR, "examples", "project_big.yaml")
+    with open(path, encoding="utf-8") as _file:
+        config = yaml.safe_load(_file)
+    tasks = config["tasks"]
+    config["tasks"] = []
+    for i in range(tasks_count):
+        task = copy.copy(tasks[i % len(tasks)])
+        task["id"] = f"task{i + 1}"
+        config["tasks"].append(task)
+    config["resources"] = [
+        {"id": f"dev{i + 1}", "name": f"Developer {i + 1}"}
+        for i in range(resources_count)
+    ]
+    return config
+
+
+def timeit(func: Callable, repeat: int) -> float:
+    """
+    Return the best time of a function call.
+
+    :param func: function to call
+    :param repeat: number of calls
+    :return: best time (in seconds)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def safe_load_file(filename: str) -> Any:
+    """
+    Load a file with yaml.safe_load (pure Python parser).
+
+    :param filename: filename
+    :return: data loaded
+    """
+    with open(filename, encoding="utf-8") as _file:
+        return yaml.safe_load(_file)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-t", "--tasks", type=int, default=20000)
+    parser.add_argument("-r", "--resources", type=int, default=200)
+    parser.add_argument("-n", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+    config = build_project(args.tasks, args.resources)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yaml_file = os.path.join(tmp_dir, "project.yaml")
+        json_file = os.path.join(tmp_dir, "project.json")
+        with open(yaml_file, "w", encoding="utf-8") as _file:
+            yaml.safe_dump(config, _file, sort_keys=False)
+        with open(json_file, "w", encoding="utf-8") as _file:
+            json.dump(config, _file, default=str)
+        print(
+            f"Project: {args.tasks} tasks, {args.resources} resources "
+            f"(YAML: {os.path.getsize(yaml_file) / 1e6:.1f} MB, "
+            f"JSON: {os.path.getsize(json_file) / 1e6:.1f} MB), "
+            f"libyaml: {'yes' if yaml.__with_libyaml__ else 'no'}"
+        )
+        assert read_file(yaml_file) == safe_load_file(yaml_file)
+        assert read_file(json_file) == safe_load_file(json_file)
+        ref = timeit(lambda: safe_load_file(yaml_file), args.repeat)
+        print(f"  YAML, yaml.safe_load: {ref:8.3f} s")
+        for name, filename in (("YAML", yaml_file), ("JSON", json_file)):
+            duration = timeit(
+                lambda path=filename: read_file(path), args.repeat
+            )
+            print(
+                f"  {name}, read_file:      {duration:8.3f} s "
+                f"(x{ref / duration:.1f})"
+            )
+
+
+if __name__ == "__main__":
+    main()
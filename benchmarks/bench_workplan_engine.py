@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of work plan engines: time and peak memory (traced by
+tracemalloc) to build the work plan of a large generated project, with
+objects (WorkPlan) and with arrays (ArrayWorkPlan).
+
+The peak memory of build_workplan includes the search of tasks to split,
+which is the same with both engines, so the memory kept by the work plan
+alone (built without search) is measured as well.
+"""
+
+from typing import Any, Dict, Tuple
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# pylint: disable=wrong-import-position
+from tasksched import (  # noqa: E402
+    ArrayWorkPlan,
+    Project,
+    WorkPlan,
+    build_workplan,
+)
+
+
+def build_config(tasks_count: int, resources_count: int) -> Dict[str, Any]:
+    """
+    Build a project configuration with many tasks.
+
+    :param tasks_count: number of tasks
+    :param resources_count: number of resources
+    :return: project configuration
+    """
+    return {
+        "project": {"name": "Benchmark", "start": "2021-01-04"},
+        "resources": [{"id": f"dev{i}"} for i in range(resources_count)],
+        "tasks": [
+            {
+                "id": f"task{i}",
+                "title": f"Task {i}",
+                "duration": 1 + (i * 7919) % 40,
+                "priority": i % 3,
+            }
+            for i in range(tasks_count)
+        ],
+    }
+
+
+def measure(project: Project, engine: str) -> Tuple[float, float, Dict]:
+    """
+    Build the work plan and measure time (without tracing) and peak memory
+    (with tracing).
+
+    :param project: the project
+    :param engine: "objects" or "arrays"
+    :return: tuple (time in seconds, peak memory in MB, work plan as dict)
+    """
+    gc.collect()
+    start = time.perf_counter()
+    workplan = build_workplan(project, engine=engine)
+    duration = time.perf_counter() - start
+    del workplan
+    gc.collect()
+    tracemalloc.start()
+    workplan = build_workplan(project, engine=engine)
+    peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    tracemalloc.stop()
+    return duration, peak, workplan.as_dict()
+
+
+def measure_workplan(project: Project, engine: str) -> float:
+    """
+    Build the work plan without search of tasks to split and measure the
+    memory it keeps.
+
+    :param project: the project
+    :param engine: "objects" or "arrays"
+    :return: memory kept by the work plan in MB
+    """
+    snapshot = project.snapshot() if engine == "objects" else project
+    workplan_class = WorkPlan if engine == "objects" else ArrayWorkPlan
+    gc.collect()
+    tracemalloc.start()
+    workplan = workplan_class(snapshot)
+    kept = tracemalloc.get_traced_memory()[0] / (1024 * 1024)
+    tracemalloc.stop()
+    del workplan
+    return kept
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-t", "--tasks", type=int, default=50000)
+    parser.add_argument("-r", "--resources", type=int, default=50)
+    args = parser.parse_args()
+    project = Project(build_config(args.tasks, args.resources))
+    print(f"Project: {args.tasks} tasks, {args.resources} resources")
+    results = []
+    for engine in ("objects", "arrays"):
+        duration, peak, workplan = measure(project, engine)
+        results.append(workplan)
+        kept = measure_workplan(project, engine)
+        print(
+            f"  {engine:8s} {duration:8.3f} s, peak: {peak:8.2f} MB, "
+            f"kept by work plan alone: {kept:8.2f} MB"
+        )
+    assert results[0] == results[1]
+
+
+if __name__ == "__main__":
+    main()
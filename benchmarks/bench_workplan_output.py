@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Benchmark of work plan output: YAML and JSON written by the work plan
+serializer, compared to yaml.dump with the pure Python emitter and
+json.dumps with a callback for dates, on a large work plan built from the
+work plan of the big example project.
+"""
+
+from typing import Any, Callable, Dict
+
+import argparse
+import copy
+import io
+import json
+import os
+import sys
+import time
+
+import yaml
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# pylint: disable=wrong-import-position
+from tasksched import (  # noqa: E402
+    Project,
+    build_workplan,
+    write_workplan_json,
+    write_workplan_yaml,
+    yaml_dump,
+)
+from tasksched.tasksched import read_file  # noqa: E402
+
+
+def build_workplan_dict(count: int) -> Dict[str, Any]:
+    """
+    Build a large work plan from the work plan of the big example project:
+    resources and tasks are duplicated.
+
+    :param count: number of copies of resources and tasks
+    :return: work plan as dict
+    """
+    path = os.path.join(ROOT_DIR, "examples", "project_big.yaml")
+    workplan = build_workplan(Project(read_file(path))).as_dict()
+    content = workplan["workplan"]
+    resources, tasks = content["resources"], content["tasks"]
+    content["resources"], content["tasks"] = [], []
+    for i in range(count):
+        for resource in resources:
+            resource = copy.deepcopy(resource)
+            resource["id"] = f"{resource['id']}-{i + 1}"
+            content["resources"].append(resource)
+        for task in tasks:
+            task = copy.copy(task)
+            task["id"] = f"{task['id']}-{i + 1}"
+            content["tasks"].append(task)
+    return workplan
+
+
+def timeit(func: Callable, repeat: int) -> float:
+    """
+    Return the best time of a function call.
+
+    :param func: function to call
+    :param repeat: number of calls
+    :return: best time (in seconds)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def write_output(func: Callable, workplan: Dict[str, Any]) -> str:
+    """
+    Write the work plan in a string.
+
+    :param func: function writing the work plan
+    :param workplan: work plan
+    :return: output
+    """
+    output = io.StringIO()
+    func(workplan, output)
+    return output.getvalue()
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-c", "--count", type=int, default=100)
+    parser.add_argument("-n", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+    workplan = build_workplan_dict(args.count)
+    content = workplan["workplan"]
+    print(
+        f"Work plan: {len(content['tasks'])} tasks, "
+        f"{len(content['resources'])} resources, "
+        f"libyaml: {'yes' if yaml.__with_libyaml__ else 'no'}"
+    )
+    for name, ref_func, func in (
+        ("YAML", yaml_dump, write_workplan_yaml),
+        (
+            "JSON",
+            lambda data: json.dumps(data, default=str),
+            write_workplan_json,
+        ),
+    ):
+        assert write_output(func, workplan) == ref_func(workplan)
+        ref = timeit(lambda ref_func=ref_func: ref_func(workplan), args.repeat)
+        duration = timeit(
+            lambda func=func: write_output(func, workplan), args.repeat
+        )
+        print(
+            f"  {name}: reference: {ref:8.3f} s, "
+            f"serializer: {duration:8.3f} s (x{ref / duration:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
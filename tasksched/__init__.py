@@ -23,9 +23,18 @@
 """Task scheduler with automatic resource leveling."""
 
 from tasksched.tasksched import *  # noqa
+from tasksched.cache import *  # noqa
 from tasksched.parser import *  # noqa
+from tasksched.business_calendar import *  # noqa
+from tasksched.compiled import *  # noqa
+from tasksched.holidays_cache import *  # noqa
+from tasksched.ndjson import *  # noqa
+from tasksched.output import *  # noqa
 from tasksched.project import *  # noqa
+from tasksched.search import *  # noqa
 from tasksched.workplan import *  # noqa
+from tasksched.workplan_stream import *  # noqa
+from tasksched.workplan_compact import *  # noqa
 from tasksched.workplan_text import *  # noqa
 from tasksched.workplan_html import *  # noqa
 from tasksched.utils import *  # noqa
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Business days calendar, with conversions between dates and numbers of
+business days in constant time."""
+
+from array import array
+from typing import Dict, List, Optional
+
+import datetime
+
+from tasksched.utils import (
+    DaysView,
+    add_business_days,
+    get_holidays_ordinals,
+    load_holidays_years,
+)
+
+__all__ = (
+    "BusinessCalendar",
+)
+
+
+class BusinessCalendar:
+    """
+    Calendar of business days from a start date, for a set of holidays.
+
+    Tables are indexed by the number of days since the start date (offset)
+    and by the number of business days since the start date, so that each
+    conversion between a date and a number of business days is an index in
+    an array; they are extended year by year when a date after the end of
+    the tables is used.
+    """
+
+    __slots__ = (
+        "start",
+        "hdays",
+        "ordinals",
+        "business",
+        "numbers",
+        "offsets",
+    )
+
+    def __init__(
+        self,
+        start: datetime.date,
+        hdays: Optional[Dict[datetime.date, str]] = None,
+        days: Optional[int] = None,
+    ):
+        """
+        Initialize the calendar.
+
+        :param start: start date
+        :param hdays: list of dates with holidays
+        :param days: initial number of days in the tables (default: up to
+            the end of the year of start date)
+        """
+        self.start: datetime.date = start
+        self.hdays: Optional[Dict[datetime.date, str]] = hdays
+        # sorted ordinals of holidays, computed again when years of
+        # holidays are loaded
+        self.ordinals: List[int] = get_holidays_ordinals(hdays)
+        # business[offset]: 1 if the day is a business day, 0 otherwise
+        self.business: bytearray = bytearray()
+        # numbers[offset]: number of business days after the start date
+        # up to the day (included)
+        self.numbers: array = array("l")
+        # offsets[number]: offset of the first day with this number of
+        # business days since the start date
+        self.offsets: array = array("l", [0])
+        if days is None:
+            self.grow(0)
+        else:
+            self.extend(days)
+
+    def extend(self, days: int):
+        """
+        Extend the tables up to a number of days since the start date.
+
+        :param days: number of days in the tables
+        """
+        first = len(self.business)
+        if days <= first:
+            return
+        start_ordinal = self.start.toordinal()
+        if load_holidays_years(
+            self.hdays,
+            datetime.date.fromordinal(start_ordinal + first),
+            datetime.date.fromordinal(start_ordinal + days - 1),
+        ):
+            self.ordinals = get_holidays_ordinals(self.hdays)
+        holidays = set(self.ordinals)
+        number = self.numbers[-1] if self.numbers else 0
+        for offset in range(first, days):
+            ordinal = start_ordinal + offset
+            business = (ordinal + 6) % 7 < 5 and ordinal not in holidays
+            self.business.append(business)
+            if business and offset > 0:
+                number += 1
+                self.offsets.append(offset)
+            self.numbers.append(number)
+
+    def grow(self, offset: int):
+        """
+        Extend the tables up to the end of the year of a day, so that
+        holidays are loaded only for the years used.
+
+        :param offset: number of days since the start date
+        """
+        date = self.start + datetime.timedelta(days=offset)
+        end_of_year = datetime.date(date.year, 12, 31)
+        self.extend((end_of_year - self.start).days + 1)
+
+    def get_offset(self, date: datetime.date) -> int:
+        """
+        Get the number of days between the start date and a date, extending
+        the tables if needed.
+
+        :param date: date (≥ start date)
+        :return: number of days since the start date
+        """
+        offset = date.toordinal() - self.start.toordinal()
+        if offset < 0:
+            raise ValueError(
+                f"date {date} is before the start of calendar ({self.start})"
+            )
+        if offset >= len(self.business):
+            self.grow(offset)
+        return offset
+
+    def is_business_day(self, date: datetime.date) -> bool:
+        """
+        Check if the date is a business day.
+
+        :param date: date to check (≥ start date)
+        :return: True if the date is a business day, False otherwise
+        """
+        return bool(self.business[self.get_offset(date)])
+
+    def count_business_days(self, date: datetime.date) -> int:
+        """
+        Count business days after the start date, up to a date (included).
+
+        :param date: date (≥ start date)
+        :return: number of business days
+        """
+        return self.numbers[self.get_offset(date)]
+
+    def get_date(self, number: int) -> datetime.date:
+        """
+        Get the date of a business day by its number since the start date
+        (the start date itself for 0).
+
+        :param number: number of business days since the start date (≥ 0)
+        :return: date
+        """
+        while number >= len(self.offsets):
+            self.grow(len(self.business))
+        return self.start + datetime.timedelta(days=self.offsets[number])
+
+    def add_business_days(
+        self, from_date: datetime.date, count: int
+    ) -> datetime.date:
+        """
+        Add "count" business days to a date, skipping week-end days and
+        public holidays (same result as utils.add_business_days).
+
+        :param from_date: start date
+        :param count: number of business days to add (≥ 0)
+        :return: date with "count" business days added
+        """
+        if count <= 0:
+            return from_date
+        if from_date < self.start:
+            return add_business_days(
+                from_date, count, self.hdays, self.ordinals
+            )
+        return self.get_date(self.count_business_days(from_date) + count)
+
+    def get_days(
+        self, from_date: datetime.date, to_date: datetime.date
+    ) -> DaysView:
+        """
+        Return days between two dates (same result as utils.get_days).
+
+        :param from_date: start date (≥ start date of calendar)
+        :param to_date: end date
+        :return: read-only dictionary with days, keys are dates, values are
+            dictionaries with keys: "weekday" (str) and "business_day"
+            (bool)
+        """
+        if to_date < from_date:
+            return DaysView(from_date, bytearray())
+        first = self.get_offset(from_date)
+        last = self.get_offset(to_date)
+        return DaysView(from_date, self.business[first : last + 1])
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""On-disk cache of work plans, addressed by the content of the project."""
+
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from tasksched.holidays_cache import get_holidays_version
+
+__all__ = (
+    "WorkPlanCache",
+    "get_cache_key",
+)
+
+CACHE_SUFFIX = ".json"
+DATE_KEY = "__date__"
+
+
+def encode_date(obj: Any) -> Dict[str, str]:
+    """
+    Encode a date for JSON (callback for json.dumps).
+
+    :param obj: object to encode
+    :return: dict with the date in ISO format
+    """
+    if isinstance(obj, datetime.date):
+        return {DATE_KEY: obj.isoformat()}
+    raise TypeError(f"unable to encode {type(obj).__name__} in cache")
+
+
+def decode_date(obj: Dict[str, Any]) -> Any:
+    """
+    Decode a date encoded by encode_date (callback for json.loads).
+
+    :param obj: dict decoded
+    :return: date or dict
+    """
+    if len(obj) == 1 and DATE_KEY in obj:
+        return datetime.date.fromisoformat(obj[DATE_KEY])
+    return obj
+
+
+def get_cache_key(config: Dict, version: str, **options: Any) -> str:
+    """
+    Get the cache key of a project configuration: hash of the canonical
+    JSON of the configuration, the versions of tasksched and holidays and
+    the options used to build the work plan.
+
+    If the project has no start date, today is used as start date, so the
+    date of today is part of the key.
+
+    :param config: merged project configuration
+    :param version: tasksched version
+    :param options: options used to build the work plan
+    :return: cache key (SHA-256, hexadecimal)
+    """
+    project = config.get("project")
+    if not isinstance(project, dict) or not project.get("start"):
+        options["today"] = datetime.date.today()
+    data = {
+        "config": config,
+        "version": version,
+        "holidays": get_holidays_version(),
+        "options": options,
+    }
+    canonical = json.dumps(
+        data,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class WorkPlanCache:
+    """
+    On-disk cache of work plans (one JSON file per work plan), with
+    eviction of least recently used entries by size and age.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        """
+        Initialize the cache.
+
+        :param directory: cache directory (created if needed)
+        :param max_size: max size of the cache (in bytes), None = no limit
+        :param max_age: max age of entries not used (in seconds),
+            None = no limit
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def get_path(self, key: str) -> str:
+        """
+        Get path to the file of an entry.
+
+        :param key: cache key
+        :return: path to the file
+        """
+        return os.path.join(self.directory, f"{key}{CACHE_SUFFIX}")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Get a work plan from the cache; the time of last use of the entry
+        is updated.
+
+        :param key: cache key
+        :return: work plan as dict, None if not found in cache (or if the
+            entry is invalid)
+        """
+        path = self.get_path(key)
+        try:
+            with open(path, encoding="utf-8") as _file:
+                workplan = json.load(_file, object_hook=decode_date)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return workplan
+
+    def put(self, key: str, workplan: Dict):
+        """
+        Add a work plan in cache (atomic write), then evict old entries.
+
+        :param key: cache key
+        :param workplan: work plan as dict
+        """
+        fd, tmp_path = tempfile.mkstemp(
+            dir=self.directory, prefix=".tmp-", suffix=CACHE_SUFFIX
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as _file:
+                json.dump(workplan, _file, default=encode_date)
+            os.replace(tmp_path, self.get_path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.evict()
+
+    def entries(self) -> Iterator[Tuple[float, int, str]]:
+        """
+        Return entries of the cache.
+
+        :return: tuples (time of last use, size, path)
+        """
+        with os.scandir(self.directory) as it_entries:
+            for entry in it_entries:
+                if entry.name.startswith(".") or not entry.name.endswith(
+                    CACHE_SUFFIX
+                ):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                yield stat.st_mtime, stat.st_size, entry.path
+
+    def evict(self):
+        """
+        Remove entries not used for more than max age, then least recently
+        used entries until the size of cache is lower or equal to max size.
+        """
+        if self.max_size is None and self.max_age is None:
+            return
+        entries = sorted(self.entries(), reverse=True)
+        min_time = None if self.max_age is None else time.time() - self.max_age
+        size = 0
+        for mtime, entry_size, path in entries:
+            size += entry_size
+            if (min_time is not None and mtime < min_time) or (
+                self.max_size is not None and size > self.max_size
+            ):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compiled project: a validated project with resolved start date and
+holidays, in a versioned binary file that is loaded without parsing."""
+
+from array import array
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import datetime
+import json
+import mmap
+import struct
+import sys
+
+from tasksched.cache import decode_date, encode_date
+from tasksched.holidays_cache import CachedHolidays, HolidaysCache
+from tasksched.project import Project, Resource, Task
+
+__all__ = (
+    "compile_project",
+    "is_compiled_project",
+    "load_compiled_project",
+    "write_compiled_project",
+)
+
+# header of a compiled project: magic, format version, reserved (0) and
+# size of metadata; followed by the metadata (JSON, UTF-8) and the columns
+# (little endian, each one aligned on 8 bytes) described in the metadata
+COMPILED_MAGIC = b"TSCHPROJ"
+COMPILED_FORMAT = 1
+COMPILED_HEADER = struct.Struct("<8sHHI")
+COMPILED_ALIGN = 8
+
+# columns of resources and tasks
+RESOURCES_COLUMNS = (("id", "res_id"), ("name", "name"))
+TASKS_COLUMNS = (
+    ("id", "task_id"),
+    ("title", "title"),
+    ("duration", "duration"),
+    ("priority", "priority"),
+    ("max_resources", "max_resources"),
+)
+
+
+def is_compiled_project(filename: Any) -> bool:
+    """
+    Check if a file is a compiled project.
+
+    :param filename: filename (any other object returns False)
+    :return: True if the file starts with the compiled project magic
+    """
+    if not isinstance(filename, str):
+        return False
+    try:
+        with open(filename, "rb") as _file:
+            return _file.read(len(COMPILED_MAGIC)) == COMPILED_MAGIC
+    except OSError:
+        return False
+
+
+class _ColumnsWriter:
+    """Writer of columns: data and description of each column."""
+
+    def __init__(self):
+        self.data: bytearray = bytearray()
+        self.columns: Dict[str, List[Any]] = {}
+        self.values: Dict[str, List[Any]] = {}
+
+    def add_array(self, name: str, values: array):
+        """
+        Add a column of numbers.
+
+        :param name: column name
+        :param values: values
+        """
+        self.data.extend(b"\0" * (-len(self.data) % COMPILED_ALIGN))
+        if sys.byteorder != "little":
+            values = array(values.typecode, values)
+            values.byteswap()
+        self.columns[name] = [values.typecode, len(self.data), len(values)]
+        self.data.extend(values.tobytes())
+
+    def add_column(self, name: str, values: List[Any]):
+        """
+        Add a column: strings are stored in a UTF-8 block with offsets,
+        integers in an array; other values are stored in metadata.
+
+        :param name: column name
+        :param values: values
+        """
+        if all(isinstance(value, str) for value in values):
+            text = "".join(values)
+            offsets = array("q", [0])
+            for value in values:
+                offsets.append(offsets[-1] + len(value))
+            self.add_array(f"{name}.offsets", offsets)
+            self.data.extend(b"\0" * (-len(self.data) % COMPILED_ALIGN))
+            encoded = text.encode("utf-8")
+            self.columns[name] = ["s", len(self.data), len(encoded)]
+            self.data.extend(encoded)
+        elif all(
+            isinstance(value, int) and not isinstance(value, bool)
+            for value in values
+        ):
+            self.add_array(name, array("q", values))
+        else:
+            self.values[name] = values
+
+
+def compile_project(project: Project) -> bytes:
+    """
+    Compile a project: the holidays are resolved for all the years that
+    can be used by its work plan (from the start date up to the end of the
+    project if all tasks were done one after the other).
+
+    :param project: project
+    :return: compiled project
+    """
+    start_date = project.start_date
+    end_date = project.calendar.add_business_days(
+        start_date, sum(task.duration for task in project.tasks)
+    )
+    years = [start_date.year, end_date.year]
+    writer = _ColumnsWriter()
+    hdays: Dict[datetime.date, str] = {}
+    if project.holidays_iso:
+        for year in range(years[0], years[1] + 1):
+            # check a date of the year to load holidays on demand
+            _ = datetime.date(year, 1, 1) in project.hdays
+        hdays = {
+            date: project.hdays[date]
+            for date in sorted(project.hdays)
+            if years[0] <= date.year <= years[1]
+        }
+    writer.add_array(
+        "holidays.date", array("q", [date.toordinal() for date in hdays])
+    )
+    writer.add_column("holidays.name", list(hdays.values()))
+    for prefix, items, columns in (
+        ("resources", project.resources, RESOURCES_COLUMNS),
+        ("tasks", project.tasks, TASKS_COLUMNS),
+    ):
+        for column, attr in columns:
+            writer.add_column(
+                f"{prefix}.{column}", [getattr(item, attr) for item in items]
+            )
+    metadata = {
+        "name": project.name,
+        "start": start_date,
+        "holidays": project.holidays_iso,
+        "years": years,
+        "resources": len(project.resources),
+        "tasks": len(project.tasks),
+        "columns": writer.columns,
+        "values": writer.values,
+    }
+    try:
+        encoded = json.dumps(
+            metadata, ensure_ascii=False, default=encode_date
+        ).encode("utf-8")
+    except TypeError as exc:
+        raise ValueError(f"unable to compile project: {exc}") from exc
+    encoded += b" " * (-(COMPILED_HEADER.size + len(encoded)) % COMPILED_ALIGN)
+    return (
+        COMPILED_HEADER.pack(COMPILED_MAGIC, COMPILED_FORMAT, 0, len(encoded))
+        + encoded
+        + bytes(writer.data)
+    )
+
+
+def write_compiled_project(project: Project, filename: str):
+    """
+    Compile a project and write it in a file.
+
+    :param project: project
+    :param filename: filename
+    """
+    data = compile_project(project)
+    with open(filename, "wb") as _file:
+        _file.write(data)
+
+
+class _ColumnsReader:
+    """Reader of columns, in a buffer (bytes or memory map)."""
+
+    def __init__(
+        self,
+        data: memoryview,
+        columns: Dict[str, List[Any]],
+        values: Dict[str, List[Any]],
+    ):
+        self.data: memoryview = data
+        self.columns: Dict[str, List[Any]] = columns
+        self.values: Dict[str, List[Any]] = values
+
+    def get_block(self, name: str) -> Tuple[str, int, int]:
+        """
+        Get the position of a column in data.
+
+        :param name: column name
+        :return: tuple (typecode, start, end)
+        """
+        try:
+            typecode, start, count = self.columns[name]
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f'missing column "{name}"') from exc
+        end = start + (count if typecode == "s" else 8 * count)
+        if not 0 <= start <= end <= len(self.data):
+            raise ValueError(f'truncated column "{name}"')
+        return typecode, start, end
+
+    def get_array(self, name: str) -> List[int]:
+        """
+        Get a column of numbers.
+
+        :param name: column name
+        :return: values
+        """
+        typecode, start, end = self.get_block(name)
+        if typecode != "q":
+            raise ValueError(f'invalid type of column "{name}"')
+        if sys.byteorder != "little":
+            numbers = array("q")
+            numbers.frombytes(self.data[start:end])
+            numbers.byteswap()
+            return numbers.tolist()
+        # read in place (without copy of data)
+        with self.data[start:end] as block, block.cast("q") as values:
+            return values.tolist()
+
+    def get_column(self, name: str, count: int) -> List[Any]:
+        """
+        Get a column.
+
+        :param name: column name
+        :param count: number of values
+        :return: values
+        """
+        if name in self.values:
+            values = self.values[name]
+        elif self.columns.get(name, [""])[0] == "s":
+            offsets = self.get_array(f"{name}.offsets")
+            _, start, end = self.get_block(name)
+            text = str(self.data[start:end], "utf-8")
+            values = [
+                text[offsets[i] : offsets[i + 1]]
+                for i in range(len(offsets) - 1)
+            ]
+        else:
+            values = self.get_array(name)
+        if len(values) != count:
+            raise ValueError(f'invalid number of values in column "{name}"')
+        return values
+
+
+def decode_project(  # pylint: disable=too-many-locals
+    data: Union[bytes, mmap.mmap],
+    holidays_cache: Optional[HolidaysCache] = None,
+) -> Project:
+    """
+    Decode a compiled project.
+
+    :param data: compiled project
+    :param holidays_cache: persistent cache of holidays, used for years
+        not stored in the compiled project
+    :return: project
+    """
+    if len(data) < COMPILED_HEADER.size:
+        raise ValueError("not a compiled project")
+    magic, file_format, _, size = COMPILED_HEADER.unpack_from(data)
+    if magic != COMPILED_MAGIC:
+        raise ValueError("not a compiled project")
+    if file_format != COMPILED_FORMAT:
+        raise ValueError(
+            f"incompatible compiled project: format {file_format}, "
+            f"expected format {COMPILED_FORMAT} (compile the project again)"
+        )
+    start = COMPILED_HEADER.size
+    with memoryview(data) as view:
+        try:
+            metadata = json.loads(
+                str(view[start : start + size], "utf-8"),
+                object_hook=decode_date,
+            )
+        except ValueError as exc:
+            raise ValueError(f"invalid compiled project: {exc}") from exc
+        with view[start + size :] as columns_data:
+            reader = _ColumnsReader(
+                columns_data, metadata["columns"], metadata["values"]
+            )
+            dates = reader.get_array("holidays.date")
+            names = reader.get_column("holidays.name", len(dates))
+            resources = [
+                reader.get_column(f"resources.{column}", metadata["resources"])
+                for column, _ in RESOURCES_COLUMNS
+            ]
+            tasks = [
+                reader.get_column(f"tasks.{column}", metadata["tasks"])
+                for column, _ in TASKS_COLUMNS
+            ]
+    hdays: Dict[datetime.date, str] = {}
+    if metadata["holidays"]:
+        hdays = CachedHolidays(metadata["holidays"], cache=holidays_cache)
+        hdays.update(
+            (datetime.date.fromordinal(int(ordinal)), name)
+            for ordinal, name in zip(dates, names)
+        )
+        hdays.years.update(
+            range(metadata["years"][0], metadata["years"][1] + 1)
+        )
+    return Project.from_items(
+        metadata["name"],
+        metadata["start"],
+        metadata["holidays"],
+        hdays,
+        [Resource(*values) for values in zip(*resources)],
+        [Task(*values) for values in zip(*tasks)],
+    )
+
+
+def load_compiled_project(
+    filename: str, holidays_cache: Optional[HolidaysCache] = None
+) -> Project:
+    """
+    Load a compiled project: the file is mapped in memory and the columns
+    are read in place.
+
+    :param filename: filename
+    :param holidays_cache: persistent cache of holidays, used for years
+        not stored in the compiled project
+    :return: project
+    """
+    try:
+        with open(filename, "rb") as _file:
+            with mmap.mmap(_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return decode_project(data, holidays_cache)
+    except (OSError, KeyError, TypeError) as exc:
+        raise ValueError(f"invalid compiled project: {exc}") from exc
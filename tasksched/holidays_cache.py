@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Persistent cache of holidays, one binary file by country and year."""
+
+from array import array
+from typing import Any, Dict, Iterable, Optional
+
+import datetime
+import importlib.util
+import os
+import struct
+import sys
+import tempfile
+
+__all__ = (
+    "CachedHolidays",
+    "HolidaysCache",
+    "get_holidays_cache_dir",
+    "get_holidays_version",
+)
+
+# header of a cache file: magic, format version, year, number of holidays;
+# followed by the day of year of each holiday (unsigned 16-bit integers,
+# little endian), then the names of holidays (UTF-8, one per line)
+CACHE_MAGIC = b"TSHD"
+CACHE_FORMAT = 1
+CACHE_HEADER = struct.Struct("<4sBHH")
+
+_HOLIDAYS_VERSION: Dict[str, str] = {}
+
+
+def get_holidays_version() -> str:
+    """
+    Return the version of holidays package, without importing it (the
+    version is read in the name of the directory with package metadata,
+    if it is found next to the package).
+
+    :return: holidays version
+    """
+    if "version" not in _HOLIDAYS_VERSION:
+        versions = []
+        spec = importlib.util.find_spec("holidays")
+        if spec is not None and spec.submodule_search_locations:
+            locations = list(spec.submodule_search_locations)
+            site_dir = os.path.dirname(locations[0])
+            try:
+                versions = [
+                    name[len("holidays-") : -len(".dist-info")]
+                    for name in os.listdir(site_dir)
+                    if name.startswith("holidays-")
+                    and name.endswith(".dist-info")
+                ]
+            except OSError:
+                pass
+        if len(versions) == 1:
+            _HOLIDAYS_VERSION["version"] = versions[0]
+        else:
+            # pylint: disable=import-outside-toplevel
+            from importlib.metadata import version
+
+            _HOLIDAYS_VERSION["version"] = version("holidays")
+    return _HOLIDAYS_VERSION["version"]
+
+
+def get_holidays_cache_dir() -> str:
+    """
+    Return the default directory of holidays cache: the environment
+    variable TASKSCHED_HOLIDAYS_CACHE if set, otherwise the directory
+    "tasksched/holidays" in the user cache directory
+    ($XDG_CACHE_HOME or ~/.cache).
+
+    :return: path to the holidays cache directory
+    """
+    directory = os.environ.get("TASKSCHED_HOLIDAYS_CACHE")
+    if directory:
+        return directory
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "tasksched", "holidays")
+
+
+def compute_holidays(
+    iso: str, subdiv: Optional[str], year: int
+) -> Dict[datetime.date, str]:
+    """
+    Compute holidays of a country for a year with the holidays package.
+
+    :param iso: country ISO code
+    :param subdiv: subdivision code (None for the whole country)
+    :param year: year
+    :return: holidays (dates and names), sorted by date
+    """
+    # holidays is slow to import: it is imported only if needed
+    # pylint: disable=import-outside-toplevel
+    from holidays import country_holidays
+
+    hdays = country_holidays(iso, subdiv=subdiv, years=year)
+    return {
+        date: name for date, name in sorted(hdays.items()) if date.year == year
+    }
+
+
+def encode_holidays(year: int, hdays: Dict[datetime.date, str]) -> bytes:
+    """
+    Encode holidays of a year in binary form.
+
+    :param year: year
+    :param hdays: holidays of the year (dates and names)
+    :return: holidays as bytes
+    """
+    first_ordinal = datetime.date(year, 1, 1).toordinal() - 1
+    days = array("H", [date.toordinal() - first_ordinal for date in hdays])
+    if sys.byteorder != "little":
+        days.byteswap()
+    names = "\n".join(name.replace("\n", " ") for name in hdays.values())
+    return (
+        CACHE_HEADER.pack(CACHE_MAGIC, CACHE_FORMAT, year, len(days))
+        + days.tobytes()
+        + names.encode("utf-8")
+    )
+
+
+def decode_holidays(
+    year: int, data: bytes
+) -> Optional[Dict[datetime.date, str]]:
+    """
+    Decode holidays of a year encoded by encode_holidays.
+
+    :param year: year
+    :param data: holidays as bytes
+    :return: holidays (dates and names), None if data is invalid
+    """
+    if len(data) < CACHE_HEADER.size:
+        return None
+    magic, file_format, file_year, count = CACHE_HEADER.unpack_from(data)
+    if (magic, file_format, file_year) != (CACHE_MAGIC, CACHE_FORMAT, year):
+        return None
+    end_days = CACHE_HEADER.size + 2 * count
+    if len(data) < end_days:
+        return None
+    days = array("H")
+    days.frombytes(data[CACHE_HEADER.size : end_days])
+    if sys.byteorder != "little":
+        days.byteswap()
+    names = data[end_days:].decode("utf-8").split("\n") if count else []
+    if len(days) != count or len(names) != count:
+        return None
+    first_ordinal = datetime.date(year, 1, 1).toordinal() - 1
+    return {
+        datetime.date.fromordinal(first_ordinal + day): name
+        for day, name in zip(days, names)
+    }
+
+
+class HolidaysCache:
+    """
+    Persistent cache of holidays, keyed by country ISO code, subdivision,
+    year and version of holidays package.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Initialize the cache.
+
+        :param directory: cache directory (created when holidays are
+            stored)
+        """
+        self.directory = directory
+
+    def get_path(self, iso: str, subdiv: Optional[str], year: int) -> str:
+        """
+        Get path to the file with holidays of a country for a year.
+
+        :param iso: country ISO code
+        :param subdiv: subdivision code (None for the whole country)
+        :param year: year
+        :return: path to the file
+        """
+        country = f"{iso}-{subdiv}" if subdiv else iso
+        return os.path.join(
+            self.directory, get_holidays_version(), country, f"{year}.bin"
+        )
+
+    def get(
+        self, iso: str, subdiv: Optional[str], year: int
+    ) -> Optional[Dict[datetime.date, str]]:
+        """
+        Get holidays of a country for a year from the cache.
+
+        :param iso: country ISO code
+        :param subdiv: subdivision code (None for the whole country)
+        :param year: year
+        :return: holidays, None if not found in cache (or invalid)
+        """
+        try:
+            with open(self.get_path(iso, subdiv, year), "rb") as _file:
+                return decode_holidays(year, _file.read())
+        except (OSError, ValueError):
+            return None
+
+    def put(
+        self,
+        iso: str,
+        subdiv: Optional[str],
+        year: int,
+        hdays: Dict[datetime.date, str],
+    ):
+        """
+        Store holidays of a country for a year in the cache (atomic write);
+        errors are ignored (the cache is then not used).
+
+        :param iso: country ISO code
+        :param subdiv: subdivision code (None for the whole country)
+        :param year: year
+        :param hdays: holidays of the year
+        """
+        path = self.get_path(iso, subdiv, year)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path), prefix=".tmp-"
+            )
+            try:
+                with os.fdopen(fd, "wb") as _file:
+                    _file.write(encode_holidays(year, hdays))
+                os.replace(tmp_path, path)
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass
+
+    def load(
+        self, iso: str, subdiv: Optional[str], year: int
+    ) -> Dict[datetime.date, str]:
+        """
+        Load holidays of a country for a year: from the cache if found,
+        otherwise they are computed and stored in the cache.
+
+        :param iso: country ISO code
+        :param subdiv: subdivision code (None for the whole country)
+        :param year: year
+        :return: holidays of the year
+        """
+        hdays = self.get(iso, subdiv, year)
+        if hdays is None:
+            hdays = compute_holidays(iso, subdiv, year)
+            self.put(iso, subdiv, year, hdays)
+        return hdays
+
+    def warm(
+        self, iso: str, subdiv: Optional[str], years: Iterable[int]
+    ) -> int:
+        """
+        Compute and store holidays of a country for years not yet in
+        cache.
+
+        :param iso: country ISO code
+        :param subdiv: subdivision code (None for the whole country)
+        :param years: years
+        :return: number of years computed
+        """
+        count = 0
+        for year in years:
+            if self.get(iso, subdiv, year) is None:
+                hdays = compute_holidays(iso, subdiv, year)
+                self.put(iso, subdiv, year, hdays)
+                count += 1
+        return count
+
+
+class CachedHolidays(dict):
+    """
+    Holidays of a country, loaded year by year when a date is checked
+    (like holidays.HolidayBase with expand=True), from a persistent cache
+    if given.
+    """
+
+    def __init__(
+        self,
+        iso: str,
+        subdiv: Optional[str] = None,
+        cache: Optional[HolidaysCache] = None,
+    ):
+        """
+        Initialize holidays (no year is loaded).
+
+        :param iso: country ISO code
+        :param subdiv: subdivision code (None for the whole country)
+        :param cache: persistent cache (None = holidays are computed)
+        """
+        super().__init__()
+        self.iso: str = iso
+        self.subdiv: Optional[str] = subdiv
+        self.cache: Optional[HolidaysCache] = cache
+        self.years: set = set()
+        self.expand: bool = True
+
+    def __contains__(self, key: object) -> bool:
+        self.load_date_year(key)
+        return super().__contains__(key)
+
+    def __getitem__(self, key: Any) -> Any:
+        self.load_date_year(key)
+        return super().__getitem__(key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        self.load_date_year(key)
+        return super().get(key, default)
+
+    def load_date_year(self, key: object):
+        """
+        Load holidays of the year of a date, if not yet loaded.
+
+        :param key: date (any other key is ignored)
+        """
+        if isinstance(key, datetime.date) and key.year not in self.years:
+            self.load_year(key.year)
+
+    def load_year(self, year: int):
+        """
+        Load holidays of a year.
+
+        :param year: year
+        """
+        if self.cache is None:
+            hdays = compute_holidays(self.iso, self.subdiv, year)
+        else:
+            hdays = self.cache.load(self.iso, self.subdiv, year)
+        self.update(hdays)
+        self.years.add(year)
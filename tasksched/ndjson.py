@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Streaming of tasks and resources from NDJSON files (one JSON object by
+line)."""
+
+from typing import Any, Dict, Iterator, List
+
+import json
+
+from tasksched.utils import hash_file
+
+__all__ = (
+    "read_ndjson",
+    "get_ndjson_files",
+    "iter_config_items",
+    "hash_ndjson_files",
+)
+
+
+def read_ndjson(filename: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read a NDJSON file, line by line (empty lines are ignored).
+
+    :param filename: filename
+    :return: iterator on objects (dicts)
+    """
+    try:
+        with open(filename, encoding="utf-8") as _file:
+            for num_line, line in enumerate(_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                except ValueError as exc:
+                    raise ValueError(
+                        f"{filename}:{num_line}: invalid JSON: {exc}"
+                    ) from exc
+                if not isinstance(item, dict):
+                    raise ValueError(
+                        f"{filename}:{num_line}: JSON object expected"
+                    )
+                yield item
+    except OSError as exc:
+        raise ValueError(f'unable to read file "{filename}": {exc}') from exc
+
+
+def get_ndjson_files(config: Dict[str, Any], key: str) -> List[str]:
+    """
+    Get the NDJSON files with items for a key of configuration: they are
+    set in key "<key>_files" (a filename or a list of filenames).
+
+    :param config: configuration
+    :param key: key ("tasks" or "resources")
+    :return: list of filenames
+    """
+    files = config.get(f"{key}_files") or []
+    return [files] if isinstance(files, str) else list(files)
+
+
+def iter_config_items(
+    config: Dict[str, Any], key: str
+) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate on items of a key of configuration: items in the configuration
+    then items read from NDJSON files (streamed, they are not merged with
+    other items by id).
+
+    :param config: configuration
+    :param key: key ("tasks" or "resources")
+    :return: iterator on items
+    """
+    files = get_ndjson_files(config, key)
+    if key not in config and not files:
+        raise KeyError(key)
+    yield from config.get(key) or []
+    for filename in files:
+        yield from read_ndjson(filename)
+
+
+def hash_ndjson_files(config: Dict[str, Any]) -> List[List[str]]:
+    """
+    Return the hash of content of all NDJSON files in configuration.
+
+    :param config: configuration
+    :return: list of [filename, SHA-256 of content]
+    """
+    hashes = []
+    for key in ("resources", "tasks"):
+        for filename in get_ndjson_files(config, key):
+            try:
+                hashes.append([filename, hash_file(filename)])
+            except OSError as exc:
+                raise ValueError(
+                    f'unable to read file "{filename}": {exc}'
+                ) from exc
+    return hashes
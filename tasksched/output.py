@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Output of actions: standard output or file, compressed with gzip or xz
+according to the file extension."""
+
+from contextlib import contextmanager
+from typing import IO, Iterable, Iterator, Optional, Union
+
+import gzip
+import io
+import lzma
+import os
+import sys
+
+__all__ = (
+    "open_output",
+    "write_output",
+)
+
+
+def open_compressed(raw: IO[bytes], filename: str) -> IO:
+    """
+    Open a binary file to write text, compressed according to the extension
+    of filename: gzip for ".gz", xz for ".xz", no compression otherwise.
+
+    :param raw: file opened in binary mode
+    :param filename: name of the output file (used for the extension)
+    :return: file opened in text mode
+    """
+    if filename.endswith(".gz"):
+        # no timestamp in gzip header: same file for the same content
+        return io.TextIOWrapper(
+            gzip.GzipFile(
+                filename=os.path.basename(filename),
+                mode="wb",
+                fileobj=raw,
+                mtime=0,
+            ),
+            encoding="utf-8",
+        )
+    if filename.endswith(".xz"):
+        return lzma.open(raw, "wt", encoding="utf-8")
+    return io.TextIOWrapper(raw, encoding="utf-8")
+
+
+@contextmanager
+def open_output(filename: Optional[str] = None) -> Iterator[IO]:
+    """
+    Open the output of an action: a file is written in a temporary file
+    (in the same directory) which replaces the file only if all the output
+    was written.
+
+    :param filename: output filename (None or "-" for standard output)
+    :return: output file opened in text mode
+    """
+    if not filename or filename == "-":
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+    directory, name = os.path.split(os.path.abspath(filename))
+    path = os.path.join(directory, f".{name}.{os.getpid()}.tmp")
+    try:
+        with open(path, "wb") as raw, open_compressed(raw, filename) as output:
+            yield output
+        os.replace(path, filename)
+    except BaseException:
+        if os.path.exists(path):
+            os.unlink(path)
+        raise
+
+
+def write_output(result: Union[str, Iterable[str]], output: IO):
+    """
+    Write the result of an action, followed by a new line.
+
+    :param result: result: string or iterable on chunks of string
+    :param output: output file
+    """
+    if isinstance(result, str):
+        output.write(result)
+    else:
+        for chunk in result:
+            output.write(chunk)
+    output.write("\n")
@@ -28,6 +28,142 @@ __all__ = (
 )
 
 
+def add_input_options(parser: argparse.ArgumentParser):
+    """
+    Add options for input files of the project.
+
+    :param parser: the parser
+    """
+    parser.add_argument(
+        "-d",
+        "--directory",
+        action="append",
+        metavar="DIR",
+        help=(
+            "directory with YAML/JSON configuration files (*.yaml, *.yml, "
+            "*.json), loaded in alphabetical order after the other files; "
+            "can be given multiple times"
+        ),
+    )
+    parser.add_argument(
+        "--tasks-ndjson",
+        action="append",
+        metavar="FILE",
+        help=(
+            "NDJSON file with tasks (one JSON object by line), added after "
+            "the tasks of the configuration; can be given multiple times"
+        ),
+    )
+    parser.add_argument(
+        "--resources-ndjson",
+        action="append",
+        metavar="FILE",
+        help=(
+            "NDJSON file with resources (one JSON object by line), added "
+            "after the resources of the configuration; can be given "
+            "multiple times"
+        ),
+    )
+
+
+def add_output_option(parser: argparse.ArgumentParser):
+    """
+    Add option to write the output in a file.
+
+    :param parser: the parser
+    """
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="FILE",
+        help=(
+            "write output in this file instead of standard output, "
+            "compressed with gzip if the file ends with .gz or xz if it "
+            "ends with .xz"
+        ),
+    )
+
+
+def add_workplan_options(parser: argparse.ArgumentParser):
+    """
+    Add options for actions building the work plan.
+
+    :param parser: the parser
+    """
+    parser.add_argument(
+        "-J",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help=(
+            "number of processes used to build the work plan "
+            "(0 = number of CPUs)"
+        ),
+    )
+    parser.add_argument(
+        "--search",
+        choices=["prefix", "beam"],
+        default="prefix",
+        help=(
+            "search of tasks to split: prefix (split the longest tasks "
+            "in 2) or beam (then split tasks up to their max resources "
+            "with a beam search)"
+        ),
+    )
+    parser.add_argument(
+        "--beam-width",
+        type=int,
+        default=4,
+        metavar="N",
+        help="number of candidates kept at each level of beam search",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["objects", "arrays"],
+        default="objects",
+        help=(
+            "engine used to build the work plan: objects or arrays "
+            "(same work plan, less memory kept by the work plan)"
+        ),
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        metavar="SECONDS",
+        help=(
+            "max time to search the best work plan, the best one found "
+            "so far is used when the time is exceeded"
+        ),
+    )
+    add_input_options(parser)
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help=(
+            "directory used to cache work plans: the work plan is built "
+            "only if the project or options changed (disabled by default)"
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=float,
+        default=100,
+        metavar="MB",
+        help=(
+            "max size of the cache directory in MB, the least recently "
+            "used work plans are removed (0 = no limit)"
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-age",
+        type=float,
+        default=30,
+        metavar="DAYS",
+        help="max age of work plans not used in cache (0 = no limit)",
+    )
+
+
 def add_text_options(
     parser: argparse.ArgumentParser, action: str, help_filename: str
 ):
@@ -56,6 +192,38 @@ def add_text_options(
         action="store_true",
         help="do not use unicode chars in output",
     )
+    parser.add_argument(
+        "-s",
+        "--scale",
+        choices=["day", "week", "month"],
+        default="day",
+        help=(
+            "one char by business day, week or month (colored with the task "
+            "that has the most days in the week or month)"
+        ),
+    )
+    parser.add_argument(
+        "--from",
+        dest="date_from",
+        metavar="DATE",
+        help="display the work plan from this date (format: YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--to",
+        dest="date_to",
+        metavar="DATE",
+        help="display the work plan up to this date (format: YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "-w",
+        "--width",
+        metavar="COLUMNS",
+        help=(
+            'max width of lines, "auto" for the terminal width (bars are cut '
+            "at the end)"
+        ),
+    )
+    add_output_option(parser)
     parser.add_argument(
         "filename",
         nargs="*",
@@ -86,6 +254,7 @@ def add_html_options(
         default="dark",
         help="CSS name or path",
     )
+    add_output_option(parser)
     parser.add_argument(
         "filename",
         nargs="*",
@@ -152,6 +321,15 @@ def get_parser(tasksched_version: str) -> argparse.ArgumentParser:
         "the previous ones; if available, the standard input content "
         "is loaded before these files"
     )
+    help_input_filename = (
+        f"{help_filename}; a directory or a pattern (like "
+        '"teams/*.yaml") is replaced by the files it contains or matches, '
+        "in alphabetical order"
+    )
+    help_project_filename = (
+        f"{help_input_filename}; a compiled project (see action compile) is "
+        "loaded alone"
+    )
 
     subparsers = parser.add_subparsers(dest="action")
     subparsers.required = True
@@ -166,12 +344,25 @@ def get_parser(tasksched_version: str) -> argparse.ArgumentParser:
         "-j",
         "--json",
         action="store_true",
-        help="return JSON instead of YAML",
+        help="return JSON instead of YAML (same as --format json)",
+    )
+    parser_workplan.add_argument(
+        "-f",
+        "--format",
+        choices=["yaml", "json", "compact"],
+        default="yaml",
+        help=(
+            "output format: YAML, JSON or compact JSON (task titles stored "
+            "once, assignments as pairs task index/days, accepted as input "
+            "by actions text and html)"
+        ),
     )
+    add_output_option(parser_workplan)
+    add_workplan_options(parser_workplan)
     parser_workplan.add_argument(
         "filename",
         nargs="*",
-        help=help_filename,
+        help=help_project_filename,
     )
     parser_workplan.set_defaults(action="workplan")
 
@@ -200,7 +391,10 @@ def get_parser(tasksched_version: str) -> argparse.ArgumentParser:
             "(shortcut of workplan + text actions)"
         ),
     )
-    add_text_options(parser_workplan_text, "workplan_text", help_filename)
+    add_workplan_options(parser_workplan_text)
+    add_text_options(
+        parser_workplan_text, "workplan_text", help_project_filename
+    )
 
     # action: "workplan_html"
     parser_workplan_html = subparsers.add_parser(
@@ -211,6 +405,56 @@ def get_parser(tasksched_version: str) -> argparse.ArgumentParser:
             "(shortcut of workplan + html actions)"
         ),
     )
-    add_html_options(parser_workplan_html, "workplan_html", help_filename)
+    add_workplan_options(parser_workplan_html)
+    add_html_options(
+        parser_workplan_html, "workplan_html", help_project_filename
+    )
+
+    # action: "compile"
+    parser_compile = subparsers.add_parser(
+        "compile",
+        add_help=False,
+        help=(
+            "validate the project and write it in a binary file, with "
+            "resolved start date and holidays, that actions workplan, "
+            "workplan_text and workplan_html load without parsing"
+        ),
+    )
+    parser_compile.add_argument(
+        "-o",
+        "--output",
+        required=True,
+        metavar="FILE",
+        help="compiled project filename",
+    )
+    add_input_options(parser_compile)
+    parser_compile.add_argument(
+        "filename",
+        nargs="*",
+        help=help_input_filename,
+    )
+    parser_compile.set_defaults(action="compile")
+
+    # action: "holidays"
+    parser_holidays = subparsers.add_parser(
+        "holidays",
+        add_help=False,
+        help=(
+            "compute holidays and store them in cache (directory set by "
+            "environment variable TASKSCHED_HOLIDAYS_CACHE, default is "
+            "~/.cache/tasksched/holidays)"
+        ),
+    )
+    parser_holidays.add_argument(
+        "--warm",
+        required=True,
+        metavar="COUNTRIES",
+        help="countries ISO codes, separated by commas (example: FRA,DEU)",
+    )
+    add_output_option(parser_holidays)
+    parser_holidays.add_argument(
+        "years",
+        help="a year or a range of years (example: 2020-2035)",
+    )
 
     return parser
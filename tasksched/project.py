@@ -23,28 +23,29 @@
 
 from math import ceil
 from operator import attrgetter
-from typing import Any, Dict, List
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
+import copy
 import datetime
 
-from holidays import country_holidays
-
-from tasksched.utils import (
-    is_business_day,
-    add_business_days,
-    string_to_date,
-)
+from tasksched.business_calendar import BusinessCalendar
+from tasksched.holidays_cache import CachedHolidays, HolidaysCache
+from tasksched.ndjson import iter_config_items
+from tasksched.utils import string_to_date
 
 __all__ = (
     "Resource",
     "Task",
     "Project",
+    "ProjectSnapshot",
 )
 
 
 class Resource:  # pylint: disable=too-few-public-methods
     """A resource."""
 
+    __slots__ = ("res_id", "name")
+
     def __init__(self, res_id: str, name: str) -> None:
         self.res_id: str = str(res_id)
         self.name: str = name
@@ -56,6 +57,8 @@ class Resource:  # pylint: disable=too-few-public-methods
 class Task:  # pylint: disable=too-few-public-methods
     """A task."""
 
+    __slots__ = ("task_id", "title", "duration", "priority", "max_resources")
+
     # pylint: disable=too-many-arguments, too-many-positional-arguments
     def __init__(
         self,
@@ -80,32 +83,60 @@ class Task:  # pylint: disable=too-few-public-methods
         )
 
 
+class ProjectSnapshot(NamedTuple):
+    """
+    Read-only view of a project, shared by all the work plans built for it
+    (the holidays are shared, not copied).
+    """
+
+    name: str
+    start_date: datetime.date
+    holidays_iso: str
+    hdays: Dict[datetime.date, str]
+    calendar: BusinessCalendar
+    resources: Tuple[Resource, ...]
+    tasks: Tuple[Task, ...]
+
+    def snapshot(self) -> "ProjectSnapshot":
+        """
+        Return the snapshot itself (it is already read-only).
+
+        :return: project snapshot
+        """
+        return self
+
+
 class Project:
     """A project."""
 
-    def __init__(self, config: Dict[str, Any]) -> None:
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        holidays_cache: Optional[HolidaysCache] = None,
+    ) -> None:
         project = config["project"]
         self.name: str = project["name"]
         self.start_date: datetime.date = string_to_date(project.get("start"))
         self.holidays_iso: str = project.get("holidays")
         if self.holidays_iso:
-            self.hdays: Dict[datetime.date, str] = country_holidays(
-                self.holidays_iso,
-                years=range(self.start_date.year, self.start_date.year + 10),
+            # holidays are loaded only for the years used (on demand)
+            self.hdays: Dict[datetime.date, str] = CachedHolidays(
+                self.holidays_iso, cache=holidays_cache
             )
         else:
             self.hdays = {}
+        self.calendar = BusinessCalendar(self.start_date, self.hdays)
         # adjust the start date to the next business if needed
-        if not is_business_day(self.start_date, self.hdays):
-            self.start_date = add_business_days(
-                self.start_date, 1, self.hdays
+        if not self.calendar.is_business_day(self.start_date):
+            self.start_date = self.calendar.add_business_days(
+                self.start_date, 1
             )
         self.resources: List[Resource] = [
             Resource(
                 res["id"],
                 res.get("name", res["id"]),
             )
-            for res in config["resources"]
+            for res in iter_config_items(config, "resources")
         ]
         if not self.resources:
             raise ValueError("At least one resource is required")
@@ -117,12 +148,45 @@ class Project:
                 task.get("priority", 0),
                 task.get("max_resources", 2),
             )
-            for task in config["tasks"]
+            for task in iter_config_items(config, "tasks")
             if task["duration"] > 0
         ]
         if not self.tasks:
             raise ValueError("At least one task is required")
 
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    @classmethod
+    def from_items(
+        cls,
+        name: str,
+        start_date: datetime.date,
+        holidays_iso: str,
+        hdays: Dict[datetime.date, str],
+        resources: List[Resource],
+        tasks: List[Task],
+    ) -> "Project":
+        """
+        Build a project with items already validated (for example loaded
+        from a compiled project): the start date must be a business day.
+
+        :param name: project name
+        :param start_date: start date (business day)
+        :param holidays_iso: country ISO code for holidays
+        :param hdays: holidays
+        :param resources: resources
+        :param tasks: tasks
+        :return: project
+        """
+        project = cls.__new__(cls)
+        project.name = name
+        project.start_date = start_date
+        project.holidays_iso = holidays_iso
+        project.hdays = hdays
+        project.calendar = BusinessCalendar(start_date, hdays)
+        project.resources = resources
+        project.tasks = tasks
+        return project
+
     def sorted_tasks(
         self, key: List[str], reverse: bool = False
     ) -> List[Task]:
@@ -140,6 +204,24 @@ class Project:
             reverse=reverse,
         )
 
+    def snapshot(self) -> ProjectSnapshot:
+        """
+        Return a read-only snapshot of the project: resources and tasks are
+        copied, so the snapshot is not affected by later changes in the
+        project.
+
+        :return: project snapshot
+        """
+        return ProjectSnapshot(
+            name=self.name,
+            start_date=self.start_date,
+            holidays_iso=self.holidays_iso,
+            hdays=self.hdays,
+            calendar=self.calendar,
+            resources=tuple(copy.copy(res) for res in self.resources),
+            tasks=tuple(copy.copy(task) for task in self.tasks),
+        )
+
     def __str__(self) -> str:
         str_res = "\n".join([f"    {str(res)}" for res in self.resources])
         str_tasks = "\n".join([f"    {str(task)}" for task in self.tasks])
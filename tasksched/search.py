@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Search of the tasks to split for the shortest work plan."""
+
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+import heapq
+import os
+import time
+
+from tasksched.project import Project, ProjectSnapshot, Task
+
+__all__ = (
+    "split_duration",
+    "get_lower_bound",
+    "SplitSearch",
+    "evaluate_candidates",
+    "find_best_split",
+    "beam_search_split",
+)
+
+# project and tasks ids received by a worker process (see find_best_split)
+_worker_data: Dict[str, Any] = {}
+
+
+def split_duration(duration: int, number: int) -> List[int]:
+    """
+    Split a duration into multiple durations which are all almost the same,
+    and sum == duration (null values are removed).
+
+    For example if duration == 10 and number == 3, result is [4, 3, 3].
+
+    :param duration: duration to split
+    :param number: number of splits
+    :return: list of durations
+    """
+    return list(
+        filter(
+            None,
+            [
+                duration // number + (1 if x < duration % number else 0)
+                for x in range(number)
+            ],
+        )
+    )
+
+
+def get_longest_chunk(task: Task, number: int) -> int:
+    """
+    Return the duration of the longest chunk of a task split in "number"
+    parts (the task is not split if "number" is greater than its max
+    resources).
+
+    :param task: the task
+    :param number: number of splits
+    :return: duration of the longest chunk
+    """
+    if 1 < number <= task.max_resources:
+        return ceil(task.duration / number)
+    return task.duration
+
+
+def get_lower_bound(
+    project: Union[Project, ProjectSnapshot],
+    tasks_to_split: Optional[Dict[str, int]] = None,
+    max_split: bool = False,
+) -> int:
+    """
+    Return a lower bound of the work plan duration when tasks are split:
+    the work is at best evenly shared between all resources and the longest
+    task chunk can not be shortened.
+
+    :param project: the project
+    :param tasks_to_split: tasks to split, keys are task ids (str),
+        values are number of splits (int)
+    :param max_split: if True, all tasks are split in their max number of
+        resources ("tasks_to_split" is ignored)
+    :return: lower bound of the duration (in days)
+    """
+    tasks_to_split = tasks_to_split or {}
+    total = 0
+    longest_chunk = 0
+    for task in project.tasks:
+        if max_split:
+            number = task.max_resources
+        else:
+            number = tasks_to_split.get(task.task_id, 1)
+        chunk = get_longest_chunk(task, number)
+        total += task.duration
+        longest_chunk = max(longest_chunk, chunk)
+    return max(ceil(total / len(project.resources)), longest_chunk)
+
+
+class SplitSearch:  # pylint: disable=too-many-instance-attributes
+    """
+    Incremental evaluation of the work plan duration when tasks are split.
+
+    The tasks chunks are kept in the order used by the scheduler (priority
+    then duration, from higher to lower, then declaration order), as sorted
+    keys (-priority, -duration, task index, chunk index).  When a task is
+    split, its chunks are moved in this order by insertion and only the
+    assignments from the first changed position are replayed.
+
+    Only the duration of the work plan is computed here: the work plan
+    itself must be built with the tasks to split that were found.
+
+    The count of chunks by duration is kept as well, to get the lower bound
+    of the duration without scheduling anything.
+    """
+
+    def __init__(self, project: Union[Project, ProjectSnapshot]) -> None:
+        self.tasks = project.tasks
+        self.resources_count: int = len(project.resources)
+        self.tasks_index: Dict[str, List[int]] = {}
+        for index, task in enumerate(self.tasks):
+            self.tasks_index.setdefault(task.task_id, []).append(index)
+        self.splits: Dict[str, int] = {}
+        self.order: List[Tuple] = sorted(
+            (-task.priority, -task.duration, index, 0)
+            for index, task in enumerate(self.tasks)
+        )
+        # assignments done (resource index and days), in the order above;
+        # only the first "valid" ones are up-to-date with the order
+        self.choices: List[int] = []
+        self.days: List[int] = []
+        self.valid: int = 0
+        self.durations: List[int] = [0] * self.resources_count
+        self.duration: int = 0
+        self.total: int = sum(task.duration for task in self.tasks)
+        # count of chunks by duration, and heap of durations (negative values)
+        self.chunks_count: Dict[int, int] = {}
+        self.chunks_heap: List[int] = []
+        for task in self.tasks:
+            self.add_chunk(task.duration)
+
+    def add_chunk(self, duration: int):
+        """
+        Add a chunk in the count of chunks by duration.
+
+        :param duration: chunk duration
+        """
+        count = self.chunks_count.get(duration, 0)
+        if count == 0:
+            heapq.heappush(self.chunks_heap, -duration)
+        self.chunks_count[duration] = count + 1
+
+    def longest_chunk(self) -> int:
+        """
+        Return the duration of the longest chunk.
+
+        :return: longest chunk duration
+        """
+        heap = self.chunks_heap
+        while self.chunks_count.get(-heap[0], 0) == 0:
+            heapq.heappop(heap)
+        return -heap[0]
+
+    def lower_bound(self) -> int:
+        """
+        Return a lower bound of the work plan duration with the current
+        split of tasks (see function get_lower_bound).
+
+        :return: lower bound of the duration (in days)
+        """
+        return max(
+            ceil(self.total / self.resources_count), self.longest_chunk()
+        )
+
+    def chunks(self, index: int, number: int) -> List[Tuple]:
+        """
+        Return the sort keys of chunks of a task split in "number" parts.
+
+        :param index: task index
+        :param number: number of splits
+        :return: list of sort keys
+        """
+        task = self.tasks[index]
+        if 1 < number <= task.max_resources:
+            durations = split_duration(task.duration, number)
+        else:
+            durations = [task.duration]
+        return [
+            (-task.priority, -duration, index, i)
+            for i, duration in enumerate(durations)
+        ]
+
+    def split(self, task_id: str, number: int):
+        """
+        Split a task in "number" parts (all tasks with this id are split).
+
+        :param task_id: task id
+        :param number: number of splits
+        """
+        old_number = self.splits.get(task_id, 1)
+        if number == old_number:
+            return
+        self.splits[task_id] = number
+        first_changed = self.valid
+        for index in self.tasks_index.get(task_id, []):
+            old_chunks = self.chunks(index, old_number)
+            new_chunks = self.chunks(index, number)
+            if old_chunks == new_chunks:
+                continue
+            for key in old_chunks:
+                pos = bisect_left(self.order, key)
+                del self.order[pos]
+                first_changed = min(first_changed, pos)
+                self.chunks_count[-key[1]] -= 1
+            for key in new_chunks:
+                pos = bisect_left(self.order, key)
+                self.order.insert(pos, key)
+                first_changed = min(first_changed, pos)
+                self.add_chunk(-key[1])
+        self.valid = first_changed
+
+    def evaluate(self) -> int:
+        """
+        Schedule the tasks chunks and return the work plan duration.
+
+        :return: work plan duration (in days)
+        """
+        choices, days, durations = self.choices, self.days, self.durations
+        if self.valid == len(choices) == len(self.order):
+            return self.duration
+        # undo the assignments which are not valid any more
+        for pos in range(len(choices) - 1, self.valid - 1, -1):
+            durations[choices[pos]] -= days[pos]
+        del choices[self.valid :]
+        del days[self.valid :]
+        # replay the assignments from the first changed position
+        heap = [(duration, index) for index, duration in enumerate(durations)]
+        heapq.heapify(heap)
+        for key in self.order[self.valid :]:
+            duration, index = heap[0]
+            duration -= key[1]
+            durations[index] = duration
+            heapq.heapreplace(heap, (duration, index))
+            choices.append(index)
+            days.append(-key[1])
+        self.valid = len(choices)
+        self.duration = max(durations)
+        return self.duration
+
+
+def get_deadline(time_limit: Optional[float]) -> float:
+    """
+    Return the deadline of a search, compared to time.monotonic().
+
+    :param time_limit: max time for the search (in seconds), None for no
+        limit
+    :return: deadline (infinite if there is no time limit)
+    """
+    if time_limit is None:
+        return float("inf")
+    return time.monotonic() + time_limit
+
+
+def evaluate_candidates(
+    project: Union[Project, ProjectSnapshot],
+    tasks_ids: Sequence[str],
+    start: int,
+    end: int,
+    time_limit: Optional[float] = None,
+) -> Tuple[int, int]:
+    """
+    Evaluate the candidates from "start" to "end" (excluded): the candidate
+    number N is the project with the N first tasks of "tasks_ids" split in 2.
+
+    The candidates which can not be better than the best one (according to
+    their lower bound) are skipped, and the search stops as soon as the
+    lower bound of all candidates is reached, or when the time limit is
+    exceeded (the first candidate is always evaluated).
+
+    :param project: the project
+    :param tasks_ids: ids of tasks to split, in this order
+    :param start: first candidate to evaluate
+    :param end: last candidate to evaluate + 1
+    :param time_limit: max time for the search (in seconds)
+    :return: tuple (duration, candidate) with the best candidate (lowest
+        duration, then lowest candidate number)
+    """
+    deadline = get_deadline(time_limit)
+    lower_bound = get_lower_bound(
+        project, {task_id: 2 for task_id in tasks_ids}
+    )
+    search = SplitSearch(project)
+    for task_id in tasks_ids[:start]:
+        search.split(task_id, 2)
+    best = (search.evaluate(), start)
+    for candidate in range(start + 1, end):
+        if best[0] <= lower_bound or time.monotonic() > deadline:
+            break
+        search.split(tasks_ids[candidate - 1], 2)
+        if search.lower_bound() >= best[0]:
+            continue
+        duration = search.evaluate()
+        if duration < best[0]:
+            best = (duration, candidate)
+    return best
+
+
+def _init_worker(
+    project: Union[Project, ProjectSnapshot],
+    tasks_ids: Sequence[str],
+    time_limit: Optional[float],
+):
+    """
+    Initialize a worker process: the project is received only once.
+
+    :param project: the project
+    :param tasks_ids: ids of tasks to split, in this order
+    :param time_limit: max time for the search (in seconds)
+    """
+    _worker_data["project"] = project
+    _worker_data["tasks_ids"] = tasks_ids
+    _worker_data["deadline"] = get_deadline(time_limit)
+
+
+def _evaluate_worker_candidates(start: int, end: int) -> Tuple[int, int]:
+    """
+    Evaluate candidates in a worker process.
+
+    :param start: first candidate to evaluate
+    :param end: last candidate to evaluate + 1
+    :return: tuple (duration, candidate) with the best candidate
+    """
+    return evaluate_candidates(
+        _worker_data["project"],
+        _worker_data["tasks_ids"],
+        start,
+        end,
+        time_limit=_worker_data["deadline"] - time.monotonic(),
+    )
+
+
+def find_best_split(
+    project: Union[Project, ProjectSnapshot],
+    tasks_ids: Sequence[str],
+    workers: int = 1,
+    time_limit: Optional[float] = None,
+) -> int:
+    """
+    Find the best number of tasks to split in 2 (the first ones in
+    "tasks_ids").
+
+    With multiple workers, the candidates are evaluated by blocks in a pool
+    of processes; the result is the same as with a single worker.
+
+    :param project: the project
+    :param tasks_ids: ids of tasks to split, in this order
+    :param workers: number of processes to use (0 = number of CPUs)
+    :param time_limit: max time for the search (in seconds)
+    :return: number of tasks to split (0 = no task split)
+    """
+    candidates = len(tasks_ids) + 1
+    workers = min(workers or os.cpu_count() or 1, candidates)
+    if workers <= 1:
+        return evaluate_candidates(
+            project, tasks_ids, 0, candidates, time_limit=time_limit
+        )[1]
+    bounds = [candidates * i // workers for i in range(workers + 1)]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(project, tasks_ids, time_limit),
+    ) as executor:
+        results = executor.map(
+            _evaluate_worker_candidates, bounds[:-1], bounds[1:]
+        )
+        return min(results)[1]
+
+
+def get_split_moves(
+    project: Union[Project, ProjectSnapshot],
+    tasks_to_split: Dict[str, int],
+    count: int,
+) -> List[Tuple[str, int]]:
+    """
+    Return the moves to try from a split of tasks: the tasks with the
+    longest chunks are split in one more part.
+
+    :param project: the project
+    :param tasks_to_split: tasks to split, keys are task ids (str),
+        values are number of splits (int)
+    :param count: max number of moves
+    :return: list of tuples (task_id, number of splits)
+    """
+    chunks = sorted(
+        (
+            -get_longest_chunk(task, tasks_to_split.get(task.task_id, 1)),
+            index,
+        )
+        for index, task in enumerate(project.tasks)
+    )
+    moves: List[Tuple[str, int]] = []
+    tasks_ids = set()
+    for _, index in chunks:
+        if len(moves) >= count:
+            break
+        task = project.tasks[index]
+        if task.task_id in tasks_ids:
+            continue
+        tasks_ids.add(task.task_id)
+        number = tasks_to_split.get(task.task_id, 1) + 1
+        if number <= task.max_resources and task.duration >= number:
+            moves.append((task.task_id, number))
+    return moves
+
+
+def get_split_search(
+    project: Union[Project, ProjectSnapshot], split: Dict[str, int]
+) -> SplitSearch:
+    """
+    Return the incremental evaluation of a split of tasks.
+
+    :param project: the project
+    :param split: split of tasks (keys are task ids, values are number of
+        splits)
+    :return: split search with the tasks split
+    """
+    search = SplitSearch(project)
+    for task_id, number in split.items():
+        search.split(task_id, number)
+    return search
+
+
+def expand_split(
+    project: Union[Project, ProjectSnapshot],
+    split: Dict[str, int],
+    count: int,
+    visited: Set[Tuple[Tuple[str, int], ...]],
+    deadline: float,
+) -> Tuple[List[Tuple[int, Dict[str, int]]], bool]:
+    """
+    Evaluate the splits derived from a split of tasks (see get_split_moves),
+    skipping the splits already visited.
+
+    :param project: the project
+    :param split: split of tasks (keys are task ids, values are number of
+        splits)
+    :param count: max number of moves
+    :param visited: splits already visited (as sorted tuples of items),
+        updated with the new splits
+    :param deadline: time (monotonic) after which the search stops
+    :return: tuple (list of tuples (duration, new split), True if the time
+        limit was exceeded)
+    """
+    search = get_split_search(project, split)
+    candidates: List[Tuple[int, Dict[str, int]]] = []
+    for task_id, number in get_split_moves(project, split, count):
+        if time.monotonic() > deadline:
+            return candidates, True
+        new_split = dict(split)
+        new_split[task_id] = number
+        key = tuple(sorted(new_split.items()))
+        if key in visited:
+            continue
+        visited.add(key)
+        search.split(task_id, number)
+        candidates.append((search.evaluate(), new_split))
+        search.split(task_id, split.get(task_id, 1))
+    return candidates, False
+
+
+def beam_search_split(
+    project: Union[Project, ProjectSnapshot],
+    tasks_to_split: Optional[Dict[str, int]] = None,
+    beam_width: int = 4,
+    time_limit: Optional[float] = None,
+    patience: int = 10,
+) -> Dict[str, int]:
+    """
+    Search the best split of tasks with a beam search: each task can be
+    split from 2 to its max number of resources.
+
+    At each level, every split kept in the beam is derived into splits
+    where one of its tasks with the longest chunks is split in one more
+    part; the "beam_width" best ones (lowest duration, then order of
+    generation) are kept for the next level.  The search stops after
+    "patience" levels without improvement of the best duration, when the
+    lower bound is reached or when the time limit is exceeded.
+
+    :param project: the project
+    :param tasks_to_split: initial split of tasks (keys are task ids,
+        values are number of splits)
+    :param beam_width: number of splits kept at each level
+    :param time_limit: max time for the search (in seconds)
+    :param patience: max number of consecutive levels without improvement
+    :return: best split of tasks found
+    """
+    deadline = get_deadline(time_limit)
+    lower_bound = get_lower_bound(project, max_split=True)
+    tasks_to_split = dict(tasks_to_split or {})
+    best = (
+        get_split_search(project, tasks_to_split).evaluate(),
+        tasks_to_split,
+    )
+    beam = [tasks_to_split]
+    visited = {tuple(sorted(tasks_to_split.items()))}
+    levels_without_improvement = 0
+    while beam and best[0] > lower_bound:
+        candidates: List[Tuple[int, Dict[str, int]]] = []
+        timeout = False
+        for split in beam:
+            expanded, timeout = expand_split(
+                project, split, beam_width, visited, deadline
+            )
+            candidates.extend(expanded)
+            if timeout:
+                break
+        # stable sort: same duration are kept in the order of generation
+        candidates.sort(key=itemgetter(0))
+        if candidates and candidates[0][0] < best[0]:
+            best = candidates[0]
+            levels_without_improvement = 0
+        else:
+            levels_without_improvement += 1
+        if timeout or levels_without_improvement >= patience:
+            break
+        beam = [candidate[1] for candidate in candidates[:beam_width]]
+    return best[1]
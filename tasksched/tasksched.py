@@ -21,19 +21,42 @@
 
 """Task scheduler with automatic resource leveling."""
 
-from typing import Any, Dict, IO, List, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, IO, Iterator, List, Optional, Union
 
+import datetime
+import glob
 import json
+import os
+import shutil
 import sys
 
 import yaml
 
+from tasksched.cache import WorkPlanCache, get_cache_key
+from tasksched.compiled import (
+    is_compiled_project,
+    load_compiled_project,
+    write_compiled_project,
+)
+from tasksched.holidays_cache import HolidaysCache, get_holidays_cache_dir
+from tasksched.ndjson import get_ndjson_files, hash_ndjson_files
+from tasksched.output import open_output, write_output
 from tasksched.parser import get_parser
 from tasksched.project import Project
-from tasksched.workplan import build_workplan
-from tasksched.workplan_text import workplan_to_text
-from tasksched.workplan_html import workplan_to_html
-from tasksched.utils import yaml_dump
+from tasksched.utils import hash_file
+from tasksched.workplan import ArrayWorkPlan, WorkPlan, build_workplan
+from tasksched.workplan_text import iter_workplan_text
+from tasksched.workplan_html import iter_workplan_html
+from tasksched.workplan_compact import (
+    expand_compact_workplan,
+    is_compact_workplan,
+    iter_workplan_compact,
+)
+from tasksched.workplan_stream import (
+    iter_workplan_json,
+    iter_workplan_yaml,
+)
 
 __version__ = "0.6.0-dev"
 
@@ -44,6 +67,12 @@ __all__ = (
     "init",
 )
 
+# extensions of files loaded in a directory
+INPUT_EXTENSIONS = (".yaml", ".yml", ".json")
+
+# max number of threads used to load input files
+LOAD_MAX_WORKERS = 16
+
 
 def error(message: str):
     """
@@ -55,6 +84,56 @@ def error(message: str):
     print("Try with --help to get help on tasksched", file=sys.stderr)
 
 
+def is_pattern(filename: str) -> bool:
+    """
+    Check if a filename is a pattern (with wildcards "*", "?" or "[").
+
+    :param filename: filename
+    :return: True if the filename is a pattern
+    """
+    return any(char in filename for char in "*?[")
+
+
+def expand_filenames(filenames: List[str]) -> List[str]:
+    """
+    Expand filenames: a pattern (like "teams/*.yaml") is replaced by the
+    sorted list of matching files, a directory by its YAML/JSON files.
+
+    :param filenames: filenames, patterns or directories
+    :return: list of filenames
+    """
+    files = []
+    for filename in filenames:
+        if os.path.isdir(filename):
+            files.extend(
+                sorted(
+                    os.path.join(filename, name)
+                    for name in os.listdir(filename)
+                    if name.endswith(INPUT_EXTENSIONS)
+                    and os.path.isfile(os.path.join(filename, name))
+                )
+            )
+        elif is_pattern(filename) and not os.path.exists(filename):
+            # a pattern without match is kept (error when reading the file)
+            files.extend(sorted(glob.glob(filename)) or [filename])
+        else:
+            files.append(filename)
+    return files
+
+
+def get_input_filenames(args) -> List[str]:
+    """
+    Get list of input filenames: filenames received on command line then
+    files of directories given with option -d/--directory.
+
+    :param argparse.Namespace args: command-line arguments
+    :return: list of filenames
+    """
+    return expand_filenames(
+        list(args.filename) + (getattr(args, "directory", None) or [])
+    )
+
+
 def get_input_files(args) -> List[Any]:
     """
     Get list of input files (optional stdin file + filenames).
@@ -62,26 +141,73 @@ def get_input_files(args) -> List[Any]:
     :param argparse.Namespace args: command-line arguments
     :return: list of files/filenames
     """
-    files = []
+    files: List[Any] = []
     if not sys.stdin.isatty():
         files.append(sys.stdin)
-    files.extend(args.filename)
+    files.extend(get_input_filenames(args))
     return files
 
 
-def read_file(input_file: Union[IO, str]) -> Dict:
+def parse_json_float(value: str) -> Union[float, str]:
+    """
+    Parse a JSON float like YAML does: an exponent is allowed only after a
+    dot and with a sign, otherwise the value is kept as string.
+
+    :param value: float as string
+    :return: float or string
+    """
+    mantissa, exponent_sep, exponent = value.partition("e")
+    if not exponent_sep:
+        mantissa, exponent_sep, exponent = value.partition("E")
+    if exponent_sep and ("." not in mantissa or exponent[:1] not in "+-"):
+        return value
+    return float(value)
+
+
+def load_data(data: str) -> Any:
+    """
+    Load YAML or JSON data: JSON is parsed with json module and YAML with
+    libyaml if available (the result is the same as yaml.safe_load).
+
+    :param data: YAML or JSON data
+    :return: data loaded
+    """
+    if data.lstrip()[:1] in ("{", "["):
+        try:
+            return json.loads(data, parse_float=parse_json_float)
+        except ValueError:
+            pass  # not JSON (YAML flow style or invalid data)
+    if hasattr(yaml, "CSafeLoader"):
+        return yaml.load(data, Loader=yaml.CSafeLoader)
+    return yaml.safe_load(data)
+
+
+def load_file(input_file: Union[IO, str]) -> Dict:
+    """
+    Load input file (YAML or JSON), without displaying errors.
+
+    :param input_file: input file
+    :return: input file as dict
+    """
+    if isinstance(input_file, str):
+        with open(input_file, encoding="utf-8") as _file:
+            return load_data(_file.read())
+    return load_data(input_file.read())
+
+
+def read_file(input_file: Union[IO, str], future: Any = None) -> Dict:
     """
     Read input file (YAML or JSON).
 
     :param input_file: input file
+    :param future: future with the result of load_file on this file (if
+        it is loaded in another thread)
     :return: input file as dict
     """
     try:
-        if isinstance(input_file, str):
-            with open(input_file, encoding="utf-8") as _file:
-                return yaml.safe_load(_file)
-        else:
-            return yaml.safe_load(input_file)
+        if future is not None:
+            return future.result()
+        return load_file(input_file)
     except (FileNotFoundError, yaml.parser.ParserError) as exc:
         if isinstance(input_file, str):
             error(f'ERROR: unable to decode input file "{input_file}": {exc}')
@@ -105,7 +231,53 @@ def search_item(list_items: List[Any], item_id: Any) -> Any:
     return None
 
 
-def merge_configs(config: Dict, new_config: Dict):
+def index_items(index: Dict[str, Any]):
+    """
+    Add new items of a list in the index of items by id (only the first
+    item with a given id is indexed, like search_item does).
+
+    :param index: index of the list: dict with keys "items" (the list),
+        "ids" (dict: id → item) and "count" (number of items indexed)
+    """
+    items, ids = index["items"], index["ids"]
+    for item in items[index["count"] :]:
+        if isinstance(item, dict):
+            item_id = item.get("id")
+            if item_id and item_id not in ids:
+                ids[item_id] = item
+    index["count"] = len(items)
+
+
+def merge_list(index: Dict[str, Any], new_items: List[Any]):
+    """
+    Merge items into a list: a dict with the id of an item of the list
+    updates this item, other items are added to the list.
+
+    :param index: index of the list (see index_items)
+    :param new_items: items to merge into the list
+    """
+    index_items(index)
+    items, ids = index["items"], index["ids"]
+    for item in new_items:
+        if isinstance(item, dict):
+            item_id = item.get("id")
+            config_item = ids.get(item_id) if item_id else None
+            if config_item is None:
+                items.append(item)
+                if item_id:
+                    ids[item_id] = item
+            else:
+                config_item.update(item)
+        else:
+            items.append(item)
+    index["count"] = len(items)
+
+
+def merge_configs(
+    config: Dict,
+    new_config: Dict,
+    indexes: Optional[Dict[str, Dict[str, Any]]] = None,
+):
     """
     Merge config2 into config: each value in config is updated with value
     from config2: for dicts (like "project"), keys are updated, for lists
@@ -113,7 +285,11 @@ def merge_configs(config: Dict, new_config: Dict):
 
     :param dict config: first config to update
     :param dict new_config: dictionary used to update the config
+    :param indexes: indexes of items by id for each list in config, which
+        can be kept between calls with the same config (built if not set)
     """
+    if indexes is None:
+        indexes = {}
     for key, value in new_config.items():
         if key not in config:
             config[key] = value
@@ -129,54 +305,228 @@ def merge_configs(config: Dict, new_config: Dict):
                 raise ValueError(
                     f"merge config error: " f'cannot update list "{key}"'
                 )
-            for item in value:
-                if isinstance(item, dict):
-                    config_item = search_item(config[key], item.get("id"))
-                    if config_item is None:
-                        config[key].append(item)
-                    else:
-                        config_item.update(item)
-                else:
-                    config[key].append(item)
+            index = indexes.get(key)
+            if index is None or index["items"] is not config[key]:
+                index = {"items": config[key], "ids": {}, "count": 0}
+                indexes[key] = index
+            merge_list(index, value)
         else:
             config[key] = value
 
 
+def merge_file_config(
+    config: Dict,
+    input_file: Union[IO, str],
+    new_config: Dict,
+    indexes: Dict[str, Dict[str, Any]],
+):
+    """
+    Merge the configuration loaded from an input file into config.
+
+    :param config: configuration to update
+    :param input_file: input file
+    :param new_config: configuration loaded from the input file
+    :param indexes: indexes of items by id (see merge_configs)
+    """
+    if not new_config:
+        return
+    if isinstance(input_file, str) and isinstance(new_config, dict):
+        # NDJSON files are relative to the directory of the file
+        directory = os.path.dirname(input_file)
+        for key in ("resources", "tasks"):
+            if new_config.get(f"{key}_files"):
+                new_config[f"{key}_files"] = [
+                    os.path.join(directory, filename)
+                    for filename in get_ndjson_files(new_config, key)
+                ]
+    merge_configs(config, new_config, indexes)
+
+
 def load_config(files: List[Any]) -> Dict:
     """
     Load YAML/JSON configuration by reading stdin (if available) and list of
     input files received on command line.
 
+    Files are loaded in parallel (in threads), then merged in order.
+
     :param list files: files/filenames to load
     :return: configuration
     """
     config: Dict[Any, Any] = {}
-    for _file in files:
-        new_config = read_file(_file)
-        if new_config:
-            merge_configs(config, new_config)
+    indexes: Dict[str, Dict[str, Any]] = {}
+    if len(files) < 2:
+        for _file in files:
+            merge_file_config(config, _file, read_file(_file), indexes)
+        return config
+    with ThreadPoolExecutor(min(len(files), LOAD_MAX_WORKERS)) as executor:
+        futures = [executor.submit(load_file, _file) for _file in files]
+        try:
+            for _file, future in zip(files, futures):
+                new_config = read_file(_file, future)
+                merge_file_config(config, _file, new_config, indexes)
+        finally:
+            for future in futures:
+                future.cancel()
     return config
 
 
-def load_project(args) -> Project:
+def load_project_config(args) -> Dict:
+    """
+    Load project configuration from input files, with the NDJSON files
+    received on command line.
+
+    :param argparse.Namespace args: command-line arguments
+    :return: configuration
+    """
+    config = load_config(get_input_files(args))
+    for key in ("resources", "tasks"):
+        files = getattr(args, f"{key}_ndjson", None)
+        if files:
+            config[f"{key}_files"] = get_ndjson_files(config, key) + files
+    return config
+
+
+def get_compiled_filename(args) -> Optional[str]:
+    """
+    Get the compiled project received on command line, which must be the
+    only input file (standard input is ignored).
+
+    :param argparse.Namespace args: command-line arguments
+    :return: compiled project filename, None if there is no compiled project
+    """
+    input_filenames = get_input_filenames(args)
+    filenames = [name for name in input_filenames if is_compiled_project(name)]
+    if not filenames:
+        return None
+    if len(input_filenames) > 1 or args.tasks_ndjson or args.resources_ndjson:
+        error("ERROR: a compiled project must be the only input file")
+        raise ValueError("a compiled project must be the only input file")
+    return filenames[0]
+
+
+def load_project(args, config: Optional[Dict] = None) -> Project:
     """
     Load project.
 
     :param argparse.Namespace args: command-line arguments
+    :param config: project configuration (if not set, it is loaded from
+        input files, or from the compiled project)
     :return: project
     """
-    files = get_input_files(args)
-    config = load_config(files)
+    if config is None:
+        filename = get_compiled_filename(args)
+        if filename:
+            try:
+                return load_compiled_project(
+                    filename, HolidaysCache(get_holidays_cache_dir())
+                )
+            except ValueError as exc:
+                error(f'ERROR: invalid compiled project: "{exc.args[0]}"')
+                raise
+        config = load_project_config(args)
     try:
-        return Project(config)
+        return Project(
+            config, holidays_cache=HolidaysCache(get_holidays_cache_dir())
+        )
     except (KeyError, ValueError) as exc:
         error(f'ERROR: invalid project: "{exc.args[0]}"')
         raise
 
 
+def build_project_workplan(
+    project: Project, args
+) -> Union[WorkPlan, ArrayWorkPlan]:
+    """
+    Build the work plan of a project.
+
+    :param project: project
+    :param argparse.Namespace args: command-line arguments
+    :return: work plan
+    """
+    return build_workplan(
+        project,
+        workers=args.jobs,
+        search=args.search,
+        beam_width=args.beam_width,
+        time_limit=args.time_limit,
+        engine=args.engine,
+    )
+
+
+def get_workplan_cache(args) -> Optional[WorkPlanCache]:
+    """
+    Get the cache of work plans.
+
+    :param argparse.Namespace args: command-line arguments
+    :return: cache, None if the cache is disabled
+    """
+    if not args.cache_dir:
+        return None
+    return WorkPlanCache(
+        args.cache_dir,
+        max_size=int(args.cache_max_size * 1024 * 1024) or None,
+        max_age=args.cache_max_age * 86400 or None,
+    )
+
+
+def get_project_workplan(args) -> Union[WorkPlan, ArrayWorkPlan, Dict]:
+    """
+    Build the work plan of the project, or get it from the cache if the
+    cache is enabled and the work plan of the same project (built with the
+    same options) is in cache.
+
+    :param argparse.Namespace args: command-line arguments
+    :return: work plan (object, or dict if the cache is enabled)
+    """
+    cache = get_workplan_cache(args)
+    if cache is None:
+        return build_project_workplan(load_project(args), args)
+    project = None
+    compiled = None
+    filename = get_compiled_filename(args)
+    if filename:
+        # the compiled project has a resolved start date
+        project = load_project(args)
+        config = {"project": {"start": project.start_date}}
+        compiled = hash_file(filename)
+    else:
+        config = load_project_config(args)
+    try:
+        ndjson_hashes = hash_ndjson_files(config)
+    except ValueError as exc:
+        error(f'ERROR: invalid project: "{exc.args[0]}"')
+        raise
+    key = get_cache_key(
+        config,
+        __version__,
+        compiled=compiled,
+        ndjson=ndjson_hashes,
+        search=args.search,
+        beam_width=args.beam_width,
+        time_limit=args.time_limit,
+    )
+    workplan = cache.get(key)
+    if workplan is None:
+        if project is None:
+            project = load_project(args, config)
+        workplan = build_project_workplan(project, args).as_dict()
+        cache.put(key, workplan)
+    return workplan
+
+
+def get_workplan_dict(workplan: Union[WorkPlan, ArrayWorkPlan, Dict]) -> Dict:
+    """
+    Get the work plan as dict.
+
+    :param workplan: work plan (object or dict)
+    :return: work plan as dict
+    """
+    return workplan if isinstance(workplan, dict) else workplan.as_dict()
+
+
 def read_workplan(args) -> Dict:
     """
-    Read work plan.
+    Read work plan (a compact work plan is expanded).
 
     :param argparse.Namespace args: command-line arguments
     :return: work plan as dict
@@ -188,37 +538,90 @@ def read_workplan(args) -> Dict:
     if not workplan:
         error("ERROR: missing input work plan")
         raise OSError("missing input work plan")
+    if is_compact_workplan(workplan):
+        try:
+            workplan = expand_compact_workplan(workplan)
+        except (KeyError, TypeError, ValueError) as exc:
+            error(f'ERROR: invalid compact work plan: "{exc}"')
+            raise
     return workplan
 
 
-def convert_workplan_to_text(workplan: Dict, args) -> str:
+def parse_date(date: Optional[str]) -> Optional[datetime.date]:
+    """
+    Parse a date (format: YYYY-MM-DD).
+
+    :param date: date
+    :return: date (None if date is None or empty)
+    """
+    if not date:
+        return None
+    try:
+        return datetime.date.fromisoformat(date)
+    except ValueError:
+        error(f'ERROR: invalid date: "{date}"')
+        raise
+
+
+def parse_width(width: Optional[str]) -> Optional[int]:
+    """
+    Parse the max width of text: a number of columns, or "auto" for the
+    terminal width.
+
+    :param width: width
+    :return: number of columns (None if width is None or empty)
+    """
+    if not width:
+        return None
+    if width == "auto":
+        return shutil.get_terminal_size().columns
+    try:
+        columns = int(width)
+        if columns <= 0:
+            raise ValueError(f"invalid width: {width}")
+        return columns
+    except ValueError:
+        error(f'ERROR: invalid width: "{width}"')
+        raise
+
+
+def convert_workplan_to_text(workplan: Dict, args) -> Iterator[str]:
     """
     Convert workplan to text.
 
     :param workplan: work plan
     :param argparse.Namespace args: command-line arguments
+    :return: iterator on chunks of text
     """
+    date_from = parse_date(args.date_from)
+    date_to = parse_date(args.date_to)
+    max_width = parse_width(args.width)
     try:
-        return workplan_to_text(
+        yield from iter_workplan_text(
             workplan,
             quiet=args.quiet,
             use_colors=not args.no_colors,
             use_unicode=not args.no_unicode,
+            scale=args.scale,
+            date_from=date_from,
+            date_to=date_to,
+            max_width=max_width,
         )
     except (KeyError, ValueError) as exc:
         error(f'ERROR: invalid work plan: "{exc}"')
         raise
 
 
-def convert_workplan_to_html(workplan: Dict, args) -> str:
+def convert_workplan_to_html(workplan: Dict, args) -> Iterator[str]:
     """
     Convert workplan to HTML.
 
     :param workplan: work plan
     :param argparse.Namespace args: command-line arguments
+    :return: iterator on chunks of HTML
     """
     try:
-        return workplan_to_html(
+        yield from iter_workplan_html(
             workplan,
             template_file=args.template,
             css_file=args.css,
@@ -228,17 +631,36 @@ def convert_workplan_to_html(workplan: Dict, args) -> str:
         raise
 
 
+def get_html_result(html: Iterator[str], args) -> Union[str, Iterator[str]]:
+    """
+    Return the HTML to write: a file is written chunk by chunk (in a
+    temporary file, see open_output), whereas the page is built in memory
+    first for standard output, so that a truncated page is never written
+    if the rendering fails.
+
+    :param html: iterator on chunks of HTML
+    :param argparse.Namespace args: command-line arguments
+    :return: iterator on chunks of HTML, or HTML as string
+    """
+    filename = getattr(args, "output", None)
+    if not filename or filename == "-":
+        return "".join(html)
+    return html
+
+
 def action_workplan(args):
     """
-    Return the work plan using the project configuration.
+    Return the work plan using the project configuration (YAML or JSON),
+    resource by resource and task by task.
 
     :param argparse.Namespace args: command-line arguments
     """
-    project = load_project(args)
-    workplan = build_workplan(project)
-    if args.json:
-        return json.dumps(workplan.as_dict(), default=str)
-    return yaml_dump(workplan.as_dict())
+    workplan = get_project_workplan(args)
+    if args.format == "compact":
+        return iter_workplan_compact(workplan)
+    if args.json or args.format == "json":
+        return iter_workplan_json(workplan)
+    return iter_workplan_yaml(workplan)
 
 
 def action_text(args):
@@ -258,7 +680,7 @@ def action_html(args):
     :param argparse.Namespace args: command-line arguments
     """
     workplan = read_workplan(args)
-    return convert_workplan_to_html(workplan, args)
+    return get_html_result(convert_workplan_to_html(workplan, args), args)
 
 
 def action_workplan_text(args):
@@ -267,9 +689,8 @@ def action_workplan_text(args):
 
     :param argparse.Namespace args: command-line arguments
     """
-    project = load_project(args)
-    workplan = build_workplan(project)
-    return convert_workplan_to_text(workplan.as_dict(), args)
+    workplan = get_project_workplan(args)
+    return convert_workplan_to_text(get_workplan_dict(workplan), args)
 
 
 def action_workplan_html(args):
@@ -278,9 +699,77 @@ def action_workplan_html(args):
 
     :param argparse.Namespace args: command-line arguments
     """
-    project = load_project(args)
-    workplan = build_workplan(project)
-    return convert_workplan_to_html(workplan.as_dict(), args)
+    workplan = get_project_workplan(args)
+    return get_html_result(
+        convert_workplan_to_html(get_workplan_dict(workplan), args), args
+    )
+
+
+def action_compile(args):
+    """
+    Compile the project and write it in a binary file.
+
+    :param argparse.Namespace args: command-line arguments
+    """
+    project = load_project(args, load_project_config(args))
+    try:
+        write_compiled_project(project, args.output)
+    except (OSError, ValueError) as exc:
+        error(f'ERROR: unable to compile project: "{exc}"')
+        raise
+
+
+def parse_years(years: str) -> range:
+    """
+    Parse years: a year ("2020") or a range of years ("2020-2035").
+
+    :param years: years
+    :return: range of years
+    """
+    first, _, last = years.partition("-")
+    try:
+        return range(int(first), int(last or first) + 1)
+    except ValueError:
+        error(f'ERROR: invalid years: "{years}"')
+        raise
+
+
+def action_holidays(args):
+    """
+    Compute holidays of countries and store them in the holidays cache.
+
+    :param argparse.Namespace args: command-line arguments
+    :return: number of years computed for each country
+    """
+    years = parse_years(args.years)
+    cache = HolidaysCache(get_holidays_cache_dir())
+    lines = []
+    for iso in args.warm.split(","):
+        try:
+            count = cache.warm(iso, None, years)
+        except NotImplementedError as exc:
+            error(f"ERROR: invalid country: {exc}")
+            raise
+        lines.append(f"{iso}: {count} year(s) added in cache")
+    return "\n".join(lines)
+
+
+def write_result(result: Union[str, Iterator[str]], args):
+    """
+    Write the result of an action on standard output or in the output file,
+    chunk by chunk.
+
+    :param result: result of action: string or iterator on chunks
+    :param argparse.Namespace args: command-line arguments
+    """
+    filename = getattr(args, "output", None)
+    try:
+        with open_output(filename) as output:
+            write_output(result, output)
+    except OSError as exc:
+        name = filename or "standard output"
+        error(f'ERROR: unable to write output "{name}": {exc}')
+        raise
 
 
 def main():
@@ -289,9 +778,10 @@ def main():
     func = getattr(sys.modules[__name__], f"action_{args.action}")
     try:
         result = func(args)
+        if result is not None:
+            write_result(result, args)
     except Exception:  # pylint: disable=broad-except
         sys.exit(1)
-    print(result)
 
 
 def init(force=False):
@@ -21,19 +21,34 @@
 
 """Utility functions for Tasksched."""
 
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
+import bisect
 import calendar
 import datetime
+import hashlib
 
 import yaml
 
 __all__ = (
     "is_business_day",
     "add_business_days",
+    "count_business_days",
+    "get_holidays",
+    "DaysView",
     "get_days",
     "get_months",
     "string_to_date",
+    "hash_file",
     "yaml_dump",
 )
 
@@ -49,38 +64,267 @@ def is_business_day(
     :return: True if the date is a business day, False otherwise (that means
         the date is either Saturday/Sunday or a public holiday)
     """
-    return date.weekday() < 5 and date not in (hdays or {})
+    return date.weekday() < 5 and (hdays is None or date not in hdays)
+
+
+def get_holidays_ordinals(
+    hdays: Optional[Dict[datetime.date, str]] = None
+) -> List[int]:
+    """
+    Return the sorted ordinals of holidays which are not on week-end days.
+
+    The list is a snapshot of the holidays: the owner of the holidays
+    (for example a BusinessCalendar) should compute it once and compute it
+    again when holidays are added.
+
+    :param hdays: list of dates with holidays
+    :return: sorted list of ordinals (see datetime.date.toordinal)
+    """
+    if not hdays:
+        return []
+    return sorted(
+        date.toordinal()
+        for date in hdays
+        if isinstance(date, datetime.date) and date.weekday() < 5
+    )
+
+
+def count_week_days(ordinal: int) -> int:
+    """
+    Return the number of days from Monday to Friday from 0001-01-01
+    (a Monday, ordinal 1) to the date with this ordinal (included).
+
+    :param ordinal: ordinal of date
+    :return: number of days from Monday to Friday
+    """
+    return 5 * (ordinal // 7) + min(ordinal % 7, 5)
+
+
+def get_week_day_ordinal(count: int) -> int:
+    """
+    Return the ordinal of the "count"-th day from Monday to Friday since
+    0001-01-01 (reverse of count_week_days).
+
+    :param count: number of days from Monday to Friday (≥ 1)
+    :return: ordinal of date
+    """
+    return 7 * ((count - 1) // 5) + (count - 1) % 5 + 1
+
+
+def load_holidays_years(
+    hdays: Optional[Dict[datetime.date, str]],
+    from_date: datetime.date,
+    to_date: datetime.date,
+) -> bool:
+    """
+    Load holidays of the years between two dates, if the holidays are
+    expanded on demand (like holidays.HolidayBase does when a date is
+    checked).
+
+    :param hdays: list of dates with holidays
+    :param from_date: start date
+    :param to_date: end date
+    :return: True if new years have been loaded
+    """
+    years = getattr(hdays, "years", None)
+    if not getattr(hdays, "expand", False) or years is None:
+        return False
+    loaded = False
+    for year in range(from_date.year, to_date.year + 1):
+        if year not in years:
+            # checking a date of the year loads its holidays
+            _ = datetime.date(year, 1, 1) in hdays  # type: ignore
+            loaded = True
+    return loaded
 
 
 def add_business_days(
     from_date: datetime.date,
     count: int,
     hdays: Optional[Dict[datetime.date, str]] = None,
+    ordinals: Optional[List[int]] = None,
 ) -> datetime.date:
     """
     Add "count" business days to a date, skipping week-end days and public
     holidays.
 
+    Whole weeks are computed arithmetically, then holidays are skipped
+    with a binary search in the sorted holidays.
+
     :param from_date: start date
     :param count: number of business days to add (≥ 0)
     :param hdays: list of dates with holidays
+    :param ordinals: sorted ordinals of hdays (see get_holidays_ordinals),
+        computed from hdays if not given
     :return: date with "count" business days added
     """
-    to_add = count
-    current_date = from_date
-    while to_add > 0:
-        current_date += datetime.timedelta(days=1)
-        if not is_business_day(current_date, hdays):
-            continue
-        to_add -= 1
-    return current_date
+    if count <= 0:
+        return from_date
+    start = from_date.toordinal()
+    if ordinals is None:
+        ordinals = get_holidays_ordinals(hdays)
+    while True:
+        target = (
+            count_week_days(start)
+            - bisect.bisect_right(ordinals, start)
+            + count
+        )
+        # smallest date with "target" business days: each holiday found
+        # before the date moves the date after one more week day
+        skipped = 0
+        while True:
+            ordinal = get_week_day_ordinal(target + skipped)
+            holidays_count = bisect.bisect_right(ordinals, ordinal)
+            if holidays_count == skipped:
+                break
+            skipped = holidays_count
+        to_date = datetime.date.fromordinal(ordinal)
+        if not load_holidays_years(
+            hdays, from_date + datetime.timedelta(days=1), to_date
+        ):
+            return to_date
+        ordinals = get_holidays_ordinals(hdays)
+
+
+def count_business_days(
+    from_date: datetime.date,
+    to_date: datetime.date,
+    hdays: Optional[Dict[datetime.date, str]] = None,
+    ordinals: Optional[List[int]] = None,
+) -> int:
+    """
+    Count business days after a date, up to another date (included),
+    skipping week-end days and public holidays; this is the reverse of
+    add_business_days: count_business_days(date, add_business_days(date,
+    count, hdays), hdays) == count.
+
+    :param from_date: start date (excluded)
+    :param to_date: end date (included)
+    :param hdays: list of dates with holidays
+    :param ordinals: sorted ordinals of hdays (see get_holidays_ordinals),
+        computed from hdays if not given
+    :return: number of business days (0 if to_date ≤ from_date)
+    """
+    if to_date <= from_date:
+        return 0
+    if (
+        load_holidays_years(
+            hdays, from_date + datetime.timedelta(days=1), to_date
+        )
+        or ordinals is None
+    ):
+        ordinals = get_holidays_ordinals(hdays)
+    start = from_date.toordinal()
+    end = to_date.toordinal()
+    return (
+        count_week_days(end)
+        - count_week_days(start)
+        - bisect.bisect_right(ordinals, end)
+        + bisect.bisect_right(ordinals, start)
+    )
+
+
+def get_holidays(
+    hdays: Optional[Dict[datetime.date, str]],
+    from_date: datetime.date,
+    to_date: datetime.date,
+) -> List[datetime.date]:
+    """
+    Return holidays between two dates (included), including those on
+    week-end days.
+
+    :param hdays: list of dates with holidays
+    :param from_date: start date
+    :param to_date: end date
+    :return: sorted list of holidays
+    """
+    if hdays is None or to_date < from_date:
+        return []
+    load_holidays_years(hdays, from_date, to_date)
+    return sorted(
+        date
+        for date in hdays
+        if isinstance(date, datetime.date) and from_date <= date <= to_date
+    )
+
+
+class DaysView(Mapping[datetime.date, Dict[str, Any]]):
+    """
+    Read-only dictionary of consecutive days: keys are dates, values are
+    dictionaries with keys "weekday" (str) and "business_day" (bool).
+
+    Only a flag (one byte) is stored for each day, in a bytearray indexed by
+    the number of days since the first day; the values are shared by all
+    days with the same weekday and flag.
+    """
+
+    __slots__ = ("start", "business", "infos")
+
+    def __init__(self, start: datetime.date, business: bytearray):
+        """
+        Initialize the days.
+
+        :param start: first day
+        :param business: for each day since the first day: 1 if it is a
+            business day, 0 otherwise
+        """
+        self.start: datetime.date = start
+        self.business: bytearray = business
+        # infos[weekday][business_day]; 2001-01-01 is a Monday
+        self.infos: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        for weekday in range(7):
+            name = datetime.date(2001, 1, 1 + weekday).strftime("%A")
+            self.infos.append(
+                (
+                    {"weekday": name, "business_day": False},
+                    {"weekday": name, "business_day": True},
+                )
+            )
+
+    def get_offset(self, date: datetime.date) -> int:
+        """
+        Get the number of days between the first day and a date.
+
+        :param date: date
+        :return: number of days since the first day, -1 if the date is not
+            in days
+        """
+        if not isinstance(date, datetime.date):
+            return -1
+        offset = (date - self.start).days
+        return offset if 0 <= offset < len(self.business) else -1
+
+    def is_business_day(self, offset: int) -> bool:
+        """
+        Check if a day is a business day.
+
+        :param offset: number of days since the first day
+        :return: True if the day is a business day, False otherwise
+        """
+        return bool(self.business[offset])
+
+    def __getitem__(self, date: datetime.date) -> Dict[str, Any]:
+        offset = self.get_offset(date)
+        if offset < 0:
+            raise KeyError(date)
+        return self.infos[date.weekday()][self.business[offset]]
+
+    def __contains__(self, date: object) -> bool:
+        return self.get_offset(date) >= 0  # type: ignore
+
+    def __iter__(self) -> Iterator[datetime.date]:
+        for offset in range(len(self.business)):
+            yield self.start + datetime.timedelta(days=offset)
+
+    def __len__(self) -> int:
+        return len(self.business)
 
 
 def get_days(
     from_date: datetime.date,
     to_date: datetime.date,
     hdays: Optional[Dict[datetime.date, str]] = None,
-) -> Dict[datetime.date, Dict[str, Any]]:
+) -> DaysView:
     """
     Return days between two dates, for each day the value is True for a
     business day, False for the other days.
@@ -88,22 +332,20 @@ def get_days(
     :param from_date: start date
     :param to_date: end date
     :param hdays: list of dates with holidays
-    :return: dictionary with days, keys are dates, values are dictionaries with
-        keys: "weekday" (str) and "business_day" (bool)
+    :return: read-only dictionary with days, keys are dates, values are
+        dictionaries with keys: "weekday" (str) and "business_day" (bool)
     """
-    days = {}
-    current_date = from_date
-    while current_date <= to_date:
-        days[current_date] = {
-            "weekday": current_date.strftime("%A"),
-            "business_day": is_business_day(current_date, hdays),
-        }
-        current_date += datetime.timedelta(days=1)
-    return days
+    return DaysView(
+        from_date,
+        bytearray(
+            is_business_day(from_date + datetime.timedelta(days=offset), hdays)
+            for offset in range((to_date - from_date).days + 1)
+        ),
+    )
 
 
 def get_months(
-    days: Dict[datetime.date, Dict[str, Any]]
+    days: Mapping[datetime.date, Dict[str, Any]]
 ) -> List[Tuple[str, int]]:
     """
     Return a dictionary with month as key and the number of days in each
@@ -139,6 +381,30 @@ def string_to_date(the_date: Union[datetime.date, str]) -> datetime.date:
     return datetime.date.fromisoformat(the_date)
 
 
+def hash_file(filename: str) -> str:
+    """
+    Return the hash of content of a file, read by chunks of 1 MB.
+
+    :param filename: filename
+    :return: SHA-256 of content (hexadecimal)
+    """
+    sha256 = hashlib.sha256()
+    with open(filename, "rb") as _file:
+        chunk = _file.read(1 << 20)
+        while chunk:
+            sha256.update(chunk)
+            chunk = _file.read(1 << 20)
+    return sha256.hexdigest()
+
+
+class _NoAliasDumper(yaml.Dumper):  # pylint: disable=too-many-ancestors
+    """YAML dumper without aliases in output."""
+
+    def ignore_aliases(self, data: Any) -> bool:
+        # pylint: disable=unused-argument
+        return True
+
+
 def yaml_dump(data: Dict) -> str:
     """
     Dump dictionary to a YAML string.
@@ -147,5 +413,4 @@ def yaml_dump(data: Dict) -> str:
     :return: YAML as string, keys are not sorted (same order as the dict),
         no aliases in the YAML output
     """
-    yaml.Dumper.ignore_aliases = lambda *args: True  # type: ignore
-    return yaml.dump(data, sort_keys=False)
+    return yaml.dump(data, Dumper=_NoAliasDumper, sort_keys=False)
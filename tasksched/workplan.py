@@ -21,51 +21,164 @@
 
 """Task scheduler work plan."""
 
+from array import array
 from operator import attrgetter
-from typing import Dict, List, Optional
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import copy
 import datetime
+import heapq
+import time
 
-from tasksched.project import Project, Resource, Task
-from tasksched.utils import add_business_days
+from tasksched.project import Project, ProjectSnapshot, Resource, Task
+from tasksched.search import (
+    beam_search_split,
+    find_best_split,
+    get_lower_bound,
+    split_duration,
+)
+from tasksched.utils import get_holidays
 
 __all__ = (
     "WorkPlan",
+    "ArrayWorkPlan",
     "build_workplan",
 )
 
 
-class WorkPlanResource(Resource):  # pylint: disable=too-few-public-methods
+class Assignment(NamedTuple):
+    """Days of a task assigned to a resource."""
+
+    task: "WorkPlanTask"
+    duration: int
+
+
+class WorkPlanResource(Resource):
     """A workplan resource."""
 
+    __slots__ = ("assignments", "duration", "end_date", "use")
+
     def __init__(self, res_id: str, name: str) -> None:
         super().__init__(res_id, name)
-        self.assigned: List[Dict] = []
-        self.assigned_tasks: List[Dict] = []
+        self.assignments: List[Assignment] = []
         self.duration: int = 0
         self.end_date: Optional[datetime.date] = None
-        self.use: int = 0
+        self.use: float = 0
+
+    def assign(self, task: "WorkPlanTask", days: int):
+        """
+        Assign days of a task to the resource.
+
+        :param task: task
+        :param days: number of days in task to assign
+        """
+        self.assignments.append(Assignment(task, days))
+
+    @property
+    def assigned(self) -> List[Dict]:
+        """
+        Return the assigned tasks: list of dicts with keys "task" (task id)
+        and "duration".
+
+        :return: assigned tasks
+        """
+        return [
+            {
+                "task": assignment.task.task_id,
+                "duration": assignment.duration,
+            }
+            for assignment in self.assignments
+        ]
+
+    @property
+    def assigned_tasks(self) -> List[Dict]:
+        """
+        Return the assigned tasks: list of dicts with keys "id" (task id)
+        and "title".
+
+        :return: assigned tasks
+        """
+        return [
+            {
+                "id": assignment.task.task_id,
+                "title": assignment.task.title,
+            }
+            for assignment in self.assignments
+        ]
+
+
+class ResourcePool:  # pylint: disable=too-few-public-methods
+    """
+    Pool of resources ordered by duration (the less used first), then by
+    declaration order, backed by a heap.
+
+    The heap contains tuples (duration, index); an entry is refreshed lazily
+    when the duration of its resource has changed since it was pushed, so
+    resources can be updated without notifying the pool, provided that the
+    duration of a resource never decreases: an entry with a duration higher
+    than the one of its resource could be below the top of the heap and a
+    wrong resource would be returned (this is checked when a stale entry is
+    at the top of the heap).
+    """
+
+    def __init__(self, resources: List[WorkPlanResource]) -> None:
+        self.resources: List[WorkPlanResource] = resources
+        self.heap: List[Tuple[int, int]] = [
+            (res.duration, index) for index, res in enumerate(resources)
+        ]
+        heapq.heapify(self.heap)
+
+    def best(self) -> WorkPlanResource:
+        """
+        Return the best resource to use (the less used resource, by order).
+
+        :return: resource found
+        """
+        heap = self.heap
+        while True:
+            duration, index = heap[0]
+            res = self.resources[index]
+            if res.duration == duration:
+                return res
+            if res.duration < duration:
+                raise ValueError(
+                    f"duration of resource {res.res_id} has decreased "
+                    f"({duration} -> {res.duration})"
+                )
+            heapq.heapreplace(heap, (res.duration, index))
 
 
 class WorkPlanTask(Task):  # pylint: disable=too-few-public-methods
     """A workplan task."""
 
+    __slots__ = ("remaining",)
+
     # pylint: disable=too-many-arguments, too-many-positional-arguments
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.remaining: int = self.duration
 
 
-class WorkPlan:
+class WorkPlan:  # pylint: disable=too-many-instance-attributes
     """A work plan built for a project."""
 
     def __init__(
         self,
-        project: Project,
+        project: Union[Project, ProjectSnapshot],
         tasks_to_split: Optional[Dict[str, int]] = None,
+        lower_bound: Optional[int] = None,
     ) -> None:
-        self.project = copy.deepcopy(project)
+        self.project: ProjectSnapshot = project.snapshot()
         self.resources = [
             WorkPlanResource(res.res_id, res.name)
             for res in self.project.resources
@@ -84,8 +197,14 @@ class WorkPlan:
             self.split_tasks(tasks_to_split)
         self.remaining = sum(task.duration for task in self.tasks)
         self.duration = 0
+        # lower bound of the duration: by default for this split of tasks,
+        # the caller can give a lower bound for all the splits it has tried
+        if lower_bound is None:
+            lower_bound = get_lower_bound(self.project, tasks_to_split)
+        self.lower_bound: int = lower_bound
         self.end_date = self.project.start_date
         self.resources_use = 0
+        self.pool = ResourcePool(self.resources)
         self.schedule()
 
     def split_tasks(self, tasks_to_split: Dict[str, int]):
@@ -100,20 +219,7 @@ class WorkPlan:
         for task in self.tasks:
             number = tasks_to_split.get(task.task_id, None)
             if number is not None and 1 < number <= task.max_resources:
-                # split duration into multiple durations which are all almost
-                # the same, and sum == duration (and remove all null values);
-                # for example if task.duration == 10 and number == 3,
-                # durations == [4, 3, 3]
-                durations = list(
-                    filter(
-                        None,
-                        [
-                            task.duration // number
-                            + (1 if x < task.duration % number else 0)
-                            for x in range(number)
-                        ],
-                    )
-                )
+                durations = split_duration(task.duration, number)
                 for i, duration in enumerate(durations):
                     title = f"{task.title} ({i+1}/{len(durations)})"
                     new_tasks.append(
@@ -143,15 +249,7 @@ class WorkPlan:
 
         :return: resource found
         """
-        lowest_duration = 999999999
-        best_res = None
-        for res in self.resources:
-            if res.duration == 0:
-                return res
-            if res.duration < lowest_duration:
-                lowest_duration = res.duration
-                best_res = res
-        return best_res or self.resources[0]
+        return self.pool.best()
 
     def assign_task(self, task, resource, days):
         """
@@ -161,18 +259,7 @@ class WorkPlan:
         :param Resource resource: resource
         :param int days: number of days in task to assign
         """
-        resource.assigned.append(
-            {
-                "task": task.task_id,
-                "duration": days,
-            }
-        )
-        resource.assigned_tasks.append(
-            {
-                "id": task.task_id,
-                "title": task.title,
-            }
-        )
+        resource.assign(task, days)
         resource.duration += days
         self.duration = max(self.duration, resource.duration)
         task.remaining -= days
@@ -205,10 +292,9 @@ class WorkPlan:
         sum_use = 0
         for res in self.resources:
             if res.duration > 0:
-                res.end_date = add_business_days(
+                res.end_date = self.project.calendar.add_business_days(
                     self.project.start_date,
                     res.duration - 1,
-                    self.project.hdays,
                 )
                 self.end_date = max(self.end_date, res.end_date)
             res.use = (res.duration * 100) / self.duration
@@ -216,66 +302,344 @@ class WorkPlan:
         if self.resources:
             self.resources_use = sum_use / len(self.resources)
 
+    def resources_dicts(self) -> Iterator[Dict]:
+        """
+        Return the resources of the work plan as dicts, one by one.
+
+        :return: iterator on resources dicts
+        """
+        for res in self.resources:
+            yield {
+                "id": res.res_id,
+                "name": res.name,
+                "assigned": res.assigned,
+                "assigned_tasks": res.assigned_tasks,
+                "duration": res.duration,
+                "end": res.end_date or None,
+                "use": res.use,
+            }
+
+    def tasks_dicts(self) -> Iterator[Dict]:
+        """
+        Return the tasks of the work plan as dicts, one by one.
+
+        :return: iterator on tasks dicts
+        """
+        for task in self.tasks:
+            yield {
+                "id": task.task_id,
+                "title": task.title,
+                "duration": task.duration,
+                "priority": task.priority,
+                "max_resources": task.max_resources,
+            }
+
     def as_dict(self) -> Dict:
         """Return the work plan as dict."""
-        after_end = self.end_date + datetime.timedelta(days=1)
-        holidays: Dict = self.project.hdays[  # type: ignore
-            self.project.start_date : after_end  # type: ignore
-        ]
         return {
             "workplan": {
-                "project": {
-                    "name": self.project.name,
-                    "start": self.project.start_date,
-                    "end": self.end_date,
-                    "duration": self.duration,
-                    "holidays_iso": self.project.holidays_iso,
-                    "holidays": holidays,
-                    "resources_use": self.resources_use,
-                },
-                "resources": [
+                "project": get_project_dict(self),
+                "resources": list(self.resources_dicts()),
+                "tasks": list(self.tasks_dicts()),
+            },
+        }
+
+
+class ArrayWorkPlan:  # pylint: disable=too-many-instance-attributes
+    """
+    A work plan built for a project, with tasks chunks and assignments kept
+    in arrays instead of objects, for very large projects.
+
+    The assignments are the same as in WorkPlan; the dicts with assigned
+    tasks are built only by as_dict().
+
+    Only the memory kept by the work plan is reduced (almost 2 times less
+    than WorkPlan): the search of tasks to split in build_workplan still
+    uses the same memory with both engines, and it is most of the peak
+    memory of build_workplan (see benchmarks/bench_workplan_engine.py).
+    """
+
+    def __init__(
+        self,
+        project: Union[Project, ProjectSnapshot],
+        tasks_to_split: Optional[Dict[str, int]] = None,
+        lower_bound: Optional[int] = None,
+    ) -> None:
+        # the tasks are stored in arrays (below), so the snapshot of project
+        # has no tasks: they are not copied
+        self.project: ProjectSnapshot = ProjectSnapshot(
+            name=project.name,
+            start_date=project.start_date,
+            holidays_iso=project.holidays_iso,
+            hdays=project.hdays,
+            calendar=project.calendar,
+            resources=tuple(copy.copy(res) for res in project.resources),
+            tasks=(),
+        )
+        # tasks: ids, titles, priority and max resources
+        self.tasks_ids: List[str] = [task.task_id for task in project.tasks]
+        self.tasks_titles: List[str] = [task.title for task in project.tasks]
+        self.tasks_priority: List[Any] = [
+            task.priority for task in project.tasks
+        ]
+        self.tasks_max_resources = array(
+            "l", [task.max_resources for task in project.tasks]
+        )
+        # tasks chunks: index of task in project, chunk number and count
+        # of chunks (0 if the task is not split), duration and remaining
+        # days (the priority is the one of the task)
+        self.chunks_task = array("l")
+        self.chunks_number = array("l")
+        self.chunks_count = array("l")
+        self.chunks_duration = array("q")
+        # assignments (resource index and chunk), in scheduling order
+        self.assigned_resource = array("l")
+        self.assigned_chunk = array("l")
+        # resources: duration, end date and use
+        resources_count = len(self.project.resources)
+        self.resources_duration = array("q", [0]) * resources_count
+        self.resources_end: List[Optional[datetime.date]] = [
+            None
+        ] * resources_count
+        self.resources_use_pct = array("d", [0]) * resources_count
+        self.duration = 0
+        if lower_bound is None:
+            lower_bound = get_lower_bound(project, tasks_to_split)
+        self.lower_bound: int = lower_bound
+        self.end_date = self.project.start_date
+        self.resources_use = 0.0
+        self.split_tasks(tasks_to_split or {}, project.tasks)
+        self.chunks_remaining = array("q", self.chunks_duration)
+        self.remaining = sum(self.chunks_duration)
+        self.schedule()
+
+    def split_tasks(
+        self, tasks_to_split: Dict[str, int], tasks: Sequence[Task]
+    ):
+        """
+        Build the tasks chunks, splitting tasks to carry them out in
+        parallel by several people.
+
+        :param tasks_to_split: tasks to split, keys are task ids (str),
+            values are number of splits (int)
+        :param tasks: tasks of the project
+        """
+        for index, task in enumerate(tasks):
+            number = tasks_to_split.get(task.task_id, None)
+            if number is not None and 1 < number <= task.max_resources:
+                durations = split_duration(task.duration, number)
+                count = len(durations)
+            else:
+                durations = [task.duration]
+                count = 0
+            for i, duration in enumerate(durations):
+                self.chunks_task.append(index)
+                self.chunks_number.append(i)
+                self.chunks_count.append(count)
+                self.chunks_duration.append(duration)
+
+    def chunk_title(self, chunk: int) -> str:
+        """
+        Return the title of a task chunk.
+
+        :param chunk: chunk index
+        :return: chunk title
+        """
+        title = self.tasks_titles[self.chunks_task[chunk]]
+        count = self.chunks_count[chunk]
+        if count:
+            return f"{title} ({self.chunks_number[chunk] + 1}/{count})"
+        return title
+
+    def schedule(self):
+        """Automatic resource leveling in the project."""
+        priorities = self.tasks_priority
+        chunks_task = self.chunks_task
+        durations = self.chunks_duration
+        remaining = self.chunks_remaining
+        resources_duration = self.resources_duration
+        # chunks sorted by priority then duration (from higher to lower),
+        # with two stable sorts on the arrays (no tuple built by chunk); the
+        # priorities are compared as given (integers of any size)
+        order = sorted(
+            range(len(durations)), key=durations.__getitem__, reverse=True
+        )
+        order.sort(
+            key=lambda chunk: priorities[chunks_task[chunk]], reverse=True
+        )
+        heap = [(0, index) for index in range(len(resources_duration))]
+        for chunk in order:
+            duration, index = heap[0]
+            duration += remaining[chunk]
+            heapq.heapreplace(heap, (duration, index))
+            resources_duration[index] = duration
+            self.assigned_resource.append(index)
+            self.assigned_chunk.append(chunk)
+            self.remaining -= remaining[chunk]
+            remaining[chunk] = 0
+        self.duration = max(resources_duration)
+        sum_use = 0.0
+        for index, duration in enumerate(resources_duration):
+            if duration > 0:
+                end_date = self.project.calendar.add_business_days(
+                    self.project.start_date,
+                    duration - 1,
+                )
+                self.resources_end[index] = end_date
+                self.end_date = max(self.end_date, end_date)
+            self.resources_use_pct[index] = (duration * 100) / self.duration
+            sum_use += self.resources_use_pct[index]
+        if resources_duration:
+            self.resources_use = sum_use / len(resources_duration)
+
+    def resources_dicts(self) -> Iterator[Dict]:
+        """
+        Return the resources of the work plan as dicts, one by one.
+
+        :return: iterator on resources dicts
+        """
+        tasks_ids = self.tasks_ids
+        assigned: List[List[int]] = [[] for _ in self.project.resources]
+        for index, chunk in zip(self.assigned_resource, self.assigned_chunk):
+            assigned[index].append(chunk)
+        for index, res in enumerate(self.project.resources):
+            yield {
+                "id": res.res_id,
+                "name": res.name,
+                "assigned": [
                     {
-                        "id": res.res_id,
-                        "name": res.name,
-                        "assigned": res.assigned,
-                        "assigned_tasks": res.assigned_tasks,
-                        "duration": res.duration,
-                        "end": res.end_date or None,
-                        "use": res.use,
+                        "task": tasks_ids[self.chunks_task[chunk]],
+                        "duration": self.chunks_duration[chunk],
                     }
-                    for res in self.resources
+                    for chunk in assigned[index]
                 ],
-                "tasks": [
+                "assigned_tasks": [
                     {
-                        "id": task.task_id,
-                        "title": task.title,
-                        "duration": task.duration,
-                        "priority": task.priority,
-                        "max_resources": task.max_resources,
+                        "id": tasks_ids[self.chunks_task[chunk]],
+                        "title": self.chunk_title(chunk),
                     }
-                    for task in self.tasks
+                    for chunk in assigned[index]
                 ],
+                "duration": self.resources_duration[index],
+                "end": self.resources_end[index],
+                "use": self.resources_use_pct[index],
+            }
+
+    def tasks_dicts(self) -> Iterator[Dict]:
+        """
+        Return the tasks of the work plan as dicts, one by one.
+
+        :return: iterator on tasks dicts
+        """
+        for chunk, index in enumerate(self.chunks_task):
+            yield {
+                "id": self.tasks_ids[index],
+                "title": self.chunk_title(chunk),
+                "duration": self.chunks_duration[chunk],
+                "priority": self.tasks_priority[index],
+                "max_resources": self.tasks_max_resources[index],
+            }
+
+    def as_dict(self) -> Dict:
+        """Return the work plan as dict."""
+        return {
+            "workplan": {
+                "project": get_project_dict(self),
+                "resources": list(self.resources_dicts()),
+                "tasks": list(self.tasks_dicts()),
             },
         }
 
 
-def build_workplan(project: Project) -> WorkPlan:
+def get_project_dict(workplan: Any) -> Dict:
+    """
+    Return the project info of a work plan, as dict.
+
+    :param workplan: work plan (WorkPlan or ArrayWorkPlan)
+    :return: project info
+    """
+    project = workplan.project
+    holidays = get_holidays(
+        project.hdays, project.start_date, workplan.end_date
+    )
+    return {
+        "name": project.name,
+        "start": project.start_date,
+        "end": workplan.end_date,
+        "duration": workplan.duration,
+        "lower_bound": workplan.lower_bound,
+        "optimality_gap": workplan.duration - workplan.lower_bound,
+        "holidays_iso": project.holidays_iso,
+        "holidays": holidays,
+        "resources_use": workplan.resources_use,
+    }
+
+
+def build_workplan(
+    project: Project,
+    workers: int = 1,
+    search: str = "prefix",
+    beam_width: int = 4,
+    time_limit: Optional[float] = None,
+    engine: str = "objects",
+) -> Union[WorkPlan, ArrayWorkPlan]:
     """
     Build a work plan and tries to split tasks for the smallest possible
     project duration.
 
+    The longest tasks are split in 2, one more at a time; each candidate is
+    evaluated incrementally from the previous one and only the best one is
+    built as a work plan.  The search stops as soon as the lower bound of
+    the duration is reached.
+
+    With the "beam" search, the best split found is then improved with a
+    beam search where tasks can be split from 2 to their max resources.
+
     :param project: the project
+    :param workers: number of processes used to evaluate the candidates
+        (0 = number of CPUs)
+    :param search: search mode: "prefix" or "beam"
+    :param beam_width: number of splits kept at each level of beam search
+    :param time_limit: max time for the search (in seconds), the best work
+        plan found so far is returned when the time is exceeded
+    :param engine: "objects" to build a WorkPlan, "arrays" to build an
+        ArrayWorkPlan (same work plan, less memory kept by the work plan,
+        the search of tasks to split uses the same memory)
     :return: work plan
     """
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    if search not in ("prefix", "beam"):
+        raise ValueError(f"unknown search mode: {search}")
+    if engine not in ("objects", "arrays"):
+        raise ValueError(f"unknown engine: {engine}")
+    start = time.monotonic()
     tasks_ids = [
         task.task_id
         for task in project.sorted_tasks(["duration"], reverse=True)
         if task.duration > 1
     ]
-    best_workplan = WorkPlan(project)
-    for i in range(0, len(tasks_ids)):
-        tasks_to_split = {task_id: 2 for task_id in tasks_ids[: i + 1]}
-        workplan = WorkPlan(project, tasks_to_split=tasks_to_split)
-        if workplan.duration < best_workplan.duration:
-            best_workplan = workplan
-    return best_workplan
+    # the arrays engine copies the tasks in arrays: no snapshot of the tasks
+    snapshot: Union[Project, ProjectSnapshot] = (
+        project if engine == "arrays" else project.snapshot()
+    )
+    count = find_best_split(
+        snapshot, tasks_ids, workers=workers, time_limit=time_limit
+    )
+    tasks_to_split = {task_id: 2 for task_id in tasks_ids[:count]}
+    if search == "beam":
+        if time_limit is not None:
+            time_limit -= time.monotonic() - start
+        tasks_to_split = beam_search_split(
+            snapshot,
+            tasks_to_split,
+            beam_width=beam_width,
+            time_limit=time_limit,
+        )
+    # lower bound with all tasks split in their max number of resources, so
+    # that the optimality gap is relative to the best possible work plan
+    # (the prefix search stops at the lower bound of splits in 2 only)
+    lower_bound = get_lower_bound(snapshot, max_split=True)
+    workplan_class = ArrayWorkPlan if engine == "arrays" else WorkPlan
+    return workplan_class(
+        snapshot, tasks_to_split=tasks_to_split, lower_bound=lower_bound
+    )
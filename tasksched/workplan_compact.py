@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Compact work plan: task titles are stored once, resources refer to
+tasks by index, with assignments stored as flat pairs (task index, days)."""
+
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+import json
+
+from tasksched.workplan import ArrayWorkPlan, WorkPlan
+from tasksched.workplan_stream import (
+    get_json_item,
+    get_workplan_parts,
+    iter_batches,
+)
+
+__all__ = (
+    "expand_compact_workplan",
+    "is_compact_workplan",
+    "iter_workplan_compact",
+)
+
+# format and version of compact work plan: the version is incremented when
+# the format changes in a way that older versions can not read it
+COMPACT_FORMAT = "tasksched-compact"
+COMPACT_VERSION = 1
+
+# JSON encoder without spaces after separators (other types like dates in
+# titles are converted to strings)
+_COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), default=str)
+
+
+def iter_workplan_compact(
+    workplan: Union[WorkPlan, ArrayWorkPlan, Dict],
+) -> Iterator[str]:
+    """
+    Encode work plan in compact format (JSON), one task or resource by
+    line.
+
+    The tasks are stored as lists [id, title, duration, priority,
+    max_resources], the resources as lists [id, name, duration, end, use,
+    pairs], where pairs is a flat list of task index and number of days for
+    each assignment of the resource (assignments are not merged: each one
+    has its own task title, like "Task (1/2)" for a split task).
+
+    :param workplan: work plan (object or dict)
+    :return: iterator on chunks of compact work plan
+    """
+    project, resources, tasks = get_workplan_parts(workplan)
+    encode = _COMPACT_ENCODER.encode
+    yield (
+        f'{{"format":"{COMPACT_FORMAT}","version":{COMPACT_VERSION},\n'
+        f'"project":{encode(get_json_item(project))},\n"tasks":['
+    )
+    # index of tasks by id and title (the title of a split task contains
+    # the number of the part)
+    indexes: Dict[Tuple[Any, Any], int] = {}
+    separator = "\n"
+    for batch in iter_batches(tasks):
+        rows = []
+        for task in batch:
+            indexes.setdefault((task["id"], task["title"]), len(indexes))
+            rows.append(
+                encode(
+                    [
+                        task["id"],
+                        task["title"],
+                        task["duration"],
+                        task["priority"],
+                        task["max_resources"],
+                    ]
+                )
+            )
+        yield separator + ",\n".join(rows)
+        separator = ",\n"
+    yield '\n],\n"resources":['
+    separator = "\n"
+    for batch in iter_batches(resources):
+        rows = []
+        for res in batch:
+            pairs: List[int] = []
+            for assigned, assigned_task in zip(
+                res["assigned"], res["assigned_tasks"]
+            ):
+                key = (assigned_task["id"], assigned_task["title"])
+                if key not in indexes:
+                    raise ValueError(f"unknown task: {key[0]}")
+                pairs.append(indexes[key])
+                pairs.append(assigned["duration"])
+            rows.append(
+                encode(
+                    [
+                        res["id"],
+                        res["name"],
+                        res["duration"],
+                        # no end date (null) for a resource without tasks
+                        str(res["end"]) if res["end"] is not None else None,
+                        res["use"],
+                        pairs,
+                    ]
+                )
+            )
+        yield separator + ",\n".join(rows)
+        separator = ",\n"
+    yield "\n]}"
+
+
+def is_compact_workplan(data: Any) -> bool:
+    """
+    Check if data is a compact work plan.
+
+    :param data: data loaded from a file
+    :return: True if data is a compact work plan
+    """
+    return isinstance(data, dict) and data.get("format") == COMPACT_FORMAT
+
+
+def expand_compact_workplan(data: Dict) -> Dict:
+    """
+    Expand a compact work plan to a work plan dict (dates are strings, like
+    in a work plan read from JSON).
+
+    :param data: compact work plan
+    :return: work plan as dict
+    """
+    version = data.get("version")
+    if version != COMPACT_VERSION:
+        raise ValueError(
+            f"unsupported version of compact work plan: {version} "
+            f"(supported: {COMPACT_VERSION})"
+        )
+    tasks = [
+        {
+            "id": task_id,
+            "title": title,
+            "duration": duration,
+            "priority": priority,
+            "max_resources": max_resources,
+        }
+        for task_id, title, duration, priority, max_resources in data["tasks"]
+    ]
+    resources = []
+    for res_id, name, duration, end, use, pairs in data["resources"]:
+        assigned = []
+        assigned_tasks = []
+        for i in range(0, len(pairs) - 1, 2):
+            try:
+                task = tasks[pairs[i]]
+            except (IndexError, TypeError) as exc:
+                raise ValueError(f"invalid task index: {pairs[i]}") from exc
+            assigned.append({"task": task["id"], "duration": pairs[i + 1]})
+            assigned_tasks.append({"id": task["id"], "title": task["title"]})
+        resources.append(
+            {
+                "id": res_id,
+                "name": name,
+                "assigned": assigned,
+                "assigned_tasks": assigned_tasks,
+                "duration": duration,
+                "end": end,
+                "use": use,
+            }
+        )
+    return {
+        "workplan": {
+            "project": data["project"],
+            "resources": resources,
+            "tasks": tasks,
+        },
+    }
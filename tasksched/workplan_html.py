@@ -21,8 +21,9 @@
 
 """Export work plan to HTML."""
 
+from array import array
 from itertools import cycle
-from typing import Any, Dict, List, Optional
+from typing import Dict, Iterator, List, Mapping, Optional
 
 import calendar
 import datetime
@@ -30,14 +31,15 @@ import os
 
 from jinja2 import Environment, FileSystemLoader
 
+from tasksched.business_calendar import BusinessCalendar
 from tasksched.utils import (
-    add_business_days,
-    get_days,
+    DaysView,
     get_months,
     string_to_date,
 )
 
 __all__ = (
+    "iter_workplan_html",
     "workplan_to_html",
 )
 
@@ -81,12 +83,57 @@ def get_css_tasks() -> str:
     return "\n".join(css_tasks)
 
 
+class AssignedDays(Mapping[datetime.date, Optional[Dict]]):
+    """
+    Read-only dictionary with the task assigned to a resource for each day
+    displayed: keys are dates, values are dictionaries with keys "task"
+    (dict) and "last_day" (bool), or None if no task is assigned.
+
+    Only the index of the value (in a list of entries shared by all days)
+    is stored for each day.
+    """
+
+    __slots__ = ("days", "entries", "indexes")
+
+    def __init__(self, days: DaysView):
+        """
+        Initialize the assigned days (no task assigned).
+
+        :param days: days displayed
+        """
+        self.days: DaysView = days
+        self.entries: List[Optional[Dict]] = [None]
+        self.indexes: array = array("l", [0]) * len(days)
+
+    def add_entry(self, entry: Dict) -> int:
+        """
+        Add an entry shared by days.
+
+        :param entry: dictionary with keys "task" and "last_day"
+        :return: index of entry
+        """
+        self.entries.append(entry)
+        return len(self.entries) - 1
+
+    def __getitem__(self, date: datetime.date) -> Optional[Dict]:
+        offset = self.days.get_offset(date)
+        if offset < 0:
+            raise KeyError(date)
+        return self.entries[self.indexes[offset]]
+
+    def __iter__(self) -> Iterator[datetime.date]:
+        return iter(self.days)
+
+    def __len__(self) -> int:
+        return len(self.indexes)
+
+
 def fill_resources(
     resources: List[Dict],
     project_start: datetime.date,
     tasks_colors: Dict[str, int],
-    view_days: Dict[datetime.date, Dict[str, Any]],
-    hdays: Dict,
+    view_days: DaysView,
+    view_calendar: BusinessCalendar,
 ):
     """
     Fill resources in the work plan with extra data, used by HTML template.
@@ -94,9 +141,11 @@ def fill_resources(
     :param list resources: resources
     :param datetime.date project_start: start date
     :param list tasks_colors: colors for tasks
-    :param dict view_days: days
-    :param dict hdays: holidays
+    :param view_days: days displayed
+    :param view_calendar: business days calendar from the first day
+        displayed
     """
+    # pylint: disable=too-many-locals
     for resource in resources:
         tasks_by_id = {}
         for assigned_task in resource["assigned_tasks"]:
@@ -105,37 +154,56 @@ def fill_resources(
                 "title": assigned_task["title"],
                 "color": tasks_colors[assigned_task["id"]],
             }
-        view_assigned: Dict[datetime.date, Optional[Dict]] = {
-            day: None for day in view_days
-        }
+        view_assigned = AssignedDays(view_days)
+        indexes = view_assigned.indexes
         current_date = project_start
-        for task in resource["assigned"]:
-            count = task["duration"]
-            if not view_days[current_date]["business_day"]:
-                current_date = add_business_days(current_date, 1, hdays)
-            while count > 0:
-                business_day = view_days[current_date]["business_day"]
-                view_assigned[current_date] = {
-                    "task": tasks_by_id[task["task"]],
-                    "last_day": business_day and count == 1,
-                }
-                if business_day:
-                    count -= 1
-                current_date += datetime.timedelta(days=1)
+        offset = view_days.get_offset(current_date)
+        try:
+            for task in resource["assigned"]:
+                count = task["duration"]
+                if offset >= 0 and not view_days.is_business_day(offset):
+                    current_date = view_calendar.add_business_days(
+                        current_date, 1
+                    )
+                    offset = view_days.get_offset(current_date)
+                if offset < 0:
+                    raise IndexError(f"{current_date} not displayed")
+                task_info = tasks_by_id[task["task"]]
+                index = view_assigned.add_entry(
+                    {"task": task_info, "last_day": False}
+                )
+                index_last = view_assigned.add_entry(
+                    {"task": task_info, "last_day": True}
+                )
+                while count > 0:
+                    if view_days.is_business_day(offset):
+                        indexes[offset] = index_last if count == 1 else index
+                        count -= 1
+                    else:
+                        indexes[offset] = index
+                    offset += 1
+                current_date = view_days.start + datetime.timedelta(
+                    days=offset
+                )
+        except IndexError as exc:
+            raise ValueError(
+                f'days assigned to resource {resource["id"]} are not in the '
+                f"work plan: {exc}"
+            ) from exc
         resource["view_assigned"] = view_assigned
         resource["use_rating"] = get_use_rating(resource["use"])
 
 
-def workplan_to_html(
+def iter_workplan_html(
     workplan: Dict, template_file: str = "basic", css_file: str = "dark"
-) -> str:
+) -> Iterator[str]:
     """
-    Export work plan to HTML.
+    Export work plan to HTML, rendered chunk by chunk.
 
     :param workplan: work plan
     :param template: template name or path to HTML template file (jinja2)
     :param css: theme (light/dark) or path to CSS file
-    :return: work plan as HTML
+    :return: iterator on chunks of work plan as HTML
     """
     # pylint: disable=too-many-locals
     project = workplan["workplan"]["project"]
@@ -157,9 +225,10 @@ def workplan_to_html(
     view_end = project_end.replace(
         day=calendar.monthrange(project_end.year, project_end.month)[1]
     )
-    view_days = get_days(view_start, view_end, hdays)
+    view_calendar = BusinessCalendar(view_start, hdays)
+    view_days = view_calendar.get_days(view_start, view_end)
     view_months = get_months(view_days)
-    days = get_days(project_start, project_end)
+    days = BusinessCalendar(project_start).get_days(project_start, project_end)
     if not template_file.endswith(".html"):
         template_file = os.path.join(
             DATA_DIR, "html", f"{template_file}.html"
@@ -189,13 +258,15 @@ def workplan_to_html(
 {css_months}
 {css}
 """
-    fill_resources(resources, project_start, tasks_colors, view_days, hdays)
+    fill_resources(
+        resources, project_start, tasks_colors, view_days, view_calendar
+    )
 
     # build HTML
     template_dir, filename = os.path.split(os.path.abspath(template_file))
     env = Environment(loader=FileSystemLoader(template_dir), autoescape=True)
     template = env.get_template(filename)
-    result = template.render(
+    yield from template.generate(
         workplan["workplan"],
         css=css,
         days=days,
@@ -205,4 +276,21 @@ def workplan_to_html(
         view_months=view_months,
         holidays=project["holidays"],
     )
-    return result
+
+
+def workplan_to_html(
+    workplan: Dict, template_file: str = "basic", css_file: str = "dark"
+) -> str:
+    """
+    Export work plan to HTML.
+
+    :param workplan: work plan
+    :param template: template name or path to HTML template file (jinja2)
+    :param css: theme (light/dark) or path to CSS file
+    :return: work plan as HTML
+    """
+    return "".join(
+        iter_workplan_html(
+            workplan, template_file=template_file, css_file=css_file
+        )
+    )
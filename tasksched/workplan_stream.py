@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Write work plan to a file, resource by resource and task by task."""
+
+from typing import Any, Dict, IO, Iterable, Iterator, List, Tuple, Union
+
+import datetime
+import itertools
+import json
+
+import yaml
+
+from tasksched.workplan import ArrayWorkPlan, WorkPlan, get_project_dict
+
+__all__ = (
+    "iter_workplan_json",
+    "iter_workplan_yaml",
+    "write_workplan_json",
+    "write_workplan_yaml",
+)
+
+# number of resources or tasks serialized at once
+WRITE_BATCH_SIZE = 256
+
+# max width of a string with non-ASCII chars (escaped, in double quotes)
+# which is emitted by libyaml exactly like the pure Python emitter: longer
+# strings are wrapped at different columns
+YAML_SAFE_WIDTH = 56
+
+# keys with dates in project and resources of work plan (converted to
+# strings before JSON encoding)
+DATE_KEYS = ("start", "end", "holidays")
+
+# JSON encoder, with a callback only for other values that can not be
+# encoded (like a task title which is a date in the project)
+_JSON_ENCODER = json.JSONEncoder(default=str)
+
+
+class _WorkPlanDumper(yaml.SafeDumper):  # pylint: disable=too-many-ancestors
+    """YAML dumper for work plan (no aliases in output), pure Python."""
+
+    def ignore_aliases(self, data: Any) -> bool:
+        # pylint: disable=unused-argument
+        return True
+
+
+if hasattr(yaml, "CSafeDumper"):
+
+    class _WorkPlanCDumper(yaml.CSafeDumper):  # pylint: disable=R0901
+        """YAML dumper for work plan (no aliases in output), with libyaml."""
+
+        def ignore_aliases(self, data: Any) -> bool:
+            # pylint: disable=unused-argument
+            return True
+
+    _FastDumper: Any = _WorkPlanCDumper
+else:
+    _FastDumper = _WorkPlanDumper
+
+
+def get_workplan_parts(
+    workplan: Union[WorkPlan, ArrayWorkPlan, Dict],
+) -> Tuple[Dict, Iterable, Iterable]:
+    """
+    Get parts of the work plan to write: project, resources and tasks.
+
+    :param workplan: work plan (object or dict, like the one returned by
+        as_dict)
+    :return: tuple (project, resources, tasks)
+    """
+    if isinstance(workplan, dict):
+        content = workplan["workplan"]
+        return content["project"], content["resources"], content["tasks"]
+    return (
+        get_project_dict(workplan),
+        workplan.resources_dicts(),
+        workplan.tasks_dicts(),
+    )
+
+
+def iter_batches(items: Iterable) -> Iterator[List]:
+    """
+    Iterate on items by batches of WRITE_BATCH_SIZE items.
+
+    :param items: items
+    :return: iterator on lists of items
+    """
+    iterator = iter(items)
+    batch = list(itertools.islice(iterator, WRITE_BATCH_SIZE))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(iterator, WRITE_BATCH_SIZE))
+
+
+def get_json_item(item: Any) -> Any:
+    """
+    Get an item of work plan (project, resource or task) to encode in JSON:
+    dates are converted to strings, so that they are encoded without
+    callback.
+
+    :param item: item (dict)
+    :return: item with dates as strings
+    """
+    if not isinstance(item, dict):
+        return item
+    json_item = None
+    for key in DATE_KEYS:
+        value = item.get(key)
+        if isinstance(value, datetime.date):
+            value = str(value)
+        elif isinstance(value, list):
+            value = [
+                str(date) if isinstance(date, datetime.date) else date
+                for date in value
+            ]
+        else:
+            continue
+        if json_item is None:
+            json_item = dict(item)
+        json_item[key] = value
+    return item if json_item is None else json_item
+
+
+def iter_json_list(items: Iterable) -> Iterator[str]:
+    """
+    Encode a list in JSON, by batches of items.
+
+    :param items: items of the list
+    :return: iterator on chunks of JSON
+    """
+    yield "["
+    for i, batch in enumerate(iter_batches(items)):
+        if i > 0:
+            yield ", "
+        yield _JSON_ENCODER.encode([get_json_item(item) for item in batch])[
+            1:-1
+        ]
+    yield "]"
+
+
+def iter_workplan_json(
+    workplan: Union[WorkPlan, ArrayWorkPlan, Dict],
+) -> Iterator[str]:
+    """
+    Encode work plan in JSON, resource by resource and task by task; the
+    chunks joined are the same as json.dumps(workplan.as_dict()).
+
+    :param workplan: work plan (object or dict)
+    :return: iterator on chunks of JSON
+    """
+    project, resources, tasks = get_workplan_parts(workplan)
+    project_json = _JSON_ENCODER.encode(get_json_item(project))
+    yield f'{{"workplan": {{"project": {project_json}, "resources": '
+    yield from iter_json_list(resources)
+    yield ', "tasks": '
+    yield from iter_json_list(tasks)
+    yield "}}"
+
+
+def write_workplan_json(
+    workplan: Union[WorkPlan, ArrayWorkPlan, Dict], output: IO
+):
+    """
+    Write work plan to a file in JSON, resource by resource and task by
+    task; the output is the same as json.dumps(workplan.as_dict()).
+
+    :param workplan: work plan (object or dict)
+    :param output: output file
+    """
+    for chunk in iter_workplan_json(workplan):
+        output.write(chunk)
+
+
+def is_yaml_fast_safe(data: Any) -> bool:
+    """
+    Check if data can be emitted with libyaml, with the same output as the
+    pure Python emitter: strings must have only printable ASCII chars, or
+    be short enough to not be wrapped.
+
+    :param data: data
+    :return: True if data can be emitted with libyaml
+    """
+    if isinstance(data, str):
+        if data.isascii():
+            return data.isprintable()
+        if not data.isprintable():
+            return False
+        width = 2
+        for char in data:
+            code = ord(char)
+            width += (
+                1
+                if code < 0x7F
+                else 4 if code <= 0xFF else 6 if code <= 0xFFFF else 10
+            )
+        return width <= YAML_SAFE_WIDTH
+    if isinstance(data, dict):
+        return all(
+            is_yaml_fast_safe(key) and is_yaml_fast_safe(value)
+            for key, value in data.items()
+        )
+    if isinstance(data, list):
+        return all(is_yaml_fast_safe(value) for value in data)
+    return True
+
+
+def dump_yaml_workplan_key(key: str, data: Any) -> str:
+    """
+    Dump data of a key in work plan to YAML, with libyaml if the output is
+    the same as the pure Python emitter.
+
+    :param key: key in work plan ("project", "resources" or "tasks")
+    :param data: data of the key
+    :return: YAML, without the first line (key "workplan")
+    """
+    dumper = _FastDumper if is_yaml_fast_safe(data) else _WorkPlanDumper
+    text = yaml.dump(
+        {"workplan": {key: data}},
+        Dumper=dumper,
+        default_flow_style=False,
+        sort_keys=False,
+    )
+    return text[text.index("\n") + 1 :]
+
+
+def iter_yaml_list(key: str, items: Iterable) -> Iterator[str]:
+    """
+    Dump a key with a list of items in YAML, by batches of items.
+
+    :param key: key in work plan ("resources" or "tasks")
+    :param items: items of the list
+    :return: iterator on chunks of YAML
+    """
+    empty = True
+    for batch in iter_batches(items):
+        text = dump_yaml_workplan_key(key, batch)
+        if empty:
+            yield text
+            empty = False
+        else:
+            # skip the key, already written with the first batch
+            yield text[text.index("\n") + 1 :]
+    if empty:
+        yield dump_yaml_workplan_key(key, [])
+
+
+def iter_workplan_yaml(
+    workplan: Union[WorkPlan, ArrayWorkPlan, Dict],
+) -> Iterator[str]:
+    """
+    Dump work plan in YAML, resource by resource and task by task; the
+    chunks joined are the same as yaml_dump(workplan.as_dict()).
+
+    The YAML is emitted with libyaml if available (except for strings that
+    libyaml would wrap differently).
+
+    :param workplan: work plan (object or dict)
+    :return: iterator on chunks of YAML
+    """
+    project, resources, tasks = get_workplan_parts(workplan)
+    yield "workplan:\n"
+    yield dump_yaml_workplan_key("project", project)
+    yield from iter_yaml_list("resources", resources)
+    yield from iter_yaml_list("tasks", tasks)
+
+
+def write_workplan_yaml(
+    workplan: Union[WorkPlan, ArrayWorkPlan, Dict], output: IO
+):
+    """
+    Write work plan to a file in YAML, resource by resource and task by
+    task; the output is the same as yaml_dump(workplan.as_dict()).
+
+    :param workplan: work plan (object or dict)
+    :param output: output file
+    """
+    for chunk in iter_workplan_yaml(workplan):
+        output.write(chunk)
@@ -21,15 +21,30 @@
 
 """Export work plan to text."""
 
-from itertools import cycle
-from typing import Dict
+from bisect import bisect_right
+from itertools import accumulate, cycle, groupby
+from operator import itemgetter
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import datetime
+
+from tasksched.business_calendar import BusinessCalendar
+from tasksched.utils import string_to_date
 
 __all__ = (
+    "iter_workplan_text",
     "workplan_to_text",
 )
 
 COLORS = (1, 2, 3, 4, 5, 6, 7, 11, 12, 13, 14, 15, 27, 174, 165, 75)
 
+# scales of text work plan: a char is a business day, a week or a month
+SCALES = ("day", "week", "month")
+
+# max of the min width kept for the list of tasks when the width of lines
+# is limited (see get_max_cells)
+TASKS_MIN_WIDTH = 20
+
 
 def color(text: str, color_code: int) -> str:
     """Return a colored text with ANSI color code."""
@@ -57,27 +72,392 @@ def color_pct(text: str, pct: int) -> str:
     return f"{pct_color}\033[0m"
 
 
-def workplan_to_text(  # pylint: disable=too-many-locals
+def get_assigned_starts(assigned: List[Dict]) -> List[int]:
+    """
+    Get the cumulative offsets of tasks assigned to a resource: the task N
+    starts on the business day starts[N] (number of business days since the
+    project start) and ends before starts[N + 1].
+
+    :param assigned: tasks assigned to the resource
+    :return: list of offsets, the last one is the resource duration
+    """
+    return [0] + list(accumulate(task["duration"] for task in assigned))
+
+
+def find_assigned(starts: List[int], number: int) -> int:
+    """
+    Find the index of the task assigned on a business day, with a binary
+    search in the cumulative offsets.
+
+    :param starts: cumulative offsets (see get_assigned_starts)
+    :param number: number of business days since the project start
+    :return: index of the assigned task (number of tasks if the business day
+        is after the end of the resource)
+    """
+    if number >= starts[-1]:
+        return len(starts) - 1
+    return bisect_right(starts, number) - 1
+
+
+def get_bar_days(
+    assigned: List[Dict],
+    starts: List[int],
+    first: int,
+    last: int,
+    tasks_colors: Optional[Dict],
+    bar_chars: List[str],
+) -> Tuple[str, int, range]:
+    """
+    Return the bar of a resource with one char by business day, between two
+    business days; the tasks before the first day are skipped with a binary
+    search, so the cost is the number of chars displayed.
+
+    :param assigned: tasks assigned to the resource
+    :param starts: cumulative offsets (see get_assigned_starts)
+    :param first: first business day displayed (number since the project
+        start)
+    :param last: business day after the last one displayed
+    :param tasks_colors: colors of tasks (None to not use colors)
+    :param bar_chars: chars for the start, the middle and the end of a task
+    :return: tuple (bar, number of chars, indexes of tasks displayed)
+    """
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    chars = []
+    index = first_index = find_assigned(starts, first)
+    if first >= last:
+        # empty window: no tasks displayed
+        return "", 0, range(first_index, first_index)
+    while index < len(assigned) and starts[index] < last:
+        start = max(starts[index], first)
+        end = min(starts[index + 1], last)
+        if end <= start:
+            # task without business days
+            index += 1
+            continue
+        chars_task = [bar_chars[1]] * (end - start)
+        if start == starts[index]:
+            chars_task[0] = bar_chars[0]
+        if end == starts[index + 1]:
+            chars_task[-1] = bar_chars[2]
+        str_task = "".join(chars_task)
+        chars.append(
+            color(str_task, tasks_colors[assigned[index]["task"]])
+            if tasks_colors is not None
+            else str_task
+        )
+        index += 1
+    width = max(0, min(last, starts[-1]) - first)
+    return "".join(chars), width, range(first_index, index)
+
+
+def get_calendar(project: Dict) -> BusinessCalendar:
+    """
+    Get the business days calendar of the work plan project.
+
+    :param project: project of the work plan
+    :return: business days calendar from the project start
+    """
+    start = string_to_date(project["start"])
+    hdays = {
+        string_to_date(hday): "" for hday in project.get("holidays") or []
+    }
+    return BusinessCalendar(start, hdays)
+
+
+def get_window(
+    calendar: BusinessCalendar,
+    duration: int,
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+) -> Tuple[int, int]:
+    """
+    Get the business days displayed between two dates.
+
+    :param calendar: business days calendar from the project start
+    :param duration: project duration
+    :param date_from: first date displayed (None for the project start)
+    :param date_to: last date displayed (None for the project end)
+    :return: tuple (first, last): numbers of the first business day
+        displayed and of the business day after the last one displayed
+    """
+    first = 0
+    if date_from and date_from > calendar.start:
+        # number of the first business day on or after the date
+        first = (
+            calendar.count_business_days(
+                date_from - datetime.timedelta(days=1)
+            )
+            + 1
+        )
+    last = duration
+    if date_to:
+        last = (
+            calendar.count_business_days(date_to) + 1
+            if date_to >= calendar.start
+            else 0
+        )
+    first = min(first, duration)
+    return first, max(first, min(last, duration))
+
+
+def get_scale_bounds(
+    calendar: BusinessCalendar,
+    scale: str,
+    first: int,
+    last: int,
+    max_cells: Optional[int] = None,
+) -> List[int]:
+    """
+    Get bounds of the cells of a scale (week or month), as numbers of
+    business days since the project start: the cell N contains the business
+    days from bounds[N] (included) to bounds[N + 1] (excluded).
+
+    Cells without business days (for example a week of holidays) are
+    skipped.
+
+    :param calendar: business days calendar from the project start
+    :param scale: "week" or "month"
+    :param first: first business day displayed
+    :param last: business day after the last one displayed
+    :param max_cells: max number of cells (None for no limit)
+    :return: bounds of cells
+    """
+    if scale not in SCALES[1:]:
+        raise ValueError(f"invalid scale: {scale}")
+    bounds = [first]
+    date = calendar.get_date(first)
+    while bounds[-1] < last and (
+        max_cells is None or len(bounds) <= max_cells
+    ):
+        if scale == "week":
+            date += datetime.timedelta(days=7 - date.weekday())
+        elif date.month == 12:
+            date = datetime.date(date.year + 1, 1, 1)
+        else:
+            date = datetime.date(date.year, date.month + 1, 1)
+        # number of the first business day on or after the date
+        number = min(
+            calendar.count_business_days(date - datetime.timedelta(days=1))
+            + 1,
+            last,
+        )
+        if number > bounds[-1]:
+            bounds.append(number)
+    return bounds
+
+
+def get_resource_cells(
+    assigned: List[Dict], starts: List[int], bounds: List[int]
+) -> Tuple[List[Tuple[str, bool]], range]:
+    """
+    Get cells of a resource: the dominant task of each cell (task with the
+    most days in the cell) and whether the resource is busy during the
+    whole cell; the cells after the end of the resource are not returned.
+
+    The tasks before the first cell are skipped with a binary search, then
+    the assigned tasks are scanned once, so the cost is the number of cells
+    plus the number of tasks displayed.
+
+    :param assigned: tasks assigned to the resource
+    :param starts: cumulative offsets (see get_assigned_starts)
+    :param bounds: bounds of cells (see get_scale_bounds)
+    :return: tuple (list of tuples (task id, busy during the whole cell),
+        indexes of tasks displayed)
+    """
+    cells = []
+    index = first_index = find_assigned(starts, bounds[0])
+    for low, high in zip(bounds, bounds[1:]):
+        days: Dict[str, int] = {}
+        pos = low
+        while pos < high and index < len(assigned):
+            count = min(starts[index + 1], high) - pos
+            task_id = assigned[index]["task"]
+            days[task_id] = days.get(task_id, 0) + count
+            pos += count
+            if pos >= starts[index + 1]:
+                index += 1
+        if not days:
+            break
+        cells.append((max(days, key=days.__getitem__), pos == high))
+    if index < len(assigned) and cells and starts[index] < bounds[-1]:
+        # last task displayed partially
+        index += 1
+    return cells, range(first_index, index)
+
+
+def get_bar_cells(
+    cells: List[Tuple[str, bool]],
+    tasks_colors: Optional[Dict],
+    use_unicode: bool,
+) -> str:
+    """
+    Return the bar of a resource with one char by cell (week or month),
+    colored with the dominant task of the cell.
+
+    :param cells: cells of the resource (see get_resource_cells)
+    :param tasks_colors: colors of tasks (None to not use colors)
+    :param use_unicode: use unicode chars
+    :return: bar of the resource
+    """
+    full, partial = ("█", "▌") if use_unicode else ("x", "-")
+    chars = []
+    for task_id, group in groupby(cells, key=itemgetter(0)):
+        str_cells = "".join(full if busy else partial for _, busy in group)
+        chars.append(
+            color(str_cells, tasks_colors[task_id])
+            if tasks_colors is not None
+            else str_cells
+        )
+    return "".join(chars)
+
+
+class TextLayout(NamedTuple):
+    """Layout of resources bars in text work plan."""
+
+    # first business day displayed (number since the project start)
+    first: int
+    # business day after the last one displayed
+    last: int
+    # bounds of cells with a scale week or month (None for scale day)
+    bounds: Optional[List[int]]
+    # number of chars of bars
+    width: int
+    # max width of list of tasks (None for no limit)
+    tasks_width: Optional[int]
+    # dates displayed if the bars are not displayed in full ("" otherwise)
+    window: str
+
+
+def get_max_cells(tasks: List[Dict], width: int) -> int:
+    """
+    Get the max number of chars of bars, keeping a min width for the list
+    of tasks: the length of the longest task id (up to TASKS_MIN_WIDTH),
+    and at most half of the width, so that bars are not squeezed in a
+    narrow terminal.
+
+    :param tasks: tasks of the work plan
+    :param width: width of lines after the texts displayed before bars
+    :return: max number of chars of bars (≥ 1)
+    """
+    room = max(0, width - 2)
+    tasks_min_width = min(
+        TASKS_MIN_WIDTH,
+        max((len(task["id"]) for task in tasks), default=0),
+        room // 2,
+    )
+    return max(1, room - tasks_min_width)
+
+
+def get_text_layout(
+    workplan: Dict,
+    prefixes: List[str],
+    scale: str,
+    dates: Tuple[Optional[datetime.date], Optional[datetime.date]],
+    max_width: Optional[int],
+) -> TextLayout:
+    """
+    Get layout of resources bars: business days displayed and width of
+    bars.
+
+    :param workplan: work plan
+    :param prefixes: texts displayed before bars (see get_resource_prefix)
+    :param scale: "day", "week" or "month"
+    :param dates: first and last dates displayed (None for the project
+        start/end)
+    :param max_width: max width of lines with resources (None for no limit)
+    :return: layout
+    """
+    project = workplan["workplan"]["project"]
+    duration = project["duration"]
+    first, last = 0, duration
+    prefix_width = max((len(prefix) for prefix in prefixes), default=0)
+    max_cells = (
+        get_max_cells(workplan["workplan"]["tasks"], max_width - prefix_width)
+        if max_width
+        else None
+    )
+    calendar = None
+    bounds = None
+    if scale == "day":
+        if dates[0] or dates[1] or max_cells is not None:
+            calendar = get_calendar(project)
+            first, last = get_window(calendar, duration, *dates)
+        if max_cells is not None:
+            last = min(last, first + max_cells)
+        width = last - first
+    else:
+        calendar = get_calendar(project)
+        first, last = get_window(calendar, duration, *dates)
+        bounds = get_scale_bounds(calendar, scale, first, last, max_cells)
+        last = bounds[-1]
+        width = len(bounds) - 1
+    window = ""
+    if calendar and (first > 0 or last < duration):
+        window = (
+            f"{calendar.get_date(first)} to {calendar.get_date(last - 1)}"
+            if last > first
+            else "nothing"
+        )
+    return TextLayout(
+        first,
+        last,
+        bounds,
+        width,
+        max(0, max_width - prefix_width - width - 2) if max_width else None,
+        window,
+    )
+
+
+def get_resource_prefix(res: Dict, max_len_res: int, use: str) -> str:
+    """
+    Return the text displayed before the bar of a resource.
+
+    :param res: resource
+    :param max_len_res: max length of resource names
+    :param use: use of the resource (percentage)
+    :return: text before the bar
+    """
+    return (
+        f'{res["name"]:>{max_len_res}} > {res["end"] or " "*10} '
+        f'{res["duration"]:>3}d {use} '
+    )
+
+
+def iter_workplan_text(  # pylint: disable=too-many-locals
     workplan: Dict,
     quiet: bool = False,
     use_colors: bool = True,
     use_unicode: bool = True,
-) -> str:
+    scale: str = "day",
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    max_width: Optional[int] = None,
+) -> Iterator[str]:
     """
-    Export work plan to text.
+    Export work plan to text, line by line.
 
     :param workplan: work plan
     :param quiet: display work plan summary (no legend/tasks)
     :param use_colors: use ANSI colors in output
     :param use_unicode: use unciode chars in output
-    :return: work plan as string
+    :param scale: "day" (one char by business day), "week" or "month" (one
+        char by week or month, colored with the task that has the most days
+        in the cell)
+    :param date_from: first date displayed (None for the project start)
+    :param date_to: last date displayed (None for the project end)
+    :param max_width: max width of lines with resources, for example the
+        terminal width (None for no limit): the bars are cut at the end and
+        the list of tasks is truncated
+    :return: iterator on chunks of work plan as string
     """
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
     color_reset = "\033[0m" if use_colors else ""
     project = workplan["workplan"]["project"]
     resources = workplan["workplan"]["resources"]
     resources_count = len(resources)
     tasks = workplan["workplan"]["tasks"]
-    legend = ["Legend:"]
+    if not quiet:
+        yield "Legend:"
     iter_color = cycle(COLORS)
     tasks_colors = {}
     for task in tasks:
@@ -88,21 +468,22 @@ def workplan_to_text(  # pylint: disable=too-many-locals
             if use_colors
             else task["id"]
         )
-        legend.append(
-            f'  Task {str_id}: {task["title"]}{color_reset} '
-            f'({task["duration"]}d, prio: {task["priority"]}, '
-            f'max res: {task["max_resources"]})'
-        )
+        if not quiet:
+            yield (
+                f'\n  Task {str_id}: {task["title"]}{color_reset} '
+                f'({task["duration"]}d, prio: {task["priority"]}, '
+                f'max res: {task["max_resources"]})'
+            )
     text = f'{project["resources_use"]:.2f}%'
-    res_use = (
-        color_pct(text, project["resources_use"]) if use_colors else text
-    )
+    res_use = color_pct(text, project["resources_use"]) if use_colors else text
     info = (
         f'{project["name"]}: {project["start"]} to {project["end"]} '
         f'({project["duration"]}d), {res_use} of {resources_count} '
         f"resources used"
     )
-    rows = [""]
+    if quiet:
+        yield info
+        return
     max_len_res = (
         max(len(res["name"]) for res in resources) + 2 if resources else 0
     )
@@ -110,35 +491,84 @@ def workplan_to_text(  # pylint: disable=too-many-locals
         bar_chars = ["█", "█", "▊"]
     else:
         bar_chars = ["[", "x", "]"]
+    layout = get_text_layout(
+        workplan,
+        [
+            get_resource_prefix(res, max_len_res, f'{res["use"]:>3.0f}%')
+            for res in resources
+        ],
+        scale,
+        (date_from, date_to),
+        max_width,
+    )
+    window = f"Displayed: {layout.window}\n" if layout.window else ""
+    yield f"\n\n{info}\n{window}"
     for res in resources:
         text = f'{res["use"]:>3.0f}%'
         use = color_pct(text, res["use"]) if use_colors else text
-        chars = []
-        for task in res["assigned"]:
-            chars_task = [bar_chars[1]] * task["duration"]
-            chars_task[0] = bar_chars[0]
-            chars_task[-1] = bar_chars[2]
-            str_task = "".join(chars_task)
-            chars.append(
-                color(str_task, tasks_colors[task["task"]])
-                if use_colors
-                else str_task
+        starts = get_assigned_starts(res["assigned"])
+        if layout.bounds is None:
+            bar_resource, bar_width, indexes = get_bar_days(
+                res["assigned"],
+                starts,
+                layout.first,
+                layout.last,
+                tasks_colors if use_colors else None,
+                bar_chars,
+            )
+        else:
+            cells, indexes = get_resource_cells(
+                res["assigned"], starts, layout.bounds
             )
-        bar_resource = "".join(chars)
-        tasks = ", ".join([task["id"] for task in res["assigned_tasks"]])
-        filler = " " * (project["duration"] - res["duration"] + 2)
-        rows.append(
-            f'{res["name"]:>{max_len_res}} > {res["end"] or " "*10} '
-            f'{res["duration"]:>3}d {use} '
+            bar_resource = get_bar_cells(
+                cells, tasks_colors if use_colors else None, use_unicode
+            )
+            bar_width = len(cells)
+        tasks = ", ".join(
+            [res["assigned_tasks"][index]["id"] for index in indexes]
+        )
+        if layout.tasks_width is not None:
+            tasks = tasks[: layout.tasks_width]
+        filler = " " * (layout.width - bar_width + 2)
+        yield (
+            f"\n{get_resource_prefix(res, max_len_res, use)}"
             f"{bar_resource}{color_reset}{filler}{tasks}"
         )
-    if quiet:
-        return info
-    return "\n".join(
-        [
-            "\n".join(legend),
-            "",
-            info,
-            "\n".join(rows),
-        ]
+
+
+def workplan_to_text(
+    workplan: Dict,
+    quiet: bool = False,
+    use_colors: bool = True,
+    use_unicode: bool = True,
+    scale: str = "day",
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    max_width: Optional[int] = None,
+) -> str:
+    """
+    Export work plan to text.
+
+    :param workplan: work plan
+    :param quiet: display work plan summary (no legend/tasks)
+    :param use_colors: use ANSI colors in output
+    :param use_unicode: use unciode chars in output
+    :param scale: "day", "week" or "month" (see iter_workplan_text)
+    :param date_from: first date displayed (None for the project start)
+    :param date_to: last date displayed (None for the project end)
+    :param max_width: max width of lines with resources (None for no limit)
+    :return: work plan as string
+    """
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    return "".join(
+        iter_workplan_text(
+            workplan,
+            quiet=quiet,
+            use_colors=use_colors,
+            use_unicode=use_unicode,
+            scale=scale,
+            date_from=date_from,
+            date_to=date_to,
+            max_width=max_width,
+        )
     )
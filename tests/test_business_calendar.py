@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests on business days calendar."""
+
+from datetime import date, timedelta
+import pytest
+
+from holidays import country_holidays
+
+from tasksched import (
+    add_business_days,
+    BusinessCalendar,
+    count_business_days,
+    get_days,
+    is_business_day,
+)
+
+
+def test_business_calendar():
+    """Test BusinessCalendar class."""
+    start = date(2020, 12, 19)  # Saturday
+    hdays = country_holidays("FRA", years=[2020, 2021])
+    calendar = BusinessCalendar(start, hdays, days=10)
+    assert len(calendar.business) == 10
+    assert not calendar.is_business_day(start)
+    assert calendar.is_business_day(date(2020, 12, 21))
+    assert not calendar.is_business_day(date(2020, 12, 25))
+    assert calendar.count_business_days(start) == 0
+    assert calendar.count_business_days(date(2020, 12, 25)) == 4
+    assert calendar.get_date(0) == start
+    assert calendar.get_date(1) == date(2020, 12, 21)
+    assert calendar.get_date(5) == date(2020, 12, 28)
+    with pytest.raises(ValueError):
+        calendar.is_business_day(date(2020, 12, 18))
+
+    # same results as functions in utils, tables are extended when needed
+    for days in range(800):
+        current = start + timedelta(days=days)
+        assert calendar.is_business_day(current) == is_business_day(
+            current, hdays
+        )
+        assert calendar.count_business_days(current) == count_business_days(
+            start, current, hdays
+        )
+        for count in (0, 1, 2, 5, 30):
+            assert calendar.add_business_days(
+                current, count
+            ) == add_business_days(current, count, hdays)
+    assert len(calendar.business) >= 800
+    assert calendar.add_business_days(
+        date(2020, 12, 1), 20
+    ) == add_business_days(date(2020, 12, 1), 20, hdays)
+    assert calendar.get_date(1000) == add_business_days(start, 1000, hdays)
+
+
+def test_business_calendar_get_days():
+    """Test get_days method of BusinessCalendar class."""
+    hdays = country_holidays("FRA", years=[2020, 2021])
+    calendar = BusinessCalendar(date(2020, 12, 1), hdays)
+    assert not calendar.get_days(date(2020, 12, 21), date(2020, 12, 20))
+    assert calendar.get_days(
+        date(2020, 12, 21), date(2021, 1, 10)
+    ) == get_days(date(2020, 12, 21), date(2021, 1, 10), hdays)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests on cache of work plans."""
+
+import copy
+import os
+import time
+
+from tasksched import (
+    build_workplan,
+    get_cache_key,
+    Project,
+    WorkPlanCache,
+)
+from .utils import get_input_file
+
+
+def test_get_cache_key():
+    """Test get_cache_key function."""
+    config = get_input_file("project_complete.yaml")
+    key = get_cache_key(config, "1.0")
+    assert len(key) == 64
+    assert get_cache_key(copy.deepcopy(config), "1.0") == key
+    assert get_cache_key(config, "1.1") != key
+    assert get_cache_key(config, "1.0", search="beam") != key
+    config2 = copy.deepcopy(config)
+    config2["tasks"][0]["duration"] += 1
+    assert get_cache_key(config2, "1.0") != key
+    # keys order does not change the key
+    config3 = dict(reversed(list(config.items())))
+    assert get_cache_key(config3, "1.0") == key
+
+
+def test_workplan_cache(tmp_path):
+    """Test WorkPlanCache class."""
+    cache_dir = str(tmp_path / "cache")
+    cache = WorkPlanCache(cache_dir)
+    assert os.path.isdir(cache_dir)
+    config = get_input_file("project_complete.yaml")
+    key = get_cache_key(config, "1.0")
+    assert cache.get(key) is None
+    workplan = build_workplan(Project(config)).as_dict()
+    cache.put(key, workplan)
+    assert cache.get(key) == workplan
+    assert cache.get(key) == get_input_file("workplan_complete.yaml")
+    # invalid entry
+    with open(cache.get_path("invalid"), "w", encoding="utf-8") as _file:
+        _file.write("{")
+    assert cache.get("invalid") is None
+
+
+def test_workplan_cache_evict(tmp_path):
+    """Test eviction of entries in WorkPlanCache class."""
+    cache = WorkPlanCache(str(tmp_path))
+    workplan = get_input_file("workplan_complete.yaml")
+    for i, key in enumerate(("a", "b", "c")):
+        cache.put(key, workplan)
+        mtime = time.time() - (3 - i) * 100
+        os.utime(cache.get_path(key), (mtime, mtime))
+    size = os.path.getsize(cache.get_path("a"))
+    assert cache.get("a") == workplan
+
+    # least recently used entry ("b") is removed
+    cache.max_size = size * 2
+    cache.evict()
+    assert sorted(entry[2] for entry in cache.entries()) == [
+        cache.get_path("a"),
+        cache.get_path("c"),
+    ]
+
+    # entry not used for more than 50 seconds ("c") is removed
+    cache.max_size = None
+    cache.max_age = 50
+    cache.evict()
+    assert [entry[2] for entry in cache.entries()] == [cache.get_path("a")]
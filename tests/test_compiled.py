@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests on compiled projects."""
+
+import datetime
+import struct
+
+import pytest
+
+from tasksched import (
+    build_workplan,
+    compile_project,
+    is_compiled_project,
+    load_compiled_project,
+    Project,
+    write_compiled_project,
+)
+from .utils import get_input_file
+
+
+def test_compile_project(tmp_path):
+    """Test compile and load of a project."""
+    config = get_input_file("project_complete.yaml")
+    project = Project(config)
+    filename = str(tmp_path / "project.tsp")
+    write_compiled_project(project, filename)
+    assert is_compiled_project(filename)
+    project2 = load_compiled_project(filename)
+    assert project2.name == project.name
+    assert project2.start_date == project.start_date
+    assert project2.holidays_iso == "FRA"
+    assert project2.hdays.years == {2020, 2021}
+    assert project2.hdays[datetime.date(2020, 12, 25)] == "Noël"
+    assert str(project2) == str(project)
+    assert (
+        build_workplan(project2).as_dict()
+        == build_workplan(project).as_dict()
+        == get_input_file("workplan_complete.yaml")
+    )
+    # holidays of other years are loaded on demand
+    assert datetime.date(2030, 12, 25) in project2.hdays
+
+    # project without holidays, with values that are not strings/integers
+    config["project"]["name"] = 2020
+    del config["project"]["holidays"]
+    config["resources"][0]["name"] = None
+    config["tasks"][0]["title"] = datetime.date(2020, 1, 2)
+    config["tasks"][0]["priority"] = 1.5
+    project = Project(config)
+    project2 = load_compiled_project(
+        write_compiled_project(project, filename) or filename
+    )
+    assert project2.name == 2020
+    assert project2.hdays == {}
+    assert project2.resources[0].name is None
+    assert project2.tasks[0].title == datetime.date(2020, 1, 2)
+    assert project2.tasks[0].priority == 1.5
+    assert project2.tasks[1].priority == 0
+    assert (
+        build_workplan(project2).as_dict() == build_workplan(project).as_dict()
+    )
+
+
+def test_load_compiled_project_errors(tmp_path):
+    """Test load of invalid compiled projects."""
+    filename = tmp_path / "project.tsp"
+    assert not is_compiled_project(str(filename))
+    assert not is_compiled_project(None)
+    with pytest.raises(ValueError):
+        load_compiled_project(str(filename))
+    filename.write_bytes(b"not a compiled project")
+    assert not is_compiled_project(str(filename))
+    with pytest.raises(ValueError, match="not a compiled project"):
+        load_compiled_project(str(filename))
+    data = compile_project(Project(get_input_file("project_complete.yaml")))
+    # incompatible format
+    filename.write_bytes(data[:8] + struct.pack("<H", 999) + data[10:])
+    with pytest.raises(ValueError, match="incompatible compiled project"):
+        load_compiled_project(str(filename))
+    # truncated file
+    filename.write_bytes(data[:-10])
+    with pytest.raises(ValueError, match="truncated column"):
+        load_compiled_project(str(filename))
+    filename.write_bytes(data[:30])
+    with pytest.raises(ValueError, match="invalid compiled project"):
+        load_compiled_project(str(filename))
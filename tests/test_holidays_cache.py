@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests on persistent cache of holidays."""
+
+from datetime import date
+import os
+
+from holidays import country_holidays
+import pytest
+
+from tasksched import (
+    CachedHolidays,
+    get_holidays_cache_dir,
+    get_holidays_version,
+    HolidaysCache,
+    Project,
+)
+from tasksched.holidays_cache import decode_holidays, encode_holidays
+from .utils import get_input_file
+
+
+def test_get_holidays_version():
+    """Test get_holidays_version function."""
+    # pylint: disable=import-outside-toplevel
+    import holidays
+
+    assert get_holidays_version() == holidays.__version__
+
+
+def test_get_holidays_cache_dir(monkeypatch):
+    """Test get_holidays_cache_dir function."""
+    monkeypatch.setenv("TASKSCHED_HOLIDAYS_CACHE", "/tmp/holidays")
+    assert get_holidays_cache_dir() == "/tmp/holidays"
+    monkeypatch.delenv("TASKSCHED_HOLIDAYS_CACHE")
+    monkeypatch.setenv("XDG_CACHE_HOME", "/tmp/cache")
+    assert get_holidays_cache_dir() == os.path.join(
+        "/tmp/cache", "tasksched", "holidays"
+    )
+
+
+def test_encode_decode_holidays():
+    """Test encode_holidays and decode_holidays functions."""
+    hdays = dict(sorted(country_holidays("FRA", years=2024).items()))
+    data = encode_holidays(2024, hdays)
+    assert len(data) < 200
+    assert decode_holidays(2024, data) == hdays
+    assert decode_holidays(2025, data) is None
+    assert decode_holidays(2024, data[:4]) is None
+    assert decode_holidays(2024, data[:20]) is None
+    assert not decode_holidays(2024, encode_holidays(2024, {}))
+
+
+def test_holidays_cache(tmp_path):
+    """Test HolidaysCache class."""
+    cache = HolidaysCache(str(tmp_path))
+    assert cache.get("FRA", None, 2024) is None
+    hdays = cache.load("FRA", None, 2024)
+    assert hdays == dict(country_holidays("FRA", years=2024))
+    path = cache.get_path("FRA", None, 2024)
+    assert path == os.path.join(
+        str(tmp_path), get_holidays_version(), "FRA", "2024.bin"
+    )
+    assert os.path.isfile(path)
+    assert cache.get("FRA", None, 2024) == hdays
+    assert cache.get_path("DEU", "BY", 2024).endswith(
+        os.path.join("DEU-BY", "2024.bin")
+    )
+
+    # warm cache
+    assert cache.warm("FRA", None, range(2023, 2027)) == 3
+    assert cache.warm("FRA", None, range(2023, 2027)) == 0
+    with pytest.raises(NotImplementedError):
+        cache.warm("XXX", None, [2024])
+
+    # invalid file: holidays are computed again
+    with open(path, "wb") as _file:
+        _file.write(b"invalid")
+    assert cache.get("FRA", None, 2024) is None
+    assert cache.load("FRA", None, 2024) == hdays
+    assert cache.get("FRA", None, 2024) == hdays
+
+
+def test_cached_holidays(tmp_path):
+    """Test CachedHolidays class."""
+    cache = HolidaysCache(str(tmp_path))
+    hdays = CachedHolidays("FRA", cache=cache)
+    assert not hdays
+    assert hdays.years == set()
+    assert date(2024, 12, 25) in hdays
+    assert date(2024, 12, 24) not in hdays
+    assert hdays.years == {2024}
+    assert dict(hdays) == dict(country_holidays("FRA", years=2024))
+    assert os.path.isfile(cache.get_path("FRA", None, 2024))
+    hdays = CachedHolidays("FRA")
+    assert date(2030, 1, 1) in hdays
+    assert hdays.years == {2030}
+    # lookup of a holiday in a year not yet loaded
+    assert hdays.get(date(2031, 5, 1)) == country_holidays("FRA", years=2031)[
+        date(2031, 5, 1)
+    ]
+    assert hdays.years == {2030, 2031}
+    assert hdays.get(date(2032, 5, 2)) is None
+    assert hdays.get(date(2032, 5, 2), "") == ""
+    assert hdays.years == {2030, 2031, 2032}
+    assert hdays[date(2033, 12, 25)] == hdays[date(2030, 12, 25)]
+    assert hdays.years == {2030, 2031, 2032, 2033}
+    with pytest.raises(KeyError):
+        _ = hdays[date(2034, 12, 24)]
+    assert 2034 in hdays.years
+
+    # project using the cache
+    project = Project(get_input_file("project_complete.yaml"), cache)
+    assert isinstance(project.hdays, CachedHolidays)
+    assert project.hdays.years == {2020}
+    assert os.path.isfile(cache.get_path("FRA", None, 2020))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests on NDJSON input."""
+
+import os
+
+import pytest
+
+from tasksched import (
+    build_workplan,
+    get_ndjson_files,
+    hash_ndjson_files,
+    iter_config_items,
+    Project,
+    read_ndjson,
+)
+from .utils import get_input_file
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_read_ndjson(tmp_path):
+    """Test read_ndjson function."""
+    filename = os.path.join(TESTS_DIR, "tasks.ndjson")
+    tasks = list(read_ndjson(filename))
+    assert [task["id"] for task in tasks] == ["task1", "task2", "task3"]
+    assert tasks[2] == get_input_file("project_complete.yaml")["tasks"][2]
+
+    # errors
+    with pytest.raises(ValueError, match="unable to read file"):
+        list(read_ndjson(str(tmp_path / "unknown.ndjson")))
+    path = tmp_path / "invalid.ndjson"
+    path.write_text('{"id": "task1"}\n{"id"\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="invalid.ndjson:2: invalid JSON"):
+        list(read_ndjson(str(path)))
+    path.write_text('{"id": "task1"}\n["task2"]\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="JSON object expected"):
+        list(read_ndjson(str(path)))
+
+
+def test_iter_config_items():
+    """Test iter_config_items function."""
+    filename = os.path.join(TESTS_DIR, "resources.ndjson")
+    assert not get_ndjson_files({}, "resources")
+    assert get_ndjson_files({"resources_files": "a"}, "resources") == ["a"]
+    config = {"resources": [{"id": "dev1"}], "resources_files": [filename]}
+    assert [res["id"] for res in iter_config_items(config, "resources")] == [
+        "dev1",
+        "dev2",
+    ]
+    config = {"resources_files": [filename]}
+    assert [res["id"] for res in iter_config_items(config, "resources")] == [
+        "dev2"
+    ]
+    with pytest.raises(KeyError):
+        list(iter_config_items({}, "resources"))
+
+
+def test_hash_ndjson_files(tmp_path):
+    """Test hash_ndjson_files function."""
+    path = tmp_path / "tasks.ndjson"
+    path.write_text('{"id": "task1", "duration": 1}\n', encoding="utf-8")
+    config = {"tasks_files": [str(path)]}
+    hashes = hash_ndjson_files(config)
+    assert hashes[0][0] == str(path)
+    assert len(hashes[0][1]) == 64
+    path.write_text('{"id": "task1", "duration": 2}\n', encoding="utf-8")
+    assert hash_ndjson_files(config) != hashes
+    with pytest.raises(ValueError):
+        hash_ndjson_files({"tasks_files": [str(tmp_path / "unknown")]})
+
+
+def test_project_ndjson():
+    """Test project with tasks and resources in NDJSON files."""
+    config = get_input_file("project_ndjson.yaml")
+    config["tasks_files"] = [os.path.join(TESTS_DIR, "tasks.ndjson")]
+    config["resources_files"] = [os.path.join(TESTS_DIR, "resources.ndjson")]
+    project = Project(config)
+    assert [res.res_id for res in project.resources] == ["dev1", "dev2"]
+    assert [task.task_id for task in project.tasks] == [
+        "task1",
+        "task2",
+        "task3",
+    ]
+    workplan = build_workplan(project)
+    assert workplan.as_dict() == get_input_file("workplan_complete.yaml")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests on output of actions."""
+
+import gzip
+import lzma
+import os
+
+import pytest
+
+from tasksched import open_output, write_output
+
+
+def test_open_output_stdout(capsys):
+    """Test open_output function with standard output."""
+    for filename in (None, "-"):
+        with open_output(filename) as output:
+            write_output(iter(["chunk1", "chunk2"]), output)
+        assert capsys.readouterr().out == "chunk1chunk2\n"
+
+
+def test_open_output_file(tmp_path):
+    """Test open_output function with files."""
+    filename = str(tmp_path / "output.txt")
+    with open_output(filename) as output:
+        write_output("Noël", output)
+    with open(filename, encoding="utf-8") as _file:
+        assert _file.read() == "Noël\n"
+
+    # gzip: no timestamp, same file for the same content
+    filename = str(tmp_path / "output.txt.gz")
+    with open_output(filename) as output:
+        write_output(iter(["été", "\n", "x" * 100000]), output)
+    with gzip.open(filename, "rt", encoding="utf-8") as _file:
+        assert _file.read() == "été\n" + "x" * 100000 + "\n"
+    with open(filename, "rb") as _file:
+        data = _file.read()
+    assert len(data) < 1000
+    with open_output(filename) as output:
+        write_output(iter(["été", "\n", "x" * 100000]), output)
+    with open(filename, "rb") as _file:
+        assert _file.read() == data
+
+    # xz
+    filename = str(tmp_path / "output.txt.xz")
+    with open_output(filename) as output:
+        write_output("été", output)
+    with lzma.open(filename, "rt", encoding="utf-8") as _file:
+        assert _file.read() == "été\n"
+
+    # error while writing: the file is not changed
+    filename = str(tmp_path / "output.txt")
+    with pytest.raises(ValueError):
+        with open_output(filename) as output:
+            output.write("partial")
+            raise ValueError("error")
+    with open(filename, encoding="utf-8") as _file:
+        assert _file.read() == "Noël\n"
+    assert sorted(os.listdir(tmp_path)) == [
+        "output.txt",
+        "output.txt.gz",
+        "output.txt.xz",
+    ]
+
+    # invalid file
+    with pytest.raises(OSError):
+        with open_output(str(tmp_path / "unknown" / "output.txt")) as output:
+            write_output("test", output)
@@ -29,6 +29,7 @@ import pytest
 
 from tasksched import (
     Project,
+    ProjectSnapshot,
     Resource,
     Task,
 )
@@ -45,6 +46,7 @@ def test_resource():
     assert res.res_id == "id"
     assert res.name == "The name"
     assert str(res) == "Resource id - The name"
+    assert not hasattr(res, "__dict__")
 
 
 def test_task():
@@ -60,6 +62,7 @@ def test_task():
     assert str(task) == (
         "Task id - the title: 30d, priority: 100, max resources: 3"
     )
+    assert not hasattr(task, "__dict__")
 
 
 def test_project():  # pylint: disable=too-many-statements
@@ -102,7 +105,7 @@ def test_project():  # pylint: disable=too-many-statements
     assert project.holidays_iso == "FRA"
     assert isinstance(project.hdays, dict)
     assert project.hdays
-    assert project.hdays.years == set(range(2020, 2030))
+    assert project.hdays.years == {2020}
     assert len(project.resources) == 2
     assert project.resources[0].res_id == "dev1"
     assert project.resources[0].name == "Developer 1"
@@ -160,6 +163,31 @@ Project: The name
     assert project.tasks[2].max_resources == 2
 
 
+def test_project_snapshot():
+    """Test snapshot of a project."""
+    project = Project(get_input_file("project_complete.yaml"))
+    snapshot = project.snapshot()
+    assert isinstance(snapshot, ProjectSnapshot)
+    assert snapshot.snapshot() is snapshot
+    assert snapshot.name == "The name"
+    assert snapshot.start_date == date(2020, 12, 21)
+    assert snapshot.holidays_iso == "FRA"
+    assert snapshot.hdays is project.hdays
+    assert [res.res_id for res in snapshot.resources] == ["dev1", "dev2"]
+    assert [task.task_id for task in snapshot.tasks] == [
+        "task1",
+        "task2",
+        "task3",
+    ]
+    # the snapshot is not affected by changes in the project
+    project.tasks[2].duration = 20
+    project.resources.pop()
+    assert snapshot.tasks[2].duration == 10
+    assert len(snapshot.resources) == 2
+    with pytest.raises(AttributeError):
+        snapshot.name = "new name"  # type: ignore
+
+
 def test_project_sort_tasks():
     """Test sort of tasks in a project."""
     project = Project(get_input_file("project_complete.yaml"))
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tasksched search tests."""
+
+import time
+
+from tasksched import (
+    Project,
+    SplitSearch,
+    WorkPlan,
+    beam_search_split,
+    evaluate_candidates,
+    find_best_split,
+    get_lower_bound,
+    split_duration,
+)
+from tasksched.search import expand_split, get_split_moves
+from .utils import get_input_file
+
+
+def get_project_3_resources() -> Project:
+    """
+    Return a project with 3 resources and one task which can be split
+    in 3.
+
+    :return: project
+    """
+    return Project(
+        {
+            "project": {"name": "The name", "start": "2020-12-21"},
+            "resources": [{"id": "dev1"}, {"id": "dev2"}, {"id": "dev3"}],
+            "tasks": [
+                {"id": "task1", "duration": 9, "max_resources": 3},
+                {"id": "task2", "duration": 1},
+            ],
+        }
+    )
+
+
+def test_split_duration():
+    """Test split_duration function."""
+    assert split_duration(10, 1) == [10]
+    assert split_duration(10, 2) == [5, 5]
+    assert split_duration(10, 3) == [4, 3, 3]
+    assert split_duration(5, 2) == [3, 2]
+    assert split_duration(2, 3) == [1, 1]
+    assert split_duration(1, 2) == [1]
+
+
+def test_get_lower_bound():
+    """Test get_lower_bound function."""
+    project = Project(get_input_file("project_complete.yaml"))
+    # longest task: 10 days
+    assert get_lower_bound(project) == 10
+    assert get_lower_bound(project, {"task3": 2}) == 9
+    assert get_lower_bound(project, {"task3": 2, "task2": 2}) == 9
+    # split in 3: ignored (max_resources == 2)
+    assert get_lower_bound(project, {"task3": 3}) == 10
+    assert get_lower_bound(project, max_split=True) == 9
+    project.tasks[2].max_resources = 3
+    # 17 days for 2 resources
+    assert get_lower_bound(project, {"task3": 3}) == 9
+    project = get_project_3_resources()
+    assert get_lower_bound(project, max_split=True) == 4
+
+
+def test_split_search():
+    """Test SplitSearch class."""
+    project = Project(get_input_file("project_complete.yaml"))
+    search = SplitSearch(project)
+    assert search.longest_chunk() == 10
+    assert search.lower_bound() == 10
+    assert search.evaluate() == 10
+    assert search.evaluate() == WorkPlan(project).duration
+    search.split("task3", 2)
+    assert search.longest_chunk() == 5
+    assert search.lower_bound() == 9
+    assert search.evaluate() == 10
+    assert search.evaluate() == WorkPlan(project, {"task3": 2}).duration
+    search.split("task2", 2)
+    assert search.evaluate() == 9
+    assert (
+        search.evaluate()
+        == WorkPlan(project, {"task3": 2, "task2": 2}).duration
+    )
+    # split in 3: ignored (max_resources == 2)
+    search.split("task1", 3)
+    assert search.evaluate() == 9
+    # unknown task
+    search.split("unknown", 2)
+    assert search.evaluate() == 9
+
+
+def test_split_search_priority():
+    """Test SplitSearch class with priorities."""
+    project = Project(get_input_file("project_complete2.yaml"))
+    search = SplitSearch(project)
+    tasks_to_split = {}
+    assert search.evaluate() == WorkPlan(project).duration
+    for task in project.sorted_tasks(["duration"], reverse=True):
+        search.split(task.task_id, 2)
+        tasks_to_split[task.task_id] = 2
+        assert (
+            search.evaluate()
+            == WorkPlan(project, tasks_to_split=tasks_to_split).duration
+        )
+
+
+def test_evaluate_candidates():
+    """Test evaluate_candidates function."""
+    project = Project(get_input_file("project_complete.yaml"))
+    tasks_ids = ["task3", "task2", "task1"]
+    assert evaluate_candidates(project, tasks_ids, 0, 4) == (9, 2)
+    assert evaluate_candidates(project, tasks_ids, 0, 1) == (10, 0)
+    assert evaluate_candidates(project, tasks_ids, 0, 2) == (10, 0)
+    assert evaluate_candidates(project, tasks_ids, 2, 4) == (9, 2)
+    assert evaluate_candidates(project, tasks_ids, 3, 4) == (9, 3)
+    # lower bound reached with 2 tasks split: the search stops
+    assert evaluate_candidates(project, tasks_ids + ["task4"], 0, 5) == (9, 2)
+
+
+def test_find_best_split():
+    """Test find_best_split function."""
+    project = Project(get_input_file("project_complete.yaml"))
+    tasks_ids = ["task3", "task2", "task1"]
+    assert find_best_split(project, []) == 0
+    assert find_best_split(project, tasks_ids) == 2
+    assert find_best_split(project, tasks_ids, workers=2) == 2
+    assert find_best_split(project, tasks_ids, workers=8) == 2
+    assert find_best_split(project, tasks_ids, workers=0) == 2
+
+
+def test_evaluate_candidates_time_limit():
+    """Test evaluate_candidates function with a time limit."""
+    project = Project(get_input_file("project_complete.yaml"))
+    tasks_ids = ["task3", "task2", "task1"]
+    # time exceeded: only the first candidate is evaluated
+    assert evaluate_candidates(
+        project, tasks_ids, 0, 4, time_limit=0
+    ) == (10, 0)
+    assert find_best_split(project, tasks_ids, time_limit=0) == 0
+    assert find_best_split(project, tasks_ids, time_limit=60) == 2
+
+
+def test_get_split_moves():
+    """Test get_split_moves function."""
+    project = get_project_3_resources()
+    assert get_split_moves(project, {}, 4) == [("task1", 2)]
+    assert get_split_moves(project, {"task1": 2}, 4) == [("task1", 3)]
+    assert not get_split_moves(project, {"task1": 3}, 4)
+    project = Project(get_input_file("project_complete.yaml"))
+    assert get_split_moves(project, {}, 4) == [
+        ("task3", 2),
+        ("task2", 2),
+        ("task1", 2),
+    ]
+    assert get_split_moves(project, {}, 2) == [("task3", 2), ("task2", 2)]
+    assert get_split_moves(project, {"task3": 2}, 1) == [("task2", 2)]
+
+
+def test_expand_split():
+    """Test expand_split function."""
+    project = Project(get_input_file("project_complete.yaml"))
+    visited = {(("task3", 2),)}
+    deadline = time.monotonic() + 60
+    assert expand_split(project, {}, 4, visited, deadline) == (
+        [(10, {"task2": 2}), (10, {"task1": 2})],
+        False,
+    )
+    assert visited == {
+        (("task3", 2),),
+        (("task2", 2),),
+        (("task1", 2),),
+    }
+    # time exceeded
+    assert expand_split(project, {}, 4, set(), 0) == ([], True)
+
+
+def test_beam_search_split():
+    """Test beam_search_split function."""
+    project = get_project_3_resources()
+    assert beam_search_split(project) == {"task1": 3}
+    assert beam_search_split(project, {"task1": 2}) == {"task1": 3}
+    assert beam_search_split(project, beam_width=1) == {"task1": 3}
+    # time exceeded: the initial split is returned
+    assert beam_search_split(project, {"task1": 2}, time_limit=0) == {
+        "task1": 2
+    }
+    project = Project(get_input_file("project_complete.yaml"))
+    tasks_to_split = beam_search_split(project)
+    assert WorkPlan(project, tasks_to_split).duration == 9
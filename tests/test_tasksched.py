@@ -22,14 +22,20 @@
 
 """Tasksched tests."""
 
+from datetime import date
+from typing import Any, Dict
+import gzip
 import io
 import os
 import sys
 
 import mock
 import pytest
+import yaml
 
 import tasksched
+from tasksched.tasksched import expand_filenames, merge_configs, read_file
+from .utils import get_input_file
 
 TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -115,8 +121,137 @@ def test_load_config():  # pylint: disable=too-many-statements
         tasksched.load_config([config1, config2])
 
 
-def test_main(monkeypatch):  # pylint: disable=too-many-statements
+def test_load_config_files(tmp_path):
+    """Test load_config function with many files (loaded in parallel)."""
+    filenames = []
+    for i in range(40):
+        path = tmp_path / f"tasks{i:02d}.yaml"
+        path.write_text(
+            f"tasks:\n- id: task{i % 7}\n  duration: {i}\n"
+            f"- id: task{i}_2\n  duration: 1\n",
+            encoding="utf-8",
+        )
+        filenames.append(str(path))
+    config = tasksched.load_config(filenames)
+    expected: Dict[str, Any] = {}
+    for filename in filenames:
+        merge_configs(expected, read_file(filename))
+    assert config == expected
+    assert config["tasks"][0] == {"id": "task0", "duration": 35}
+
+    # error on a file: the first error in the order of files is raised
+    with pytest.raises(FileNotFoundError):
+        tasksched.load_config(
+            filenames[:10] + [str(tmp_path / "unknown.yaml")] + filenames[10:]
+        )
+
+
+def test_expand_filenames(tmp_path):
+    """Test expand_filenames function."""
+    for name in ("b.yaml", "a.json", "c.yml", "d.txt", "e.ndjson"):
+        (tmp_path / name).write_text("{}", encoding="utf-8")
+    (tmp_path / "dir.yaml").mkdir()
+    assert expand_filenames([str(tmp_path)]) == [
+        str(tmp_path / "a.json"),
+        str(tmp_path / "b.yaml"),
+        str(tmp_path / "c.yml"),
+    ]
+    assert expand_filenames([str(tmp_path / "*.y*ml"), "other.yaml"]) == [
+        str(tmp_path / "b.yaml"),
+        str(tmp_path / "c.yml"),
+        str(tmp_path / "dir.yaml"),
+        "other.yaml",
+    ]
+    assert expand_filenames([str(tmp_path / "*.xyz")]) == [
+        str(tmp_path / "*.xyz")
+    ]
+    assert not expand_filenames([])
+
+
+def test_merge_configs():
+    """Test merge_configs function."""
+    config = {
+        "tasks": [
+            {"id": "1", "duration": 1},
+            {"duration": 2},
+            {"id": "1", "duration": 3},
+        ],
+    }
+    indexes: Dict[str, Dict[str, Any]] = {}
+    merge_configs(
+        config,
+        {
+            "tasks": [
+                {"id": "1", "duration": 4},
+                {"id": "2", "duration": 5},
+                {"id": "2", "title": "two"},
+                {"id": "", "duration": 6},
+            ]
+        },
+        indexes,
+    )
+    assert config == {
+        "tasks": [
+            {"id": "1", "duration": 4},
+            {"duration": 2},
+            {"id": "1", "duration": 3},
+            {"id": "2", "duration": 5, "title": "two"},
+            {"id": "", "duration": 6},
+        ],
+    }
+    assert indexes["tasks"]["count"] == 5
+    assert list(indexes["tasks"]["ids"]) == ["1", "2"]
+
+    # index is kept and updated with items added after the last merge
+    config["tasks"].append({"id": "3", "duration": 7})
+    merge_configs(config, {"tasks": [{"id": "3", "duration": 8}]}, indexes)
+    assert config["tasks"][-1] == {"id": "3", "duration": 8}
+    assert indexes["tasks"]["count"] == 6
+
+    # index is rebuilt if the list is replaced
+    config["tasks"] = [{"id": "1", "duration": 9}]
+    merge_configs(config, {"tasks": [{"id": "1", "duration": 10}]}, indexes)
+    assert config == {"tasks": [{"id": "1", "duration": 10}]}
+
+
+def test_read_file(monkeypatch):
+    """Test read_file function."""
+    for filename in ("project_complete.yaml", "project_complete.json"):
+        path = os.path.join(TESTS_DIR, filename)
+        with open(path, encoding="utf-8") as _file:
+            assert read_file(path) == yaml.safe_load(_file)
+    config = read_file(os.path.join(TESTS_DIR, "project_complete.yaml"))
+    assert config["project"]["start"] == date(2020, 12, 21)
+
+    # JSON: same values as YAML parser
+    data = '{"start": "2020-12-21", "values": [1, 1.5, 1e5, 1.0e5, 1.0e+5]}'
+    assert read_file(io.StringIO(data)) == yaml.safe_load(data)
+    assert read_file(io.StringIO(data))["values"] == [
+        1,
+        1.5,
+        "1e5",
+        "1.0e5",
+        100000.0,
+    ]
+
+    # YAML flow style
+    data = "{start: 2020-12-21, values: [1, 2]}"
+    assert read_file(io.StringIO(data)) == {
+        "start": date(2020, 12, 21),
+        "values": [1, 2],
+    }
+
+    # YAML without libyaml
+    monkeypatch.delattr(yaml, "CSafeLoader")
+    assert read_file(io.StringIO(data)) == {
+        "start": date(2020, 12, 21),
+        "values": [1, 2],
+    }
+
+
+def test_main(monkeypatch, tmp_path):  # pylint: disable=too-many-statements
     """Test main function."""
+    monkeypatch.setenv("TASKSCHED_HOLIDAYS_CACHE", str(tmp_path / "hdays"))
     stdin = io.StringIO("")
     stdin.fileno = lambda: 0
     monkeypatch.setattr("sys.stdin", stdin)
@@ -154,6 +289,108 @@ def test_main(monkeypatch):  # pylint: disable=too-many-statements
     with mock.patch.object(sys, "argv", args):
         tasksched.main()
 
+    # action: workplan with multiple processes, OK
+    stdin = io.StringIO("")
+    stdin.fileno = lambda: 0
+    monkeypatch.setattr("sys.stdin", stdin)
+    filename = os.path.join(TESTS_DIR, "project_complete.yaml")
+    args = ["tasksched", "workplan", "--jobs", "2", filename]
+    with mock.patch.object(sys, "argv", args):
+        tasksched.main()
+
+    # action: workplan with beam search and time limit, OK
+    stdin = io.StringIO("")
+    stdin.fileno = lambda: 0
+    monkeypatch.setattr("sys.stdin", stdin)
+    filename = os.path.join(TESTS_DIR, "project_complete.yaml")
+    args = [
+        "tasksched",
+        "workplan",
+        "--search",
+        "beam",
+        "--beam-width",
+        "2",
+        "--time-limit",
+        "10",
+        filename,
+    ]
+    with mock.patch.object(sys, "argv", args):
+        tasksched.main()
+
+    # action: workplan with arrays engine, OK
+    stdin = io.StringIO("")
+    stdin.fileno = lambda: 0
+    monkeypatch.setattr("sys.stdin", stdin)
+    filename = os.path.join(TESTS_DIR, "project_complete.yaml")
+    args = ["tasksched", "workplan", "--engine", "arrays", filename]
+    with mock.patch.object(sys, "argv", args):
+        tasksched.main()
+
+    # action: workplan with cache (twice: build then read from cache), OK
+    filename = os.path.join(TESTS_DIR, "project_complete.yaml")
+    args = [
+        "tasksched",
+        "workplan",
+        "--cache-dir",
+        str(tmp_path / "cache"),
+        filename,
+    ]
+    for _ in range(2):
+        stdin = io.StringIO("")
+        stdin.fileno = lambda: 0
+        monkeypatch.setattr("sys.stdin", stdin)
+        with mock.patch.object(sys, "argv", args):
+            tasksched.main()
+    assert len(os.listdir(tmp_path / "cache")) == 1
+
+    # action: workplan with tasks and resources in NDJSON files, OK
+    stdin = io.StringIO("")
+    stdin.fileno = lambda: 0
+    monkeypatch.setattr("sys.stdin", stdin)
+    filename = os.path.join(TESTS_DIR, "project_ndjson.yaml")
+    args = [
+        "tasksched",
+        "workplan",
+        "--resources-ndjson",
+        os.path.join(TESTS_DIR, "resources.ndjson"),
+        "--cache-dir",
+        str(tmp_path / "cache"),
+        filename,
+    ]
+    with mock.patch.object(sys, "argv", args):
+        tasksched.main()
+    assert len(os.listdir(tmp_path / "cache")) == 2
+
+    # action: workplan with NDJSON file not found
+    stdin = io.StringIO("")
+    stdin.fileno = lambda: 0
+    monkeypatch.setattr("sys.stdin", stdin)
+    for options in ([], ["--cache-dir", str(tmp_path / "cache")]):
+        args = [
+            "tasksched",
+            "workplan",
+            "--tasks-ndjson",
+            "unknown.ndjson",
+            *options,
+            filename,
+        ]
+        with pytest.raises(SystemExit):
+            with mock.patch.object(sys, "argv", args):
+                tasksched.main()
+
+    # action: workplan with a directory of configuration files, OK
+    stdin = io.StringIO("")
+    stdin.fileno = lambda: 0
+    monkeypatch.setattr("sys.stdin", stdin)
+    (tmp_path / "teams").mkdir()
+    (tmp_path / "teams" / "team1.yaml").write_text(
+        "resources:\n- id: dev3\n", encoding="utf-8"
+    )
+    filename = os.path.join(TESTS_DIR, "project_complete.yaml")
+    args = ["tasksched", "workplan", "-d", str(tmp_path / "teams"), filename]
+    with mock.patch.object(sys, "argv", args):
+        tasksched.main()
+
     # action: workplan as JSON, OK
     stdin = io.StringIO("")
     stdin.fileno = lambda: 0
@@ -163,6 +400,52 @@ def test_main(monkeypatch):  # pylint: disable=too-many-statements
     with mock.patch.object(sys, "argv", args):
         tasksched.main()
 
+    # action: workplan in a compressed file, OK
+    stdin = io.StringIO("")
+    stdin.fileno = lambda: 0
+    monkeypatch.setattr("sys.stdin", stdin)
+    output = str(tmp_path / "workplan.yaml.gz")
+    args = ["tasksched", "workplan", "-o", output, filename]
+    with mock.patch.object(sys, "argv", args):
+        tasksched.main()
+    with gzip.open(output, "rt", encoding="utf-8") as _file:
+        assert _file.read() == get_input_file(
+            "workplan_complete.yaml", raw=True
+        ) + "\n"
+
+    # action: workplan in compact format, then text with this work plan, OK
+    stdin = io.StringIO("")
+    stdin.fileno = lambda: 0
+    monkeypatch.setattr("sys.stdin", stdin)
+    output = str(tmp_path / "workplan_compact.json")
+    args = ["tasksched", "workplan", "-f", "compact", "-o", output, filename]
+    with mock.patch.object(sys, "argv", args):
+        tasksched.main()
+    args = ["tasksched", "text", output]
+    with mock.patch.object(sys, "argv", args):
+        tasksched.main()
+
+    # action: text with a compact work plan, unsupported version
+    (tmp_path / "workplan_compact_v0.json").write_text(
+        '{"format": "tasksched-compact", "version": 0}', encoding="utf-8"
+    )
+    args = ["tasksched", "text", str(tmp_path / "workplan_compact_v0.json")]
+    with pytest.raises(SystemExit):
+        with mock.patch.object(sys, "argv", args):
+            tasksched.main()
+
+    # action: workplan in a file, invalid directory
+    args = [
+        "tasksched",
+        "workplan",
+        "-o",
+        str(tmp_path / "unknown" / "workplan.yaml"),
+        filename,
+    ]
+    with pytest.raises(SystemExit):
+        with mock.patch.object(sys, "argv", args):
+            tasksched.main()
+
     # action: workplan, invalid YAML on input
     stdin = io.StringIO("{")
     stdin.fileno = lambda: 0
@@ -208,6 +491,44 @@ def test_main(monkeypatch):  # pylint: disable=too-many-statements
     with mock.patch.object(sys, "argv", args):
         tasksched.main()
 
+    # action: text by week, OK
+    stdin = io.StringIO("")
+    stdin.fileno = lambda: 0
+    monkeypatch.setattr("sys.stdin", stdin)
+    args = ["tasksched", "text", "--scale", "week", filename]
+    with mock.patch.object(sys, "argv", args):
+        tasksched.main()
+
+    # action: text with a window of dates and the terminal width, OK
+    stdin = io.StringIO("")
+    stdin.fileno = lambda: 0
+    monkeypatch.setattr("sys.stdin", stdin)
+    args = [
+        "tasksched",
+        "text",
+        "--from",
+        "2020-12-24",
+        "--to",
+        "2020-12-29",
+        "--width",
+        "auto",
+        filename,
+    ]
+    with mock.patch.object(sys, "argv", args):
+        tasksched.main()
+
+    # action: text, invalid date
+    args = ["tasksched", "text", "--from", "2020-13-01", filename]
+    with pytest.raises(SystemExit):
+        with mock.patch.object(sys, "argv", args):
+            tasksched.main()
+
+    # action: text, invalid width
+    args = ["tasksched", "text", "--width", "0", filename]
+    with pytest.raises(SystemExit):
+        with mock.patch.object(sys, "argv", args):
+            tasksched.main()
+
     # action: workplan_text, OK
     stdin = io.StringIO("")
     stdin.fileno = lambda: 0
@@ -251,6 +572,85 @@ def test_main(monkeypatch):  # pylint: disable=too-many-statements
     args = ["tasksched", "workplan_html", filename]
     with mock.patch.object(sys, "argv", args):
         tasksched.main()
+    assert os.path.isdir(tmp_path / "hdays")
+
+    # action: compile, OK
+    stdin = io.StringIO("")
+    stdin.fileno = lambda: 0
+    monkeypatch.setattr("sys.stdin", stdin)
+    filename = os.path.join(TESTS_DIR, "project_complete.yaml")
+    compiled = str(tmp_path / "project.tsp")
+    args = ["tasksched", "compile", "-o", compiled, filename]
+    with mock.patch.object(sys, "argv", args):
+        tasksched.main()
+
+    # action: compile, invalid output
+    args = ["tasksched", "compile", "-o", str(tmp_path), filename]
+    with pytest.raises(SystemExit):
+        with mock.patch.object(sys, "argv", args):
+            tasksched.main()
+
+    # action: workplan with compiled project, OK
+    for options in ([], ["--cache-dir", str(tmp_path / "cache")]):
+        args = ["tasksched", "workplan", *options, compiled]
+        with mock.patch.object(sys, "argv", args):
+            tasksched.main()
+
+    # action: workplan with compiled project and other files
+    args = ["tasksched", "workplan", compiled, filename]
+    with pytest.raises(SystemExit):
+        with mock.patch.object(sys, "argv", args):
+            tasksched.main()
+
+    # action: workplan with invalid compiled project
+    with open(compiled, "r+b") as _file:
+        _file.truncate(40)
+    args = ["tasksched", "workplan", compiled]
+    with pytest.raises(SystemExit):
+        with mock.patch.object(sys, "argv", args):
+            tasksched.main()
+
+    # action: holidays, invalid years
+    args = ["tasksched", "holidays", "--warm", "FRA", "2020-abc"]
+    with pytest.raises(SystemExit):
+        with mock.patch.object(sys, "argv", args):
+            tasksched.main()
+
+    # action: holidays, invalid country
+    args = ["tasksched", "holidays", "--warm", "FRA,XXX", "2020"]
+    with pytest.raises(SystemExit):
+        with mock.patch.object(sys, "argv", args):
+            tasksched.main()
+
+    # action: holidays, OK
+    args = ["tasksched", "holidays", "--warm", "FRA,DEU", "2020-2035"]
+    with mock.patch.object(sys, "argv", args):
+        tasksched.main()
+    assert len(os.listdir(tmp_path / "hdays")) == 1
+
+
+def test_main_html_error(monkeypatch, tmp_path, capsys):
+    """Test main function with an error in the middle of HTML rendering."""
+    monkeypatch.setenv("TASKSCHED_HOLIDAYS_CACHE", str(tmp_path / "hdays"))
+    template = tmp_path / "template.html"
+    template.write_text(
+        "<html>{% for res in resources %}{{ res.missing.name }}"
+        "{% endfor %}</html>",
+        encoding="utf-8",
+    )
+    filename = os.path.join(TESTS_DIR, "workplan_complete.yaml")
+    output = tmp_path / "workplan.html"
+    for options in ([], ["-o", str(output)]):
+        stdin = io.StringIO("")
+        stdin.fileno = lambda: 0
+        monkeypatch.setattr("sys.stdin", stdin)
+        args = ["tasksched", "html", "-t", str(template), *options, filename]
+        with pytest.raises(SystemExit):
+            with mock.patch.object(sys, "argv", args):
+                tasksched.main()
+        # no truncated page written
+        assert capsys.readouterr().out == ""
+        assert not output.exists()
 
 
 def test_init(monkeypatch):
@@ -23,14 +23,18 @@
 """Tasksched utility tests."""
 
 from datetime import date
+import hashlib
 import pytest
 
 from holidays import country_holidays
 
 from tasksched import (
     add_business_days,
+    count_business_days,
+    DaysView,
     get_days,
     get_months,
+    hash_file,
     is_business_day as is_bus,
     string_to_date,
 )
@@ -85,6 +89,45 @@ def test_add_business_days():
     assert add_business_days(start, 9, hdays) == date(2021, 1, 5)
     assert add_business_days(start, 10, hdays) == date(2021, 1, 6)
 
+    # holidays of next years are loaded when needed
+    assert add_business_days(start, 0, hdays) == start
+    assert add_business_days(start, 504, hdays) == date(2022, 12, 16)
+    assert add_business_days(start, 505, hdays) == date(2022, 12, 19)
+    assert 2022 in hdays.years
+
+
+def test_count_business_days():
+    """Test count_business_days function."""
+    start = date(2020, 12, 21)  # Monday
+
+    # no holidays
+    assert count_business_days(start, date(2020, 12, 20)) == 0
+    assert count_business_days(start, start) == 0
+    assert count_business_days(start, date(2020, 12, 22)) == 1
+    assert count_business_days(start, date(2020, 12, 26)) == 4
+    assert count_business_days(start, date(2020, 12, 27)) == 4
+    assert count_business_days(start, date(2020, 12, 28)) == 5
+
+    # French holidays
+    hdays = country_holidays("FRA", years=[2020])
+    assert count_business_days(start, date(2020, 12, 24), hdays) == 3
+    assert count_business_days(start, date(2020, 12, 25), hdays) == 3
+    assert count_business_days(start, date(2021, 1, 6), hdays) == 10
+    for count in range(600):
+        end = add_business_days(start, count, hdays)
+        assert count_business_days(start, end, hdays) == count
+
+
+def test_business_days_holiday_changed():
+    """Test business days with a holiday changed in the same dictionary."""
+    hdays = {date(2021, 1, 5): "Holiday"}
+    assert add_business_days(date(2021, 1, 4), 1, hdays) == date(2021, 1, 6)
+    # replace the holiday, the number of holidays is the same
+    del hdays[date(2021, 1, 5)]
+    hdays[date(2021, 1, 6)] = "Holiday"
+    assert add_business_days(date(2021, 1, 4), 1, hdays) == date(2021, 1, 5)
+    assert count_business_days(date(2021, 1, 4), date(2021, 1, 6), hdays) == 1
+
 
 def test_get_days():
     """Test get_days function."""
@@ -155,6 +198,19 @@ def test_get_days():
         date(2020, 12, 28): {"business_day": True, "weekday": "Monday"},
     }
 
+    # compact model: one byte by day, values are shared
+    days = get_days(date(2020, 12, 21), date(2021, 12, 31))
+    assert isinstance(days, DaysView)
+    assert len(days) == len(days.business) == 376
+    assert days[date(2020, 12, 21)] is days[date(2020, 12, 28)]
+    assert date(2020, 12, 20) not in days
+    assert date(2022, 1, 1) not in days
+    assert "2020-12-21" not in days
+    with pytest.raises(KeyError):
+        _ = days[date(2022, 1, 1)]
+    assert list(days)[-1] == date(2021, 12, 31)
+    assert not get_days(date(2020, 12, 21), date(2020, 12, 20))
+
 
 def test_get_months():
     """Test get_months function."""
@@ -200,3 +256,14 @@ def test_string_to_date():
         string_to_date(True)
     with pytest.raises(TypeError):
         string_to_date(123)
+
+
+def test_hash_file(tmp_path):
+    """Test hash_file function."""
+    path = tmp_path / "file.txt"
+    path.write_bytes(b"")
+    assert hash_file(str(path)) == (
+        "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855"
+    )
+    path.write_bytes(b"x" * (3 << 20))
+    assert hash_file(str(path)) == hashlib.sha256(b"x" * (3 << 20)).hexdigest()
@@ -26,12 +26,22 @@ from datetime import date
 
 import pytest
 
+from holidays import country_holidays
+
 from tasksched import (
+    add_business_days,
+    ArrayWorkPlan,
     build_workplan,
     Project,
     WorkPlan,
     yaml_dump,
 )
+from tasksched.workplan import (
+    Assignment,
+    ResourcePool,
+    WorkPlanResource,
+    WorkPlanTask,
+)
 from .utils import get_input_file
 
 
@@ -43,6 +53,7 @@ def test_workplan():
     workplan = WorkPlan(project)
     assert workplan.remaining == 0
     assert workplan.duration == 10
+    assert workplan.lower_bound == 10
     assert workplan.end_date == date(2021, 1, 5)
     assert workplan.resources_use == 85.0
     assert workplan.resources[0].assigned == [
@@ -88,6 +99,57 @@ def test_workplan():
     assert workplan.tasks[2].remaining == 0
 
 
+def test_workplan_resource():
+    """Test WorkPlanResource class."""
+    res = WorkPlanResource("dev1", "Developer 1")
+    assert not hasattr(res, "__dict__")
+    assert res.assigned == []
+    assert res.assigned_tasks == []
+    task1 = WorkPlanTask("task1", "The first task", 5)
+    task2 = WorkPlanTask("task2", "The second task", 3)
+    assert not hasattr(task1, "__dict__")
+    res.assign(task1, 5)
+    res.assign(task2, 3)
+    assert res.assignments == [Assignment(task1, 5), Assignment(task2, 3)]
+    assert res.assigned == [
+        {"task": "task1", "duration": 5},
+        {"task": "task2", "duration": 3},
+    ]
+    assert res.assigned_tasks == [
+        {"id": "task1", "title": "The first task"},
+        {"id": "task2", "title": "The second task"},
+    ]
+
+
+def test_resource_pool():
+    """Test ResourcePool class."""
+    resources = [
+        WorkPlanResource("dev1", "Developer 1"),
+        WorkPlanResource("dev2", "Developer 2"),
+        WorkPlanResource("dev3", "Developer 3"),
+    ]
+    pool = ResourcePool(resources)
+    assert pool.best() is resources[0]
+    resources[0].duration = 5
+    assert pool.best() is resources[1]
+    resources[1].duration = 3
+    assert pool.best() is resources[2]
+    resources[2].duration = 3
+    assert pool.best() is resources[1]
+    resources[1].duration = 5
+    assert pool.best() is resources[2]
+    resources[2].duration = 5
+    assert pool.best() is resources[0]
+    # the duration of a resource must never decrease
+    resources[0].duration = 7
+    assert pool.best() is resources[1]
+    resources[0].duration = 6
+    resources[1].duration = 8
+    resources[2].duration = 8
+    with pytest.raises(ValueError):
+        pool.best()
+
+
 def test_workplan_sort_tasks():
     """Test sort of tasks in a project."""
     workplan = WorkPlan(Project(get_input_file("project_complete.yaml")))
@@ -154,6 +216,52 @@ def test_workplan_split_3():
     assert workplan.tasks[4].duration == 10
 
 
+def test_array_workplan():
+    """Test ArrayWorkPlan class."""
+    with pytest.raises(TypeError):
+        ArrayWorkPlan()  # pylint: disable=no-value-for-parameter
+    for filename in ("project_complete.yaml", "project_complete2.yaml"):
+        project = Project(get_input_file(filename))
+        for tasks_to_split in (
+            None,
+            {"task3": 2},
+            {"task3": 2, "task2": 3, "task1": 2},
+        ):
+            workplan = WorkPlan(project, tasks_to_split)
+            array_workplan = ArrayWorkPlan(project, tasks_to_split)
+            assert array_workplan.remaining == 0
+            assert array_workplan.duration == workplan.duration
+            assert array_workplan.end_date == workplan.end_date
+            assert array_workplan.as_dict() == workplan.as_dict()
+    project = Project(get_input_file("project_complete.yaml"))
+    array_workplan = ArrayWorkPlan(project, {"task3": 2})
+    assert list(array_workplan.chunks_task) == [0, 1, 2, 2]
+    assert list(array_workplan.chunks_duration) == [2, 5, 5, 5]
+    assert list(array_workplan.chunks_remaining) == [0, 0, 0, 0]
+    assert list(array_workplan.assigned_resource) == [0, 1, 0, 1]
+    assert list(array_workplan.assigned_chunk) == [1, 2, 3, 0]
+    assert array_workplan.chunk_title(0) == "The first task"
+    assert array_workplan.chunk_title(3) == "The third task (2/2)"
+    # tasks are stored in arrays, without copy of the project tasks
+    assert not array_workplan.project.tasks
+    assert array_workplan.tasks_ids == ["task1", "task2", "task3"]
+    assert list(array_workplan.tasks_max_resources) == [2, 2, 2]
+    # large priorities (not exact as float): same order as WorkPlan
+    project = Project(
+        {
+            "project": {"name": "Test", "start": "2021-01-04"},
+            "resources": [{"id": "dev1"}],
+            "tasks": [
+                {"id": "task1", "duration": 5, "priority": 2**53},
+                {"id": "task2", "duration": 1, "priority": 2**53 + 1},
+            ],
+        }
+    )
+    array_workplan = ArrayWorkPlan(project)
+    assert list(array_workplan.assigned_chunk) == [1, 0]
+    assert array_workplan.as_dict() == WorkPlan(project).as_dict()
+
+
 def test_build_workplan():
     """Test build_workplan function."""
     workplan = build_workplan(
@@ -161,6 +269,7 @@ def test_build_workplan():
     )
     assert workplan.remaining == 0
     assert workplan.duration == 9
+    assert workplan.lower_bound == 9
     assert workplan.end_date == date(2021, 1, 4)
     assert workplan.resources_use == 94.44444444444444
     assert workplan.resources[0].assigned == [
@@ -226,6 +335,96 @@ def test_build_workplan():
     assert str_workplan == get_input_file("workplan_complete.yaml", raw=True)
 
 
+def test_build_workplan_workers():
+    """Test build_workplan function with multiple processes."""
+    project = Project(get_input_file("project_complete.yaml"))
+    workplan = build_workplan(project, workers=2)
+    assert workplan.as_dict() == get_input_file("workplan_complete.yaml")
+
+
+def test_build_workplan_search():
+    """Test build_workplan function with search modes."""
+    project = Project(get_input_file("project_complete.yaml"))
+    with pytest.raises(ValueError):
+        build_workplan(project, search="unknown")
+    workplan = build_workplan(project, search="beam")
+    assert workplan.duration == 9
+    assert workplan.lower_bound == 9
+    workplan = build_workplan(project, search="beam", time_limit=60)
+    assert workplan.duration == 9
+    # time exceeded: no task split
+    workplan = build_workplan(project, time_limit=0)
+    assert workplan.duration == 10
+    assert workplan.lower_bound == 9
+    # split of a task in 3 parts
+    project = Project(
+        {
+            "project": {"name": "The name", "start": "2020-12-21"},
+            "resources": [{"id": "dev1"}, {"id": "dev2"}, {"id": "dev3"}],
+            "tasks": [{"id": "task1", "duration": 9, "max_resources": 3}],
+        }
+    )
+    workplan = build_workplan(project)
+    assert workplan.duration == 5
+    # the prefix search splits tasks in 2 only: the work plan is not optimal
+    assert workplan.lower_bound == 3
+    assert workplan.as_dict()["workplan"]["project"]["optimality_gap"] == 2
+    workplan = build_workplan(project, search="beam", beam_width=2)
+    assert workplan.duration == 3
+    assert workplan.lower_bound == 3
+    assert workplan.as_dict()["workplan"]["project"]["optimality_gap"] == 0
+    assert [task.title for task in workplan.tasks] == [
+        "task1 (1/3)",
+        "task1 (2/3)",
+        "task1 (3/3)",
+    ]
+
+
+def test_build_workplan_engine():
+    """Test build_workplan function with the arrays engine."""
+    project = Project(get_input_file("project_complete.yaml"))
+    with pytest.raises(ValueError):
+        build_workplan(project, engine="unknown")
+    workplan = build_workplan(project, engine="arrays")
+    assert isinstance(workplan, ArrayWorkPlan)
+    workplan_dict = workplan.as_dict()
+    assert workplan_dict == get_input_file("workplan_complete.yaml")
+    str_workplan = yaml_dump(workplan_dict)
+    assert str_workplan == get_input_file("workplan_complete.yaml", raw=True)
+
+
+def test_build_workplan_holidays():
+    """Test build_workplan function with holidays loaded on demand."""
+    # no holidays
+    project = Project(get_input_file("project_minimal.yaml"))
+    workplan_dict = build_workplan(project).as_dict()
+    assert workplan_dict["workplan"]["project"]["holidays"] == []
+
+    # short project: only holidays of the years covered by the schedule are
+    # loaded
+    project = Project(get_input_file("project_complete.yaml"))
+    workplan_dict = build_workplan(project).as_dict()
+    assert project.hdays.years == {2020, 2021}
+    assert workplan_dict["workplan"]["project"]["holidays"] == [
+        date(2020, 12, 25),
+        date(2021, 1, 1),
+    ]
+
+    # project longer than 10 years: holidays of all years are used
+    config = get_input_file("project_complete.yaml")
+    config["tasks"] = [{"id": "task1", "duration": 3000, "max_resources": 1}]
+    project = Project(config)
+    workplan = build_workplan(project)
+    end_date = add_business_days(
+        date(2020, 12, 21), 2999, country_holidays("FRA")
+    )
+    assert workplan.end_date == end_date
+    assert project.hdays.years == set(range(2020, end_date.year + 1))
+    holidays = workplan.as_dict()["workplan"]["project"]["holidays"]
+    assert date(2031, 12, 25) in holidays
+    assert date(2032, 1, 1) in holidays
+
+
 def test_build_workplan_max_res():
     """Test build_workplan function using max_resources."""
     project = Project(get_input_file("project_complete.yaml"))
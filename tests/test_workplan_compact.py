@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+#
+"""Tests on compact work plan."""
+
+import json
+
+import pytest
+
+from tasksched import (
+    build_workplan,
+    expand_compact_workplan,
+    is_compact_workplan,
+    iter_workplan_compact,
+    iter_workplan_json,
+    Project,
+    workplan_to_text,
+)
+from .utils import get_input_file
+
+
+def test_iter_workplan_compact():
+    """Test iter_workplan_compact function."""
+    project = Project(get_input_file("project_complete.yaml"))
+    for engine in ("objects", "arrays"):
+        workplan = build_workplan(project, engine=engine)
+        compact = json.loads("".join(iter_workplan_compact(workplan)))
+        assert compact["format"] == "tasksched-compact"
+        assert compact["version"] == 1
+        # split tasks have one entry by part, referenced by index
+        assert compact["tasks"] == [
+            ["task1", "The first task", 2, 0, 2],
+            ["task2", "The second task (1/2)", 3, 0, 2],
+            ["task2", "The second task (2/2)", 2, 0, 2],
+            ["task3", "The third task (1/2)", 5, 0, 2],
+            ["task3", "The third task (2/2)", 5, 0, 2],
+        ]
+        assert compact["resources"] == [
+            ["dev1", "Developer 1", 8, "2020-12-31", 88.88888888888889,
+             [3, 5, 1, 3]],
+            ["dev2", "Developer 2", 9, "2021-01-04", 100.0,
+             [4, 5, 0, 2, 2, 2]],
+        ]  # fmt: skip
+        assert "".join(iter_workplan_compact(workplan.as_dict())) == (
+            "".join(iter_workplan_compact(workplan))
+        )
+
+
+def test_expand_compact_workplan():
+    """Test expand_compact_workplan function."""
+    project = Project(get_input_file("project_complete.yaml"))
+    workplan = build_workplan(project)
+    compact = json.loads("".join(iter_workplan_compact(workplan)))
+    assert is_compact_workplan(compact)
+    assert not is_compact_workplan(workplan.as_dict())
+    assert not is_compact_workplan([])
+    assert expand_compact_workplan(compact) == json.loads(
+        "".join(iter_workplan_json(workplan))
+    )
+
+    # unsupported version
+    with pytest.raises(ValueError):
+        expand_compact_workplan({**compact, "version": 2})
+
+    # invalid task index
+    compact["resources"][0][5] = [42, 5]
+    with pytest.raises(ValueError):
+        expand_compact_workplan(compact)
+
+
+def test_compact_workplan_unused_resource():
+    """Test compact work plan with a resource without tasks."""
+    project = Project(
+        {
+            "project": {"name": "The name", "start": "2020-12-21"},
+            "resources": [{"id": "dev1"}, {"id": "dev2"}],
+            "tasks": [{"id": "task1", "duration": 1}],
+        }
+    )
+    workplan = build_workplan(project)
+    compact = json.loads("".join(iter_workplan_compact(workplan)))
+    assert compact["resources"][1] == ["dev2", "dev2", 0, None, 0.0, []]
+    expanded = expand_compact_workplan(compact)
+    assert expanded == json.loads("".join(iter_workplan_json(workplan)))
+    assert expanded["workplan"]["resources"][1]["end"] is None
+    text = workplan_to_text(expanded, use_colors=False)
+    assert "dev2 >              0d   0%" in text
+    assert "None" not in text
@@ -22,7 +22,12 @@
 
 """Tests on export of work plan to HTML."""
 
-from tasksched import workplan_to_html
+from datetime import date
+
+import pytest
+
+from tasksched import BusinessCalendar, workplan_to_html
+from tasksched.workplan_html import AssignedDays, fill_resources
 from .utils import get_input_file
 
 
@@ -35,3 +40,58 @@ def test_workplan_to_html():
     workplan = get_input_file("workplan_complete2.yaml")
     html = workplan_to_html(workplan)
     assert html.startswith("<!doctype html>")
+
+
+def test_fill_resources():
+    """Test fill_resources function."""
+    workplan = get_input_file("workplan_complete.yaml")
+    resources = workplan["workplan"]["resources"]
+    hdays = {day: "" for day in workplan["workplan"]["project"]["holidays"]}
+    view_calendar = BusinessCalendar(date(2020, 12, 1), hdays)
+    view_days = view_calendar.get_days(date(2020, 12, 1), date(2021, 1, 31))
+    tasks_colors = {"task1": 1, "task2": 2, "task3": 3}
+    fill_resources(
+        resources, date(2020, 12, 21), tasks_colors, view_days, view_calendar
+    )
+    view_assigned = resources[0]["view_assigned"]
+    assert isinstance(view_assigned, AssignedDays)
+    assert len(view_assigned) == 62
+    assert view_assigned[date(2020, 12, 18)] is None
+    assert view_assigned[date(2020, 12, 21)] == {
+        "task": {"id": "task3", "title": "The third task (1/2)", "color": 3},
+        "last_day": False,
+    }
+    assert view_assigned[date(2020, 12, 21)] is view_assigned[
+        date(2020, 12, 22)
+    ]
+    assigned = {
+        day: value["last_day"]
+        for day, value in view_assigned.items()
+        if value is not None
+    }
+    assert len(assigned) == 11
+    assert assigned[date(2020, 12, 25)] is False
+    assert assigned[date(2020, 12, 28)] is True
+    assert sum(assigned.values()) == 2
+    # days assigned after the last day displayed
+    resources = get_input_file("workplan_complete.yaml")["workplan"][
+        "resources"
+    ]
+    view_days = view_calendar.get_days(date(2020, 12, 1), date(2020, 12, 31))
+    with pytest.raises(ValueError):
+        fill_resources(
+            resources,
+            date(2020, 12, 21),
+            tasks_colors,
+            view_days,
+            view_calendar,
+        )
+    # project start before the first day displayed
+    with pytest.raises(ValueError):
+        fill_resources(
+            resources,
+            date(2020, 11, 30),
+            tasks_colors,
+            view_days,
+            view_calendar,
+        )
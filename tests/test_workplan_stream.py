@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+#
+# SPDX-FileCopyrightText: 2020-2025 Sébastien Helleu <flashcode@flashtux.org>
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Tasksched.
+#
+# Tasksched is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3 of the License, or
+# (at your option) any later version.
+#
+# Tasksched is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Tasksched.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+"""Tests on streaming of work plan to a file."""
+
+from typing import Any, Union
+
+import datetime
+import io
+import json
+
+import yaml
+
+from tasksched import (
+    ArrayWorkPlan,
+    build_workplan,
+    Project,
+    write_workplan_json,
+    WorkPlan,
+    write_workplan_yaml,
+    yaml_dump,
+)
+from tasksched import workplan_stream
+from tasksched.workplan_stream import is_yaml_fast_safe
+from .utils import get_input_file
+
+
+def get_unicode_workplan() -> Union[WorkPlan, ArrayWorkPlan]:
+    """
+    Build a work plan with strings that libyaml and the pure Python emitter
+    write differently (long strings with non-ASCII chars, control chars).
+
+    :return: work plan
+    """
+    config: Any = get_input_file("project_complete.yaml")
+    config["project"]["name"] = "Projet été 😀 " * 6
+    config["resources"][0]["name"] = "Développeur 1"
+    config["resources"][1]["name"] = "Développeur\t2"
+    config["tasks"][0]["title"] = (
+        "Mise à jour de l'équipe de développement " * 3
+    )
+    config["tasks"][1]["title"] = datetime.date(2020, 1, 2)
+    config["tasks"][2]["title"] = "Noël: 🎄\nligne 2"
+    return build_workplan(Project(config))
+
+
+def test_write_workplan_yaml():
+    """Test write_workplan_yaml function."""
+    project = Project(get_input_file("project_complete.yaml"))
+    for engine in ("objects", "arrays"):
+        workplan = build_workplan(project, engine=engine)
+        output = io.StringIO()
+        write_workplan_yaml(workplan, output)
+        assert output.getvalue() == get_input_file(
+            "workplan_complete.yaml", raw=True
+        )
+        output = io.StringIO()
+        write_workplan_yaml(workplan.as_dict(), output)
+        assert output.getvalue() == get_input_file(
+            "workplan_complete.yaml", raw=True
+        )
+
+
+def test_write_workplan_yaml_unicode(monkeypatch):
+    """Test write_workplan_yaml function with non-ASCII strings."""
+    workplan = get_unicode_workplan()
+    expected = yaml_dump(workplan.as_dict())
+    for batch_size in (1, 2, 256):
+        monkeypatch.setattr(workplan_stream, "WRITE_BATCH_SIZE", batch_size)
+        output = io.StringIO()
+        write_workplan_yaml(workplan, output)
+        assert output.getvalue() == expected
+
+    # pure Python emitter (without libyaml)
+    monkeypatch.setattr(
+        workplan_stream,
+        "_FastDumper",
+        workplan_stream._WorkPlanDumper,  # pylint: disable=protected-access
+    )
+    output = io.StringIO()
+    write_workplan_yaml(workplan, output)
+    assert output.getvalue() == expected
+
+    # empty list
+    workplan_dict = workplan.as_dict()
+    workplan_dict["workplan"]["tasks"] = []
+    output = io.StringIO()
+    write_workplan_yaml(workplan_dict, output)
+    assert output.getvalue() == yaml_dump(workplan_dict)
+
+    # yaml_dump does not change the default dumper
+    assert "ignore_aliases" not in vars(yaml.Dumper)
+
+
+def test_is_yaml_fast_safe():
+    """Test is_yaml_fast_safe function."""
+    assert is_yaml_fast_safe("The first task: \"test\" 'test' #1 " * 10)
+    assert is_yaml_fast_safe("Noël (1/2)")
+    assert is_yaml_fast_safe(["é" * 13, {"title": "中" * 9}])
+    assert is_yaml_fast_safe([1, 2.5, None, True, datetime.date(2020, 1, 1)])
+    assert not is_yaml_fast_safe("é" * 14)
+    assert not is_yaml_fast_safe("中" * 10)
+    assert not is_yaml_fast_safe("😀" * 6)
+    assert not is_yaml_fast_safe("tab\there")
+    assert not is_yaml_fast_safe({"title": "new\nline"})
+    assert not is_yaml_fast_safe({"\x07": 1})
+
+
+def test_write_workplan_json():
+    """Test write_workplan_json function."""
+    project = Project(get_input_file("project_complete.yaml"))
+    for engine in ("objects", "arrays"):
+        workplan = build_workplan(project, engine=engine)
+        output = io.StringIO()
+        write_workplan_json(workplan, output)
+        assert output.getvalue() == json.dumps(workplan.as_dict(), default=str)
+        assert json.loads(output.getvalue()) == get_input_file(
+            "workplan_complete.json"
+        )
+        output2 = io.StringIO()
+        write_workplan_json(workplan.as_dict(), output2)
+        assert output2.getvalue() == output.getvalue()
+    project = Project(get_input_file("project_complete2.yaml"))
+    workplan = ArrayWorkPlan(project, {"task3": 2})
+    output = io.StringIO()
+    write_workplan_json(workplan, output)
+    assert output.getvalue() == json.dumps(workplan.as_dict(), default=str)
+
+    # dates in values not converted before encoding
+    workplan = get_unicode_workplan()
+    output = io.StringIO()
+    write_workplan_json(workplan, output)
+    assert output.getvalue() == json.dumps(workplan.as_dict(), default=str)
@@ -22,7 +22,19 @@
 
 """Tests on export of work plan to text."""
 
+import datetime
+
+import pytest
+
 from tasksched import workplan_to_text
+from tasksched.workplan_text import (
+    get_assigned_starts,
+    get_bar_days,
+    get_calendar,
+    get_resource_cells,
+    get_scale_bounds,
+    get_window,
+)
 from .utils import get_input_file
 
 
@@ -67,3 +79,184 @@ def test_workplan_to_text():
     assert "Developer 1 > 2020-12-30   7d 100% ████▊█▊  task2, task1" in text
     assert "Developer 2 > 2020-12-28   5d  71% ████▊    task3" in text
     assert "Developer 3 > 2020-12-28   5d  71% ████▊    task3" in text
+
+
+def test_workplan_to_text_scale():
+    """Test workplan_to_text function with a scale (week or month)."""
+    workplan = get_input_file("workplan_complete.yaml")
+    text = workplan_to_text(workplan, use_colors=False, scale="week")
+    assert "Developer 1 > 2020-12-31   8d  89% ██   task3, task2" in text
+    assert (
+        "Developer 2 > 2021-01-04   9d 100% ███  task3, task1, task2"
+    ) in text
+    text = workplan_to_text(
+        workplan, use_colors=False, use_unicode=False, scale="month"
+    )
+    assert "Developer 1 > 2020-12-31   8d  89% x   task3, task2" in text
+    assert (
+        "Developer 2 > 2021-01-04   9d 100% xx  task3, task1, task2"
+    ) in text
+    # second week: 1 day on task3, 2 days on task1, 1 day on task2
+    text = workplan_to_text(workplan, scale="week")
+    assert "\x1b[38;5;3m█\x1b[38;5;1m█\x1b[38;5;2m█\x1b[0m" in text
+    with pytest.raises(ValueError):
+        workplan_to_text(workplan, scale="year")
+
+
+def test_workplan_to_text_window():
+    """Test workplan_to_text function with a window of dates and a width."""
+    workplan = get_input_file("workplan_complete.yaml")
+    text = workplan_to_text(
+        workplan,
+        use_colors=False,
+        date_from=datetime.date(2020, 12, 24),
+        date_to=datetime.date(2020, 12, 29),
+    )
+    assert "Displayed: 2020-12-24 to 2020-12-29\n" in text
+    # tasks cut at the start or the end of the window have no start/end char
+    assert "Developer 1 > 2020-12-31   8d  89% █▊█  task3, task2" in text
+    assert "Developer 2 > 2021-01-04   9d 100% █▊█  task3, task1" in text
+    text = workplan_to_text(
+        workplan, use_colors=False, date_from=datetime.date(2021, 2, 1)
+    )
+    assert "Displayed: nothing\n" in text
+    assert "Developer 1 > 2020-12-31   8d  89%   \n" in text
+    text = workplan_to_text(
+        workplan,
+        use_colors=False,
+        scale="week",
+        date_from=datetime.date(2020, 12, 28),
+    )
+    assert "Displayed: 2020-12-28 to 2021-01-04\n" in text
+    assert "Developer 1 > 2020-12-31   8d  89% █   task3, task2" in text
+    assert "Developer 2 > 2021-01-04   9d 100% ██  task3, task1, task2" in text
+    # empty window (holiday): no tasks displayed
+    for scale in ("day", "week"):
+        text = workplan_to_text(
+            workplan,
+            use_colors=False,
+            scale=scale,
+            date_from=datetime.date(2020, 12, 25),
+            date_to=datetime.date(2020, 12, 25),
+        )
+        assert "Displayed: nothing\n" in text
+        assert "Developer 1 > 2020-12-31   8d  89%   \n" in text
+        assert "task" not in text.split("Displayed: nothing\n")[1]
+    text = workplan_to_text(workplan, use_colors=False, max_width=62)
+    assert "Displayed" not in text
+    assert "Developer 2 > 2021-01-04   9d 100% ████▊█▊█▊  task3, t" in text
+    assert max(len(line) for line in text.split("\n")[-2:]) <= 62
+    # narrow width: the tasks keep the width of the longest task id
+    text = workplan_to_text(workplan, use_colors=False, max_width=50)
+    assert "Displayed: 2020-12-21 to 2020-12-29\n" in text
+    assert "Developer 1 > 2020-12-31   8d  89% ████▊█  task3\n" in text
+    assert max(len(line) for line in text.split("\n")[-2:]) <= 50
+    # very narrow width: the tasks have at most half of the width left
+    text = workplan_to_text(workplan, use_colors=False, max_width=45)
+    assert "Displayed: 2020-12-21 to 2020-12-23\n" in text
+    assert "Developer 1 > 2020-12-31   8d  89% ███  tas\n" in text
+
+
+def test_get_window():
+    """Test get_window function."""
+    project = get_input_file("workplan_complete.yaml")["workplan"]["project"]
+    calendar = get_calendar(project)
+    assert get_window(calendar, 9) == (0, 9)
+    assert get_window(calendar, 9, datetime.date(2020, 12, 1)) == (0, 9)
+    # 2020-12-25 is a holiday: the window starts on 2020-12-28
+    assert get_window(calendar, 9, datetime.date(2020, 12, 25)) == (4, 9)
+    assert get_window(
+        calendar, 9, datetime.date(2020, 12, 22), datetime.date(2020, 12, 27)
+    ) == (1, 4)
+    assert get_window(calendar, 9, None, datetime.date(2020, 12, 1)) == (0, 0)
+    assert get_window(calendar, 9, datetime.date(2021, 3, 1)) == (9, 9)
+
+
+def test_get_scale_bounds():
+    """Test get_scale_bounds function."""
+    project = get_input_file("workplan_complete.yaml")["workplan"]["project"]
+    calendar = get_calendar(project)
+    # weeks: 4 days (holiday on 2020-12-25), 4 days (holiday on 2021-01-01)
+    assert get_scale_bounds(calendar, "week", 0, 9) == [0, 4, 8, 9]
+    assert get_scale_bounds(calendar, "week", 2, 9) == [2, 4, 8, 9]
+    assert get_scale_bounds(calendar, "week", 0, 9, max_cells=2) == [0, 4, 8]
+    assert get_scale_bounds(calendar, "month", 0, 9) == [0, 8, 9]
+    # project starting on a Wednesday, last week of December without
+    # business days
+    project = {
+        "start": "2020-12-16",
+        "duration": 6,
+        "holidays": [f"2020-12-{day}" for day in range(21, 26)],
+    }
+    assert get_scale_bounds(get_calendar(project), "week", 0, 6) == [0, 3, 6]
+    with pytest.raises(ValueError):
+        get_scale_bounds(calendar, "year", 0, 9)
+
+
+def test_get_resource_cells():
+    """Test get_resource_cells function."""
+    assigned = [
+        {"task": "a", "duration": 3},
+        {"task": "b", "duration": 4},
+        {"task": "c", "duration": 1},
+    ]
+    starts = get_assigned_starts(assigned)
+    assert starts == [0, 3, 7, 8]
+    assert get_resource_cells(assigned, starts, [0, 5, 10, 15]) == (
+        [("a", True), ("b", False)],
+        range(0, 3),
+    )
+    # same number of days: the first task is the dominant one
+    assert get_resource_cells(assigned, starts, [0, 6, 8]) == (
+        [("a", True), ("b", True)],
+        range(0, 3),
+    )
+    # window after the first task, last task not displayed
+    assert get_resource_cells(assigned, starts, [4, 6]) == (
+        [("b", True)],
+        range(1, 2),
+    )
+    assert get_resource_cells(assigned, starts, [8, 10]) == ([], range(3, 3))
+    assert get_resource_cells([], [0], [0, 5]) == ([], range(0, 0))
+
+
+def test_get_bar_days():
+    """Test get_bar_days function."""
+    assigned = [
+        {"task": "a", "duration": 3},
+        {"task": "b", "duration": 4},
+        {"task": "c", "duration": 1},
+    ]
+    starts = get_assigned_starts(assigned)
+    chars = ["[", "x", "]"]
+    assert get_bar_days(assigned, starts, 0, 8, None, chars) == (
+        "[x][xx]]",
+        8,
+        range(0, 3),
+    )
+    assert get_bar_days(assigned, starts, 2, 5, None, chars) == (
+        "][x",
+        3,
+        range(0, 2),
+    )
+    assert get_bar_days(assigned, starts, 5, 20, None, chars) == (
+        "x]]",
+        3,
+        range(1, 3),
+    )
+    assert get_bar_days(assigned, starts, 8, 20, None, chars) == (
+        "",
+        0,
+        range(3, 3),
+    )
+    # empty window in the middle of a task
+    assert get_bar_days(assigned, starts, 4, 4, None, chars) == (
+        "",
+        0,
+        range(1, 1),
+    )
+    assert get_bar_days(assigned, starts, 0, 1, {"a": 1}, chars) == (
+        "\x1b[38;5;1m[",
+        1,
+        range(0, 1),
+    )